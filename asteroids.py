@@ -1,22 +1,25 @@
+import time
+LAUNCH_TIME = time.perf_counter() # Antes dos demais imports: início da medição até o primeiro quadro
+import os
+import random
 import pygame
 import sys
-import random
-import math
-import threading
-from src.input_handler import input_queue, shared_input_state, input_lock, stop_input_thread_event, input_processing_thread_func
-from src.game_entities import Asteroid as GameEntityAsteroid # Alias para evitar confusão se alguma variável local 'Asteroid' existir
-from src.asteroid_manager import setup_initial_asteroids, spawn_periodic_asteroids, ASTEROID_SPAWN_RATE
-from src.collision_handler import handle_bullet_asteroid_collisions, handle_player_asteroid_collisions
-from src.bullet import Bullet
+from src.input_handler import InputSystem
+from src.asteroid_manager import setup_initial_asteroids, spawn_periodic_asteroids
+from src.asteroid_field import AsteroidField
+from src.population import AsteroidPopulation
+from src.collision_handler import handle_bullet_asteroid_collisions, handle_player_asteroid_collisions, PRECISE_PLAYER_COLLISIONS
 from src.spaceship import Player
-
-
-# Inicializa o Pygame
-pygame.init()
-
-# Dimensões da tela (será configurado para tela cheia)
-SCREEN_WIDTH = 0
-SCREEN_HEIGHT = 0
+from src.assets import get_assets
+from src.profiler import profiler_from_environment
+from src.governor import LoadGovernor
+from src.particles import ParticleSystem, set_particle_system
+from src.background import ParallaxBackground
+from src.telemetry import telemetry_from_environment, set_telemetry
+from src import savestate
+from src.renderer import DirtyRectRenderer, HudCache
+from src.timestep import FixedTimestep, SIMULATION_HZ, capture_positions, draw_interpolated
+IMPORTS_DONE_TIME = time.perf_counter()
 
 
 # Cores
@@ -26,161 +29,417 @@ DARK_BLUE = (20, 20, 60) # Para o fundo espacial
 RED = (255, 0, 0)
 GREY = (128, 128, 128)
 
-# Configura a tela para modo tela cheia
-infoObject = pygame.display.Info() # Obtém informações da tela
-SCREEN_WIDTH = infoObject.current_w
-SCREEN_HEIGHT = infoObject.current_h
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-pygame.display.set_caption("Asteroides")
-
-# Carrega a imagem de fundo
-try:
-    background_image = pygame.image.load('static/images/wllp.jpg').convert()
-    background_image = pygame.transform.scale(background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-except pygame.error as e:
-    print(f"Erro ao carregar imagem de fundo: {e}")
-    background_image = None # Alternativa caso o carregamento da imagem falhe
-
-# Semáforo de controle de asteroides
-asteroid_semaphore = threading.Semaphore(15) # Acomoda os 8 asteroides iniciais e suas divisões
-
-# Relógio do jogo
-clock = pygame.time.Clock()
-FPS = 60
-
-
-
-# --- Variáveis do Jogo (a serem expandidas) ---
-score = 0
-game_paused = False
-# asteroid_spawn_timer e ASTEROID_SPAWN_RATE estão agora em asteroid_manager.py
-
-# --- Fonte para Pontuação ---
-try:
-    score_font = pygame.font.Font(None, 50) # Fonte padrão, tamanho 50
-except Exception as e:
-    print(f"Não foi possível carregar fonte padrão: {e}")
-    score_font = pygame.font.SysFont('arial', 50) # Fonte do sistema alternativa
-
-# --- Loop Principal do Jogo ---
-def game_loop():
-    running = True
-    global score # Permite a modificação da pontuação global
-
-    # Inicializa os grupos de sprites primeiro
-    all_sprites = pygame.sprite.Group()
-    asteroids_group = pygame.sprite.Group() # Asteroides atualmente desabilitados
-    bullets_group = pygame.sprite.Group()
-
-    # Cria instância do jogador, passando referências dos grupos de sprites e dimensões da tela
-    player = Player(all_sprites, bullets_group, SCREEN_WIDTH, SCREEN_HEIGHT)
-    all_sprites.add(player)
-
-    # Inicia a thread de processamento de entrada
-    input_thread = threading.Thread(target=input_processing_thread_func, daemon=True)
-    input_thread.start()
-
-    # Configura asteroides iniciais usando o gerenciador de asteroides
-    setup_initial_asteroids(all_sprites, asteroids_group, asteroid_semaphore, SCREEN_WIDTH, SCREEN_HEIGHT)
-
-    # Loop principal do jogo
-    while running:
+# População de asteroides: orçamento total (e por classe, se desejado) e reaproveitamento de instâncias
+ASTEROID_BUDGET = 15 # Acomoda os 8 asteroides iniciais e suas divisões
+ASTEROID_SIZE_BUDGETS = None # Ex: {'LG': 4, 'MD': 8, 'SM': 16}
+
+# Entrada pelo caminho antigo (fila + thread) em vez do snapshot por tick na thread principal
+THREADED_INPUT = False
+
+# Usa o motor vetorizado (AsteroidField) em vez de um Sprite por asteroide
+USE_ASTEROID_FIELD = False
+
+# A simulação roda a SIMULATION_HZ ticks por segundo (src/timestep.py);
+# o desenho roda até RENDER_FPS_LIMIT quadros por segundo (0 = sem limite)
+RENDER_FPS_LIMIT = 0
+
+# Governador de carga: reduz o nível de detalhe quando o trabalho de um quadro passa
+# do orçamento de TARGET_FPS e o restaura quando sobra folga (src/governor.py)
+LOAD_GOVERNOR = True
+TARGET_FPS = 60
+
+# Partículas de efeito (detritos, faíscas e explosão da nave) em arrays NumPy (src/particles.py)
+PARTICLES = True
+# Depois do fim de jogo, segundos em que o mundo fica parado e só as partículas (a explosão da nave) continuam
+GAME_OVER_SECONDS = 1.5
+
+# Fundo com camadas de paralaxe pré-renderizadas em ladrilhos (src/background.py); False = fundo preto
+BACKGROUND = True
+# Deriva constante das camadas do fundo: com ela o fundo se desloca (e a tela é redesenhada inteira)
+# mesmo com a nave parada; sem ela as camadas só acompanham a nave (paralaxe)
+BACKGROUND_DRIFT = False
+
+# Semente do gerador aleatório da partida (geração e divisão dos asteroides); None = uma semente nova a cada partida
+GAME_SEED = None
+
+# Grava a partida neste arquivo de replay (src/replay.py); também ligado por ASTEROIDES_RECORD=arquivo
+RECORD_REPLAY = None
+
+# ASTEROID_SPAWN_INTERVAL está em asteroid_manager.py; o temporizador de geração fica na população
+
+
+class Game:
+    """
+    O jogo com janela.
+    Criar um Game não tem efeitos colaterais: a tela, o relógio, a fonte, as imagens,
+    a thread de entrada (se THREADED_INPUT) e o perfilador só são adquiridos em start(),
+    e liberados em stop(). run() inicia o jogo (se preciso), executa o loop principal
+    e libera tudo ao sair. Importar este módulo também não abre janela (ver --headless).
+    As opções não informadas vêm das constantes do módulo no momento da criação.
+    """
+
+    def __init__(self, asteroid_budget=None, size_budgets=None, threaded_input=None,
+                 use_asteroid_field=None, render_fps_limit=None, load_governor=None, target_fps=None,
+                 particles=None, background=None, background_drift=None, seed=None, record=None, game_over_seconds=None):
+        self.asteroid_budget = ASTEROID_BUDGET if asteroid_budget is None else asteroid_budget
+        self.size_budgets = ASTEROID_SIZE_BUDGETS if size_budgets is None else size_budgets
+        self.threaded_input = THREADED_INPUT if threaded_input is None else threaded_input
+        self.use_asteroid_field = USE_ASTEROID_FIELD if use_asteroid_field is None else use_asteroid_field
+        self.render_fps_limit = RENDER_FPS_LIMIT if render_fps_limit is None else render_fps_limit
+        self.load_governor = LOAD_GOVERNOR if load_governor is None else load_governor
+        self.target_fps = TARGET_FPS if target_fps is None else target_fps
+        self.use_particles = PARTICLES if particles is None else particles
+        self.game_over_seconds = GAME_OVER_SECONDS if game_over_seconds is None else game_over_seconds
+        self.use_background = BACKGROUND if background is None else background
+        self.background_drift = BACKGROUND_DRIFT if background_drift is None else background_drift
+        self.record_path = record or RECORD_REPLAY or os.environ.get('ASTEROIDES_RECORD')
+        self.precise_collisions = PRECISE_PLAYER_COLLISIONS # Gravado no cabeçalho do replay
+
+        # Adquiridos em start()
+        self.SCREEN_WIDTH = 0
+        self.SCREEN_HEIGHT = 0
+        self.screen = None
+        self.clock = None
+        self.score_font = None
+        self.input_system = None
+        self.profiler = None
+        self.governor = None
+        self.particles = None
+        self.background = None
+        self.telemetry = None
+        self.recorder = None
+        self.started = False
+
+        self.running = False
+        self.paused = False
+        self.score = 0
+        self.tick = 0
+        self.game_over = False
+        self.game_over_ticks = 0 # Ticks restantes da fase de fim de jogo
+        # Toda a aleatoriedade da simulação vem deste gerador: a semente e a entrada de cada tick reproduzem a partida
+        seed = GAME_SEED if seed is None else seed
+        self.seed = random.randrange(1 << 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.quicksave = None # Estado salvo com F5 (src/savestate.py), restaurado com F9
+
+    # --- Recursos ---
+
+    def start(self):
+        """Inicializa o Pygame, a tela cheia, a fonte, a entrada e o mundo do jogo."""
+        if self.started:
+            return
+        self._init_display()
+        # Telemetria de eventos (ligada por ASTEROIDES_TELEMETRY=diretório), escrita em lotes por outra thread;
+        # registrada antes de criar o mundo para incluir a geração dos asteroides iniciais
+        self.telemetry = telemetry_from_environment({
+            'mode': 'janela', 'screen': [self.SCREEN_WIDTH, self.SCREEN_HEIGHT],
+            'asteroid_field': self.use_asteroid_field})
+        if self.telemetry is not None:
+            self.telemetry.start()
+            set_telemetry(self.telemetry)
+        if self.use_background:
+            # Ladrilhos das camadas no formato da tela, montados uma única vez
+            self.background = ParallaxBackground(self.SCREEN_WIDTH, self.SCREEN_HEIGHT, drift=self.background_drift)
+        self._init_world()
+        if self.record_path:
+            from src.replay import ReplayRecorder # Importado só quando a gravação está ligada
+            # Gravado por InputSystem.begin_tick() no formato de --headless --record
+            self.recorder = ReplayRecorder(self.record_path, self)
+        # Perfilador por fase (ligado por ASTEROIDES_PROFILE=arquivo.csv|.jsonl ou pelo overlay com F3)
+        self.profiler = profiler_from_environment()
+        # O nível de detalhe altera a simulação (rotação e geração): desligado durante a gravação
+        if self.load_governor and self.recorder is None:
+            self.governor = LoadGovernor(self.target_fps)
+        if self.use_particles:
+            # Emitidas por kill_asteroid e collision_handler enquanto este sistema estiver registrado
+            self.particles = ParticleSystem(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+            set_particle_system(self.particles)
+        self.started = True
+
+    def _init_display(self):
+        """
+        Inicializa o Pygame, a tela cheia, o relógio e a fonte da pontuação.
+        As imagens são carregadas sob demanda por src/assets.py.
+        """
+        # Inicializa o Pygame
+        pygame.init()
+
+        # Configura a tela para modo tela cheia
+        infoObject = pygame.display.Info() # Obtém informações da tela
+        self.SCREEN_WIDTH = infoObject.current_w
+        self.SCREEN_HEIGHT = infoObject.current_h
+        self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.FULLSCREEN)
+        pygame.display.set_caption("Asteroides")
+
+        # Relógio do jogo
+        self.clock = pygame.time.Clock()
+
+        # --- Fonte para Pontuação ---
+        try:
+            self.score_font = pygame.font.Font(None, 50) # Fonte padrão, tamanho 50
+        except Exception as e:
+            print(f"Não foi possível carregar fonte padrão: {e}")
+            self.score_font = pygame.font.SysFont('arial', 50) # Fonte do sistema alternativa
+
+    def _init_world(self):
+        """Cria a população, os grupos de sprites, a entrada, o jogador e os asteroides iniciais."""
+        width, height = self.SCREEN_WIDTH, self.SCREEN_HEIGHT
+        self.population = AsteroidPopulation(self.asteroid_budget, self.size_budgets)
+
+        # Inicializa os grupos de sprites primeiro
+        self.all_sprites = pygame.sprite.Group()
+        if self.use_asteroid_field:
+            self.asteroids_group = AsteroidField(self.population, width, height, rng=self.rng)
+        else:
+            self.asteroids_group = pygame.sprite.Group()
+        self.bullets_group = pygame.sprite.Group()
+
+        # Sistema de entrada: monta o estado de entrada de cada tick (ou usa a thread, se threaded_input)
+        self.input_system = InputSystem(threaded=self.threaded_input)
+        self.input_system.start()
+
+        # Cria instância do jogador, passando referências dos grupos de sprites, dimensões da tela e o estado de entrada
+        self.player = Player(self.all_sprites, self.bullets_group, width, height,
+                             input_state_ref=self.input_system.input_state,
+                             input_lock_ref=self.input_system.input_lock)
+        self.all_sprites.add(self.player)
+
+        # Configura asteroides iniciais usando o gerenciador de asteroides
+        setup_initial_asteroids(self.all_sprites, self.asteroids_group, self.population, width, height, self.rng)
+
+        # Passo fixo: a simulação avança em ticks de duração constante, independente do desenho
+        self.timestep = FixedTimestep(SIMULATION_HZ)
+        self.previous_positions = {}
+
+        self.renderer = DirtyRectRenderer(self.screen, BLACK, background=self.background)
+        self.hud = HudCache(self.score_font, width, height)
+
+    def stop(self):
+        """Para a thread de entrada (se houver), fecha o perfilador e encerra o Pygame."""
+        if not self.started:
+            return
+        self.started = False
+        # Sinaliza a thread de entrada (se houver) para parar e espera até que ela termine
+        self.input_system.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"Replay gravado em {self.record_path} (semente {self.seed}, {self.tick} ticks)")
+            self.recorder = None
+        self.profiler.close()
+        print(f"Latência de entrada (ticks): {self.input_system.latency.summary()}")
+        if self.governor is not None:
+            print(f"Governador de carga: {self.governor.summary()}")
+            self.governor.reset() # O nível de detalhe é do processo: volta ao original
+        if self.particles is not None:
+            set_particle_system(None)
+        if self.telemetry is not None:
+            set_telemetry(None)
+            self.telemetry.close()
+            print(f"Telemetria: {self.telemetry.stats()}")
+        pygame.quit()
+
+    # --- Loop Principal do Jogo ---
+
+    def run(self):
+        self.start()
+        # Tempo de inicialização: do início do processo até o primeiro quadro na tela.
+        # Com ASTEROIDES_STARTUP_PROBE=1 o jogo sai logo após o primeiro quadro (benchmarks/startup_benchmark.py)
+        first_frame = True
+        startup_probe = os.environ.get('ASTEROIDES_STARTUP_PROBE') == '1'
+        profiler = self.profiler
+
+        self.running = True
+        self.clock.tick() # Descarta o tempo gasto na inicialização
+        frame_start = time.perf_counter()
+        try:
+            while self.running:
+                frame_time = self.clock.tick(self.render_fps_limit) / 1000.0 # Tempo real do último quadro, em segundos
+                if self.governor is not None:
+                    # Trabalho do último quadro, sem a espera do limite de FPS
+                    self.governor.frame(self.clock.get_rawtime() / 1000.0)
+                profiler.begin_frame()
+                if self.telemetry is not None:
+                    # Intervalo entre o início deste quadro e o do anterior, em ms
+                    now = time.perf_counter()
+                    self.telemetry.frame((now - frame_start) * 1000)
+                    frame_start = now
+
+                self.handle_events()
+                profiler.mark('events')
+
+                if self.paused:
+                    self.timestep.reset()
+                else:
+                    # Roda quantos ticks de simulação couberem no tempo acumulado (ou descarta o excesso sob carga)
+                    for _ in range(self.timestep.advance(frame_time)):
+                        if not self.game_over:
+                            self.step()
+                        elif not self.game_over_step():
+                            self.running = False # Fim de jogo, depois da explosão
+                            break
+
+                # Fração entre o último tick e o próximo, para interpolar as posições desenhadas (o mundo parado não interpola)
+                self.draw(1.0 if self.paused or self.game_over else self.timestep.alpha)
+
+                if first_frame:
+                    first_frame = False
+                    startup_ms = (time.perf_counter() - LAUNCH_TIME) * 1000
+                    imports_ms = (IMPORTS_DONE_TIME - LAUNCH_TIME) * 1000
+                    print(f"Primeiro quadro em {startup_ms:.1f} ms (imports {imports_ms:.1f} ms); imagens: {get_assets().stats()}")
+                    if startup_probe:
+                        self.running = False
+
+                profiler.count('sprites', len(self.all_sprites))
+                profiler.count('asteroides', len(self.asteroids_group))
+                profiler.count('projeteis', len(self.bullets_group))
+                if self.particles is not None and profiler.enabled:
+                    profiler.count('particulas', len(self.particles))
+                if self.governor is not None:
+                    profiler.count('qualidade', self.governor.level_index)
+                profiler.end_frame()
+            print("Loop principal terminando.")
+        finally:
+            self.stop()
+
+    def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                self.running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    running = False # Sair do jogo com ESC
+                    self.running = False # Sair do jogo com ESC
                 elif event.key == pygame.K_p: # Placeholder para pausa
-                    global game_paused
-                    game_paused = not game_paused
-                    print(f"Jogo pausado: {game_paused}")
-                # Comandos de entrada do jogador para a fila
-                elif event.key == pygame.K_LEFT:
-                    input_queue.put(('rotate_left', True))
-                elif event.key == pygame.K_RIGHT:
-                    input_queue.put(('rotate_right', True))
-                elif event.key == pygame.K_UP:
-                    input_queue.put(('thrust_on', True))
-                elif event.key == pygame.K_SPACE:
-                    input_queue.put(('shoot_request', True))
-            
-            elif event.type == pygame.KEYUP:
-                if event.key == pygame.K_LEFT:
-                    input_queue.put(('rotate_left', False))
-                elif event.key == pygame.K_RIGHT:
-                    input_queue.put(('rotate_right', False))
-                elif event.key == pygame.K_UP:
-                    input_queue.put(('thrust_on', False))
-                # Sem KEYUP para shoot_request, pois é um evento único
-
-        if not game_paused:
-            # --- Lógica do Jogo (a ser adicionada) ---
-            # Lógica de movimento das estrelas removida, pois agora usamos uma imagem de fundo estática
-            
-            # Atualiza todos os sprites (jogador, projéteis, asteroides)
-            all_sprites.update() 
-            # asteroids_group.update() é chamado implicitamente por all_sprites.update() se os asteroides estiverem em all_sprites
-
-            # --- Detecção de Colisão (tratada por collision_handler.py) ---
-            score = handle_bullet_asteroid_collisions(bullets_group, asteroids_group, score)
-            if handle_player_asteroid_collisions(player, asteroids_group):
-                running = False # Fim de jogo
-
-            # --- Geração de Asteroides (tratada por asteroid_manager.py) ---
-            spawn_periodic_asteroids(all_sprites, asteroids_group, asteroid_semaphore, SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        # --- Desenho ---
-        screen.fill(BLACK) # Define o fundo como preto
-
-        # Lógica de desenho das estrelas removida
-
-        # Desenha todos os sprites (jogador e projéteis já estão em all_sprites)
-        all_sprites.draw(screen) # Jogador e projéteis estão em all_sprites
-        asteroids_group.draw(screen) # Desenha os asteroides explicitamente
-
-        # Desenha a Pontuação
-        score_text_surface = score_font.render(str(score), True, WHITE)
-        score_text_rect = score_text_surface.get_rect(center=(SCREEN_WIDTH // 2, 50))
-        screen.blit(score_text_surface, score_text_rect)
-
-        # Desenha Botão de Pausa (placeholder)
-        pause_button_margin = 20
-        pause_button_size = 40
-        pause_icon_line_length = 20
-        pause_icon_line_width = 4
-        pause_icon_spacing = 10
-
-        pause_button_rect = pygame.Rect(SCREEN_WIDTH - pause_button_size - pause_button_margin, pause_button_margin, pause_button_size, pause_button_size)
-        pygame.draw.rect(screen, GREY, pause_button_rect)
-        # Ícone de pausa (duas linhas verticais)
-        line1_x = SCREEN_WIDTH - pause_button_margin - (pause_button_size // 2) - (pause_icon_spacing // 2)
-        line2_x = SCREEN_WIDTH - pause_button_margin - (pause_button_size // 2) + (pause_icon_spacing // 2)
-        icon_y_start = pause_button_margin + (pause_button_size - pause_icon_line_length) // 2
-        icon_y_end = icon_y_start + pause_icon_line_length
-
-        pygame.draw.line(screen, WHITE, (line1_x, icon_y_start), (line1_x, icon_y_end), pause_icon_line_width)
-        pygame.draw.line(screen, WHITE, (line2_x, icon_y_start), (line2_x, icon_y_end), pause_icon_line_width)
-
-        if game_paused:
-            # Exibe mensagem de Pausado
-            pause_text_surface = score_font.render("PAUSADO", True, WHITE)
-            pause_text_rect = pause_text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            screen.blit(pause_text_surface, pause_text_rect)
-
-        pygame.display.flip() # Atualiza a tela
-
-        clock.tick(FPS) # Limita a taxa de quadros
-
-    # Sinaliza a thread de entrada para parar e espera até que ela termine
-    print("Loop principal terminando. Sinalizando thread de entrada para parar.")
-    stop_input_thread_event.set()
-    input_queue.join() # Aguarda até que todos os itens na fila sejam processados
-    input_thread.join()
-    print("Thread de entrada unida. Saindo do jogo.")
-
-    pygame.quit()
+                    self.paused = not self.paused
+                    print(f"Jogo pausado: {self.paused}")
+                    if self.telemetry is not None:
+                        self.telemetry.pause(self.paused)
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay() # Overlay com percentis por fase
+                elif event.key == pygame.K_F5:
+                    self.save_state()
+                elif event.key == pygame.K_F9:
+                    self.load_state()
+            # Comandos de entrada do jogador (setas e espaço)
+            self.input_system.handle_event(event)
+
+    @property
+    def input_state(self):
+        return self.input_system.input_state
+
+    def save_state(self):
+        """Salvamento rápido do mundo em memória (F5)."""
+        start = time.perf_counter()
+        self.quicksave = savestate.capture(self)
+        print(f"Estado salvo: {savestate.describe(self.quicksave)} em {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    def load_state(self):
+        """Volta ao último salvamento rápido (F9), mantendo as teclas seguradas agora."""
+        if self.quicksave is None:
+            return
+        start = time.perf_counter()
+        savestate.restore(self, self.quicksave, restore_input=False)
+        self.previous_positions = {} # Sem interpolação a partir de posições de antes da restauração
+        self.timestep.reset()
+        self.renderer.invalidate()
+        if self.particles is not None:
+            self.particles.clear()
+        print(f"Estado restaurado (tick {self.tick}) em {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    def step(self):
+        """Um tick de simulação. Retorna False no fim de jogo."""
+        profiler = self.profiler
+        self.previous_positions = capture_positions(self.all_sprites)
+        self.input_system.begin_tick() # Estado de entrada deste tick
+        if self.telemetry is not None:
+            self.telemetry.begin_tick(self.tick)
+
+        # Atualiza todos os sprites (jogador, projéteis, asteroides)
+        self.all_sprites.update()
+        if self.use_asteroid_field:
+            self.asteroids_group.update() # O campo avança todos os asteroides num único passo vetorizado
+        if self.particles is not None:
+            self.particles.update() # Todas as partículas num único passo vetorizado
+        if self.background is not None:
+            self.background.update(self.player.vx, self.player.vy) # Deriva e paralaxe com a velocidade da nave
+        profiler.mark('update')
+
+        # --- Detecção de Colisão (tratada por collision_handler.py) ---
+        self.score = handle_bullet_asteroid_collisions(self.bullets_group, self.asteroids_group, self.score)
+        game_over = handle_player_asteroid_collisions(self.player, self.asteroids_group, self.precise_collisions)
+        profiler.mark('collision')
+        if game_over:
+            self.game_over = True
+            if self.telemetry is not None:
+                self.telemetry.game_over(self.score)
+            self.player.kill() # A nave explodiu: some da tela e ficam as partículas de collision_handler
+            if self.particles is not None:
+                self.game_over_ticks = round(self.game_over_seconds * SIMULATION_HZ)
+
+        # --- Geração de Asteroides (tratada por asteroid_manager.py) ---
+        # Também no tick do fim de jogo, na mesma ordem de HeadlessSimulation.step (o replay termina igual)
+        spawn_periodic_asteroids(self.all_sprites, self.asteroids_group, self.population,
+                                 self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.rng, dt=self.timestep.dt)
+        profiler.mark('spawn')
+        self.tick += 1
+        return not self.game_over
+
+    def game_over_step(self):
+        """Um tick da fase de fim de jogo: o mundo fica parado e só as partículas avançam. Retorna False ao terminar."""
+        if self.game_over_ticks <= 0:
+            return False
+        self.game_over_ticks -= 1
+        self.particles.update()
+        self.profiler.mark('update')
+        return True
+
+    def draw(self, alpha):
+        """Desenha o quadro com as posições interpoladas por alpha e envia as áreas sujas à tela."""
+        screen = self.screen
+        renderer = self.renderer
+        # Só as áreas sujas são apagadas e enviadas à tela (flip completo quando a área é grande)
+        renderer.begin_frame()
+
+        # Desenha todos os sprites (jogador, projéteis e asteroides)
+        renderer.add(draw_interpolated(screen, self.all_sprites, self.previous_positions, alpha,
+                                       self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        if self.use_asteroid_field:
+            renderer.add(self.asteroids_group.draw(screen, alpha)) # Os asteroides do campo não estão em all_sprites
+        if self.particles is not None:
+            renderer.add(self.particles.draw(screen)) # Um único blits() para todas as partículas
+
+        # Desenha a Pontuação, o Botão de Pausa e a mensagem de Pausado (superfícies em cache)
+        renderer.add(self.hud.draw(screen, self.score, self.paused))
+        renderer.add(self.profiler.draw_overlay(screen))
+        self.profiler.mark('draw')
+
+        renderer.end_frame() # Atualiza a tela
+        self.profiler.mark('flip')
+
+
+def game_loop():
+    """Executa o jogo com janela até o fim e encerra o processo."""
+    Game().run()
     sys.exit()
 
 if __name__ == '__main__':
+    if '--headless' in sys.argv[1:]:
+        # Simulação sem janela, determinística e sem limite de FPS (ver src/headless.py)
+        from src.headless import main as headless_main
+        sys.exit(headless_main(sys.argv[1:]))
+    if '--replay' in sys.argv[1:]:
+        # Reprodução de um replay gravado com --headless --record ou pelo jogo com janela (ver src/replay.py)
+        from src.replay import main as replay_main
+        sys.exit(replay_main(sys.argv[1:]))
+    if '--sweep' in sys.argv[1:]:
+        # Varredura de parâmetros com jogos sem janela num pool de processos (ver src/sweep.py)
+        from src.sweep import main as sweep_main
+        sys.exit(sweep_main(sys.argv[1:]))
+    if '--server' in sys.argv[1:] or '--connect' in sys.argv[1:]:
+        # Servidor multijogador autoritativo e bots de carga (ver src/server.py)
+        from src.server import main as server_main
+        sys.exit(server_main(sys.argv[1:]))
+    if '--telemetry-report' in sys.argv[1:]:
+        # Resumo em fluxo dos registros de telemetria (ver src/telemetry.py)
+        from src.telemetry import main as telemetry_main
+        sys.exit(telemetry_main(sys.argv[1:]))
     game_loop()
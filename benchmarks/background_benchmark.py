@@ -0,0 +1,163 @@
+"""
+Benchmark do fundo com paralaxe (src/background.py) a 1080p e 4K.
+
+Para cada resolução (driver de vídeo 'dummy'), monta o ParallaxBackground e mede por quadro:
+- full: um deslocamento e o redesenho da tela inteira (o quadro em que o fundo se move);
+- dirty: redesenhar só o fundo de --rects áreas de 96x96 (o quadro parado, apagando os sprites);
+- fill_full / fill_dirty: o mesmo com o fundo preto antigo (screen.fill);
+- naive_blit: um blit da imagem de fundo redimensionada para a tela inteira;
+- naive_scale: redimensionar e desenhar a imagem inteira a cada quadro.
+Também mede a fração dos quadros redesenhados inteiros pelo DirtyRectRenderer (um tick por
+quadro, FRAME_RECTS áreas desenhadas por quadro) com a nave parada e na velocidade máxima, em
+três configurações do fundo: 'anterior' (deriva e deslocamento a cada tick, como antes de
+SCROLL_INTERVAL), 'deriva' (deriva ligada) e 'padrao' (sem deriva, como no jogo), e estima
+o custo médio por quadro do fundo em cada caso.
+
+Uso:
+    python benchmarks/background_benchmark.py --frames 120 --output fundo.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import pygame
+from src.headless import init_headless_display
+from src.background import ParallaxBackground, BACKGROUND_LAYERS, SCROLL_INTERVAL
+from src.renderer import DirtyRectRenderer
+from src.assets import get_assets
+
+RESOLUTIONS = ((1920, 1080), (3840, 2160))
+DEFAULT_RECTS = 60
+RECT_SIZE = 96
+SCROLL_TICKS = 600
+# Velocidade máxima da nave em pixels por tick (Player.max_speed)
+SHIP_MAX_SPEED = 7
+# Áreas desenhadas por quadro na medida dos quadros inteiros (nave, asteroides e projéteis de um quadro típico)
+FRAME_RECTS = 16
+# Configurações do fundo comparadas: nome, deriva, ticks entre deslocamentos
+SCROLL_CASES = (
+    ('anterior', True, 1),
+    ('deriva', True, SCROLL_INTERVAL),
+    ('padrao', False, SCROLL_INTERVAL),
+)
+VELOCITIES = {'idle': (0.0, 0.0), 'max_speed': (SHIP_MAX_SPEED, 0.0)}
+
+
+def _time_frames(function, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def _full_redraw_share(screen, background, velocity, rects):
+    """Fração dos quadros que o DirtyRectRenderer redesenha inteiros, com um tick do fundo por quadro."""
+    renderer = DirtyRectRenderer(screen, background=background)
+    renderer.begin_frame()
+    renderer.end_frame() # O primeiro quadro é sempre inteiro
+    full_before = renderer.full_frames
+    for _ in range(SCROLL_TICKS):
+        background.update(*velocity)
+        renderer.begin_frame()
+        renderer.add(rects)
+        renderer.end_frame()
+    return (renderer.full_frames - full_before) / SCROLL_TICKS
+
+
+def bench(size, frames, rect_count, seed):
+    screen = init_headless_display(*size)
+    width, height = size
+    start = time.perf_counter()
+    background = ParallaxBackground(width, height, seed=seed)
+    bake_ms = (time.perf_counter() - start) * 1000
+    rects = [pygame.Rect((index * 397) % (width - RECT_SIZE), (index * 211) % (height - RECT_SIZE), RECT_SIZE, RECT_SIZE)
+             for index in range(rect_count)]
+
+    def scroll_frame():
+        background.update(SHIP_MAX_SPEED, 0.0)
+        background.draw(screen)
+
+    def fill_dirty():
+        for rect in rects:
+            screen.fill((0, 0, 0), rect)
+
+    source = get_assets().source(BACKGROUND_LAYERS[0]['image']).convert()
+    scaled = pygame.transform.scale(source, size)
+    result = {
+        'bake_ms': bake_ms,
+        'tile_bytes': background.stats()['tile_bytes'],
+        'full_ms': _time_frames(scroll_frame, frames),
+        'dirty_ms': _time_frames(lambda: background.draw_rects(screen, rects), frames),
+        'fill_full_ms': _time_frames(lambda: screen.fill((0, 0, 0)), frames),
+        'fill_dirty_ms': _time_frames(fill_dirty, frames),
+        'naive_blit_ms': _time_frames(lambda: screen.blit(scaled, (0, 0)), frames),
+        'naive_scale_ms': _time_frames(lambda: screen.blit(pygame.transform.scale(source, size), (0, 0)),
+                                       max(1, frames // 4)),
+        'full_redraw_share': {},
+        'average_ms': {},
+    }
+    for name, drift, scroll_interval in SCROLL_CASES:
+        case_background = ParallaxBackground(width, height, seed=seed, drift=drift, scroll_interval=scroll_interval)
+        shares = {velocity_name: _full_redraw_share(screen, case_background, velocity, rects[:FRAME_RECTS])
+                  for velocity_name, velocity in VELOCITIES.items()}
+        result['full_redraw_share'][name] = shares
+        result['average_ms'][name] = {velocity_name: share * result['full_ms'] + (1 - share) * result['dirty_ms']
+                                      for velocity_name, share in shares.items()}
+    return result
+
+
+def run(frames, rect_count, seed):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'frames': frames,
+            'rects': rect_count,
+            'rect_size': RECT_SIZE,
+            'frame_rects': FRAME_RECTS,
+            'scroll_interval': SCROLL_INTERVAL,
+            'layers': [layer['name'] for layer in BACKGROUND_LAYERS],
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'resolutions': {},
+    }
+    for size in RESOLUTIONS:
+        result = bench(size, frames, rect_count, seed)
+        report['resolutions'][f'{size[0]}x{size[1]}'] = result
+        print(f"{size[0]}x{size[1]}: montagem={result['bake_ms']:6.1f}ms deslocamento={result['full_ms']:5.2f}ms "
+              f"áreas={result['dirty_ms']:5.2f}ms | preto: tela={result['fill_full_ms']:5.2f}ms áreas={result['fill_dirty_ms']:5.2f}ms "
+              f"| imagem inteira: blit={result['naive_blit_ms']:5.2f}ms scale+blit={result['naive_scale_ms']:6.2f}ms")
+        for name, shares in result['full_redraw_share'].items():
+            average = result['average_ms'][name]
+            print(f"    {name:<8}: quadros inteiros {shares['idle']:5.1%} (parada) / {shares['max_speed']:5.1%} (vel. máx.), "
+                  f"média={average['idle']:.2f}/{average['max_speed']:.2f}ms")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do fundo com paralaxe a 1080p e 4K.")
+    parser.add_argument('--frames', type=int, default=120, help="Quadros medidos por caso")
+    parser.add_argument('--rects', type=int, default=DEFAULT_RECTS, help="Áreas sujas redesenhadas por quadro parado")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.frames, args.rects, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Benchmark da colisão jogador-asteroide: círculos contra máscaras em cache.
+
+Gera pares (nave, asteroide) com ângulos e classes aleatórios, posicionados perto do
+limite de contato, e mede por par:
+- circle: pygame.sprite.collide_circle com os raios atuais (o teste antigo);
+- mask_cold: pré-teste por rect + collide_mask com os caches de máscaras vazios;
+- mask_cached: o mesmo com as máscaras já em cache (o caso normal durante o jogo);
+- mask_uncached: pré-teste por rect + mask.from_surface das duas imagens a cada teste.
+Também conta quantos pares o círculo acerta sem contato real (falsos acertos) e
+quantos contatos ele perde, e mede handle_player_asteroid_collisions nos dois modos
+com populações crescentes espalhadas pela tela. Roda com o driver de vídeo 'dummy'.
+
+Uso:
+    python benchmarks/collision_benchmark.py --pairs 20000 --output colisao.json
+"""
+import os
+import io
+import sys
+import json
+import time
+import math
+import random
+import argparse
+import platform
+import threading
+import contextlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT) # As imagens são carregadas por caminho relativo à raiz do projeto
+
+import pygame
+from src.headless import init_headless_display
+from src.population import AsteroidPopulation
+from src.collision_handler import handle_player_asteroid_collisions
+from src.game_entities import Asteroid, ASTEROID_SIZES, get_asteroid_frame_cache
+from src import spaceship
+from src.spaceship import Player
+
+SCREEN_SIZE = (1280, 720)
+SIZE_TYPES = tuple(ASTEROID_SIZES)
+DEFAULT_POPULATIONS = (15, 100, 1000)
+
+
+def place_player(player, center, angle):
+    """Mesma rotação de Player.update, sem ler a entrada nem mover a nave."""
+    player.angle = angle
+    player.image = pygame.transform.rotate(player.original_image, angle)
+    player.rect = player.image.get_rect(center=center)
+
+
+def place_asteroid(asteroid, center, angle):
+    """Mesmo quadro de rotação que Asteroid.update escolheria para este ângulo."""
+    asteroid.angle = angle
+    frame = asteroid.world.frame_cache.get(asteroid.size_type, angle)
+    asteroid.frame = frame
+    asteroid.image = frame.image
+    asteroid.rect = frame.rect_at(center)
+
+
+def make_pairs(count, rng, world):
+    """Pares (ângulo da nave, classe, ângulo do asteroide, centro do asteroide) perto do contato."""
+    center = (SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2)
+    player_radius = math.hypot(*world.player.original_image.get_size()) / 2
+    pairs = []
+    for _ in range(count):
+        size_type = rng.choice(SIZE_TYPES)
+        reach = player_radius + ASTEROID_SIZES[size_type]['radius']
+        distance = rng.uniform(0, reach * 1.1)
+        direction = rng.uniform(0, 2 * math.pi)
+        position = (center[0] + distance * math.cos(direction), center[1] + distance * math.sin(direction))
+        pairs.append((rng.randrange(80) * 4.5, size_type, rng.uniform(0, 360), position))
+    return center, pairs
+
+
+class World:
+    def __init__(self, rng):
+        self.rng = rng
+        self.population = AsteroidPopulation(10 ** 6)
+        self.all_sprites = pygame.sprite.Group()
+        self.bullets_group = pygame.sprite.Group()
+        self.asteroids_group = pygame.sprite.Group()
+        self.input_state = {'rotate_left': False, 'rotate_right': False, 'thrust_on': False, 'shoot_request': False}
+        self.player = Player(self.all_sprites, self.bullets_group, *SCREEN_SIZE,
+                             input_state_ref=self.input_state, input_lock_ref=threading.Lock())
+        self.all_sprites.add(self.player)
+        # Um asteroide por classe, reposicionado a cada par
+        self.probes = {size_type: Asteroid((0, 0), size_type, self.all_sprites, self.asteroids_group,
+                                           self.population, *SCREEN_SIZE, rng)
+                       for size_type in SIZE_TYPES}
+
+
+def clear_mask_caches():
+    spaceship._ship_masks.clear()
+    frame_cache = get_asteroid_frame_cache()
+    frame_cache._base_masks.clear()
+    for frame in frame_cache._frames.values():
+        frame.mask = None
+
+
+def bench_pairs(world, center, pairs):
+    player = world.player
+    player.radius = 0.5 * math.hypot(*player.original_image.get_size()) # Como em handle_player_asteroid_collisions
+    collide_circle = pygame.sprite.collide_circle
+    collide_mask = pygame.sprite.collide_mask
+    from_surface = pygame.mask.from_surface
+
+    # Posiciona tudo antes: os tempos medem só os testes de colisão
+    prepared = []
+    for player_angle, size_type, asteroid_angle, position in pairs:
+        asteroid = world.probes[size_type]
+        place_asteroid(asteroid, position, asteroid_angle)
+        place_player(player, center, player_angle)
+        prepared.append((player.angle, player.image, player.rect, size_type,
+                         asteroid.frame, asteroid.image, asteroid.rect))
+
+    def apply(entry):
+        player.angle, player.image, player.rect, size_type, frame, image, rect = entry
+        asteroid = world.probes[size_type]
+        asteroid.frame, asteroid.image, asteroid.rect = frame, image, rect
+        return asteroid
+
+    def run(test):
+        hits = []
+        elapsed = 0.0
+        for entry in prepared:
+            asteroid = apply(entry)
+            start = time.perf_counter()
+            hit = test(asteroid)
+            elapsed += time.perf_counter() - start
+            hits.append(bool(hit))
+        return elapsed, hits
+
+    def precise(asteroid):
+        return player.rect.colliderect(asteroid.rect) and collide_mask(player, asteroid)
+
+    def uncached(asteroid):
+        if not player.rect.colliderect(asteroid.rect):
+            return False
+        offset = (asteroid.rect.x - player.rect.x, asteroid.rect.y - player.rect.y)
+        return from_surface(player.image).overlap(from_surface(asteroid.image), offset) is not None
+
+    results = {}
+    results['circle'], circle_hits = run(lambda asteroid: collide_circle(player, asteroid))
+    clear_mask_caches()
+    results['mask_cold'], mask_hits = run(precise)
+    results['mask_cached'], cached_hits = run(precise)
+    results['mask_uncached'], uncached_hits = run(uncached)
+    assert mask_hits == cached_hits == uncached_hits, "máscaras em cache divergem das calculadas na hora"
+
+    count = len(prepared)
+    report = {name: {'total_ms': elapsed * 1000, 'us_per_pair': elapsed / count * 1e6}
+              for name, elapsed in results.items()}
+    report['accuracy'] = {
+        'pairs': count,
+        'contacts': sum(mask_hits),
+        'circle_hits': sum(circle_hits),
+        'circle_false_hits': sum(c and not m for c, m in zip(circle_hits, mask_hits)),
+        'circle_misses': sum(m and not c for c, m in zip(circle_hits, mask_hits)),
+        'rect_precheck_passed': sum(entry[2].colliderect(entry[6]) for entry in prepared),
+    }
+    report['caches'] = {'ship': spaceship._ship_masks.stats(), 'asteroid_frames': get_asteroid_frame_cache().stats()}
+    return report
+
+
+def bench_handler(rng, population_size, calls):
+    """handle_player_asteroid_collisions com a população espalhada pela tela (mundo real, sem prints)."""
+    world = World(rng)
+    for _ in range(population_size):
+        size_type = rng.choice(SIZE_TYPES)
+        center = (rng.randrange(SCREEN_SIZE[0]), rng.randrange(SCREEN_SIZE[1]))
+        asteroid = Asteroid(center, size_type, world.all_sprites, world.asteroids_group,
+                            world.population, *SCREEN_SIZE, rng)
+        place_asteroid(asteroid, center, rng.uniform(0, 360))
+        world.asteroids_group.add(asteroid)
+    player = world.player
+    results = {}
+    for mode, precise in (('circle', False), ('mask', True)):
+        hits = 0
+        elapsed = 0.0
+        with contextlib.redirect_stdout(io.StringIO()): # O aviso de fim de jogo não entra na medição
+            for call in range(calls):
+                place_player(player, (rng.randrange(SCREEN_SIZE[0]), rng.randrange(SCREEN_SIZE[1])),
+                             rng.randrange(80) * 4.5)
+                start = time.perf_counter()
+                hits += handle_player_asteroid_collisions(player, world.asteroids_group, precise)
+                elapsed += time.perf_counter() - start
+        results[mode] = {'us_per_call': elapsed / calls * 1e6, 'hits': hits}
+    return results
+
+
+def run(pair_count, populations, calls, seed):
+    rng = random.Random(seed)
+    init_headless_display(*SCREEN_SIZE)
+    world = World(rng)
+    center, pairs = make_pairs(pair_count, rng, world)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'pairs': bench_pairs(world, center, pairs),
+        'handler': {},
+    }
+    for name in ('circle', 'mask_cold', 'mask_cached', 'mask_uncached'):
+        print(f"{name:<14} {report['pairs'][name]['us_per_pair']:8.2f} us/par")
+    accuracy = report['pairs']['accuracy']
+    print(f"contatos={accuracy['contacts']} círculo: acertos={accuracy['circle_hits']} "
+          f"falsos={accuracy['circle_false_hits']} perdidos={accuracy['circle_misses']} "
+          f"(de {accuracy['pairs']} pares; {accuracy['rect_precheck_passed']} passaram o pré-teste)")
+    for population_size in populations:
+        result = bench_handler(random.Random(seed + population_size), population_size, calls)
+        report['handler'][str(population_size)] = result
+        print(f"handler asteroides={population_size:<5} círculo={result['circle']['us_per_call']:7.2f} us "
+              f"máscara={result['mask']['us_per_call']:7.2f} us")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de colisão por círculos e por máscaras em cache.")
+    parser.add_argument('--pairs', type=int, default=20000, help="Pares nave/asteroide testados")
+    parser.add_argument('--populations', type=lambda text: [int(value) for value in text.split(',')],
+                        default=list(DEFAULT_POPULATIONS), help="Populações para medir o handler (ex: 15,100,1000)")
+    parser.add_argument('--calls', type=int, default=2000, help="Chamadas do handler por população e modo")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.pairs, args.populations, args.calls, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Verificação do custo de importação (regressão do tempo de inicialização).
+
+Importa cada módulo alvo num interpretador novo com 'python -X importtime' e separa
+o tempo gasto nos módulos do projeto (src.*, asteroids) do tempo das dependências
+(pygame, numpy...). Também confere que a importação não tem efeitos colaterais:
+nenhum subsistema do Pygame inicializado, nenhuma janela e nenhuma thread extra.
+Os processos do pool de src/sweep.py importam esses módulos, então importar deve
+continuar barato.
+
+Os bytecodes ficam num diretório temporário (PYTHONPYCACHEPREFIX), aquecido por uma
+importação descartada antes das medidas: sem isso (checkout novo, __pycache__ antigo ou
+PYTHONDONTWRITEBYTECODE) o tempo do projeto seria quase todo compilação dos fontes.
+
+Sai com código 1 se algum alvo passar do orçamento ou tiver efeitos colaterais.
+
+Uso:
+    python benchmarks/import_time_check.py --runs 5 --project-budget-ms 30 --output imports.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+
+# Módulos importados pelos pontos de entrada e pelos processos do pool de varredura
+DEFAULT_TARGETS = ('asteroids', 'src.headless', 'src.replay', 'src.sweep')
+DEFAULT_PROJECT_BUDGET_MS = 30.0
+PROJECT_PREFIXES = ('src', 'asteroids')
+
+# Executado no interpretador novo, depois de importar o alvo
+PROBE = """
+import json, sys, threading
+import {module}
+pygame = sys.modules.get('pygame')
+print(json.dumps({{
+    'threads': threading.active_count(),
+    'pygame_init': bool(pygame and pygame.get_init()),
+    'display_init': bool(pygame and pygame.display.get_init()),
+}}))
+"""
+
+
+def _is_project(name):
+    return any(name == prefix or name.startswith(prefix + '.') for prefix in PROJECT_PREFIXES)
+
+
+def parse_importtime(stderr):
+    """Linhas de -X importtime -> lista de (nome, self_us, cumulativo_us, profundidade)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def measure(module, pycache_dir):
+    """Uma importação de 'module'. Retorna (total_ms, projeto_ms, efeitos, entradas)."""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1', SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               PYTHONPYCACHEPREFIX=pycache_dir)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE.format(module=module)],
+                               cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"falha ao importar {module}:\n{completed.stderr[-2000:]}")
+    entries = parse_importtime(completed.stderr)
+    total_us = next(cumulative for name, _, cumulative, _ in reversed(entries) if name == module)
+    project_us = sum(self_us for name, self_us, _, _ in entries if _is_project(name))
+    effects = json.loads(completed.stdout.strip().splitlines()[-1])
+    return total_us / 1000, project_us / 1000, effects, entries
+
+
+def _heaviest_dependencies(entries, count=3):
+    """Dependências externas importadas diretamente pelo projeto, pelas mais caras."""
+    dependencies = {}
+    parents = []
+    for name, _, cumulative_us, depth in reversed(entries): # -X importtime lista os filhos antes do pai
+        del parents[depth:]
+        if not _is_project(name) and parents and _is_project(parents[-1]):
+            dependencies[name] = max(dependencies.get(name, 0), cumulative_us)
+        parents.append(name)
+    heaviest = sorted(dependencies.items(), key=lambda item: item[1], reverse=True)[:count]
+    return {name: round(cumulative_us / 1000, 1) for name, cumulative_us in heaviest}
+
+
+def _median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def run(targets, runs, project_budget_ms, total_budget_ms=None):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': runs,
+            'project_budget_ms': project_budget_ms,
+            'total_budget_ms': total_budget_ms,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'targets': {},
+    }
+    failures = []
+    pycache = tempfile.TemporaryDirectory(prefix='importtime-')
+    for module in targets:
+        measure(module, pycache.name) # Aquecimento: grava os bytecodes
+        samples = [measure(module, pycache.name) for _ in range(runs)]
+        total_ms = _median(sample[0] for sample in samples)
+        project_ms = _median(sample[1] for sample in samples)
+        effects = samples[-1][2]
+        side_effects = [key for key in ('pygame_init', 'display_init') if effects[key]]
+        if effects['threads'] > 1:
+            side_effects.append(f"threads={effects['threads']}")
+        report['targets'][module] = {
+            'total_ms': round(total_ms, 2),
+            'project_ms': round(project_ms, 2),
+            'dependencies_ms': round(total_ms - project_ms, 2),
+            'heaviest_dependencies_ms': _heaviest_dependencies(samples[-1][3]),
+            'side_effects': side_effects,
+        }
+        over_budget = project_ms > project_budget_ms or (total_budget_ms is not None and total_ms > total_budget_ms)
+        status = 'OK'
+        if over_budget or side_effects:
+            status = 'FALHOU'
+            failures.append(module)
+        print(f"{module:<14} total={total_ms:7.1f}ms projeto={project_ms:6.1f}ms "
+              f"dependências={total_ms - project_ms:7.1f}ms efeitos={side_effects or 'nenhum'} {status}")
+        print(f"{'':<14} mais caras: {report['targets'][module]['heaviest_dependencies_ms']}")
+    pycache.cleanup()
+    report['failures'] = failures
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o custo e os efeitos colaterais de importar o jogo.")
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_TARGETS), help="Módulos a importar")
+    parser.add_argument('--runs', type=int, default=5, help="Importações por módulo (usa a mediana)")
+    parser.add_argument('--project-budget-ms', type=float, default=DEFAULT_PROJECT_BUDGET_MS,
+                        help="Orçamento para o código do projeto (src.*, asteroids), por módulo")
+    parser.add_argument('--total-budget-ms', type=float, help="Orçamento opcional para a importação completa")
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.modules, args.runs, args.project_budget_ms, args.total_budget_ms)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    if report['failures']:
+        print(f"Acima do orçamento ou com efeitos colaterais: {', '.join(report['failures'])}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
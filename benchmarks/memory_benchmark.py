@@ -0,0 +1,257 @@
+"""
+Benchmark de memória das entidades: bytes por asteroide e por projétil e pausa do GC.
+
+Cria --asteroids asteroides (pelas vias do jogo: AsteroidPopulation.create, nos grupos
+de sprites) e --bullets projéteis de um BulletPool numa tela 1920x1080 (driver de vídeo
+'dummy') e mede:
+- bytes por entidade com tracemalloc (a instância, o Rect, os floats, a tupla de grupos e
+  as entradas nos grupos; imagens e quadros de rotação são compartilhados e já estão em
+  cache antes da medição);
+- objetos acompanhados pelo GC por entidade e atributos no __dict__ de cada instância
+  (Asteroid e Bullet são SlotSprite: o benchmark falha se alguma instância tiver __dict__);
+- a pausa de uma coleta completa (gc.collect(), a menor de --repeats) percorrendo só as
+  entidades: os objetos do resto do processo (Pygame, NumPy, módulos) são congelados com
+  gc.freeze() antes de criar o mundo; a coleta do processo sem o mundo é informada à parte.
+O mesmo é medido para o layout anterior ('antes'): um Sprite com os atributos no __dict__ e,
+em cada asteroide, referências aos grupos, à população, às dimensões da tela, ao cache de
+quadros, às propriedades da classe e à imagem base; em cada projétil, a velocidade e as
+dimensões da tela.
+
+Uso:
+    python benchmarks/memory_benchmark.py --asteroids 10000 --output memoria.json
+"""
+import gc
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import pygame
+from src.headless import init_headless_display
+from src.population import AsteroidPopulation
+from src.game_entities import ASTEROID_SIZES
+from src.bullet import BulletPool, BULLET_SPEED
+
+SCREEN_SIZE = (1920, 1080)
+DEFAULT_ASTEROIDS = 10000
+DEFAULT_BULLETS = 1000
+DEFAULT_REPEATS = 15
+SIZE_TYPES = tuple(ASTEROID_SIZES)
+
+
+class LegacyAsteroid(pygame.sprite.Sprite):
+    """O layout anterior do asteroide: tudo no __dict__ de cada instância."""
+
+    def __init__(self, asteroid):
+        super().__init__()
+        world = asteroid.world
+        self.all_sprites_ref = world.all_sprites
+        self.asteroids_group_ref = world.asteroids_group
+        self.population_ref = world.population
+        self.SCREEN_WIDTH = world.SCREEN_WIDTH
+        self.SCREEN_HEIGHT = world.SCREEN_HEIGHT
+        self.frame_cache = world.frame_cache
+        self.rng = asteroid.rng
+        self.size_type = asteroid.size_type
+        self.properties = asteroid.properties
+        self.base_image = asteroid.size_class.base_image
+        self.image = asteroid.image
+        self.frame = asteroid.frame
+        self.rect = asteroid.rect.copy()
+        self.radius = self.properties['radius'] * 0.8
+        self.angle = asteroid.angle + 0.0 # Floats novos, como os de cada asteroide
+        self.rotation_speed = asteroid.rotation_speed + 0.0
+        self.vx = asteroid.vx + 0.0
+        self.vy = asteroid.vy + 0.0
+
+
+class LegacyBullet(pygame.sprite.Sprite):
+    """O layout anterior do projétil: velocidade e dimensões da tela em cada instância."""
+    __slots__ = ('rect', 'speed', 'vx', 'vy', 'SCREEN_WIDTH', 'SCREEN_HEIGHT', 'pool', 'in_pool')
+
+    def __init__(self, bullet):
+        super().__init__()
+        self.rect = bullet.rect.copy()
+        self.speed = BULLET_SPEED
+        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = bullet.bounds
+        self.pool = bullet.pool
+        self.in_pool = bullet.in_pool
+        self.vx = bullet.vx + 0.0
+        self.vy = bullet.vy + 0.0
+
+
+def gc_pause_ms(repeats):
+    pauses = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        gc.collect()
+        pauses.append((time.perf_counter() - start) * 1000)
+    return min(pauses) # A menor pausa: as outras incluem interrupções do sistema
+
+
+def _measure(function, count):
+    """Bytes alocados e objetos acompanhados pelo GC por entidade criada por function()."""
+    gc.collect()
+    tracked = len(gc.get_objects())
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    gc.collect()
+    return result, allocated / count, (len(gc.get_objects()) - tracked) / count
+
+
+def build_world(asteroid_count, bullet_count, seed):
+    rng = random.Random(seed)
+    all_sprites = pygame.sprite.Group()
+    asteroids_group = pygame.sprite.Group()
+    bullets_group = pygame.sprite.Group()
+    population = AsteroidPopulation(total_budget=asteroid_count + len(SIZE_TYPES), max_spawns_per_tick=asteroid_count)
+    width, height = SCREEN_SIZE
+    # Imagens, quadros e contexto compartilhados já criados: a medição fica só com o custo por entidade
+    for size_type in SIZE_TYPES:
+        population.reserve(size_type)
+        population.create((0, 0), size_type, all_sprites, asteroids_group, width, height, rng)
+    for asteroid in asteroids_group:
+        asteroid.update()
+    all_sprites.empty()
+    asteroids_group.empty()
+    pool = BulletPool(width, height, capacity=0)
+
+    def create_asteroids():
+        for index in range(asteroid_count):
+            size_type = SIZE_TYPES[index % len(SIZE_TYPES)]
+            population.reserve(size_type)
+            population.create((rng.randrange(width), rng.randrange(height)), size_type,
+                              all_sprites, asteroids_group, width, height, rng)
+
+    def create_bullets():
+        for _ in range(bullet_count):
+            bullet = pool.acquire(rng.randrange(width), rng.randrange(height), rng.uniform(0, 360))
+            all_sprites.add(bullet)
+            bullets_group.add(bullet)
+
+    _, asteroid_bytes, asteroid_tracked = _measure(create_asteroids, asteroid_count)
+    _, bullet_bytes, bullet_tracked = _measure(create_bullets, bullet_count)
+    for group in (asteroids_group, bullets_group):
+        for entity in group:
+            if hasattr(entity, '__dict__'):
+                raise AssertionError(f"{type(entity).__name__} tem __dict__: algum atributo ficou fora de __slots__")
+    world = {'all_sprites': all_sprites, 'asteroids': asteroids_group, 'bullets': bullets_group,
+             'population': population, 'pool': pool}
+    return world, {
+        'asteroid_bytes': asteroid_bytes,
+        'asteroid_gc_objects': asteroid_tracked,
+        'asteroid_dict_attributes': len(getattr(next(iter(asteroids_group)), '__dict__', {})),
+        'bullet_bytes': bullet_bytes,
+        'bullet_gc_objects': bullet_tracked,
+        'bullet_dict_attributes': len(getattr(next(iter(bullets_group)), '__dict__', {})),
+    }
+
+
+def build_legacy_world(world, asteroid_count, bullet_count):
+    all_sprites = pygame.sprite.Group()
+    asteroids_group = pygame.sprite.Group()
+    bullets_group = pygame.sprite.Group()
+    sources = list(world['asteroids'])
+    bullet_sources = list(world['bullets'])
+
+    def create_asteroids():
+        for asteroid in sources:
+            legacy = LegacyAsteroid(asteroid)
+            all_sprites.add(legacy)
+            asteroids_group.add(legacy)
+
+    def create_bullets():
+        for bullet in bullet_sources:
+            legacy = LegacyBullet(bullet)
+            all_sprites.add(legacy)
+            bullets_group.add(legacy)
+
+    _, asteroid_bytes, asteroid_tracked = _measure(create_asteroids, asteroid_count)
+    _, bullet_bytes, bullet_tracked = _measure(create_bullets, bullet_count)
+    legacy_world = {'all_sprites': all_sprites, 'asteroids': asteroids_group, 'bullets': bullets_group}
+    return legacy_world, {
+        'asteroid_bytes': asteroid_bytes,
+        'asteroid_gc_objects': asteroid_tracked,
+        'asteroid_dict_attributes': len(next(iter(asteroids_group)).__dict__),
+        'bullet_bytes': bullet_bytes,
+        'bullet_gc_objects': bullet_tracked,
+        'bullet_dict_attributes': len(next(iter(bullets_group)).__dict__),
+    }
+
+
+def _drop(world):
+    for group in world.values():
+        if isinstance(group, pygame.sprite.AbstractGroup):
+            group.empty()
+    world.clear()
+    gc.collect()
+
+
+def run(asteroid_count, bullet_count, repeats, seed):
+    init_headless_display(*SCREEN_SIZE)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'asteroids': asteroid_count,
+            'bullets': bullet_count,
+            'repeats': repeats,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+    }
+    gc.collect()
+    process_ms = gc_pause_ms(repeats)
+    report['gc_process_ms'] = process_ms
+    gc.freeze() # Daqui em diante as coletas só percorrem o que for criado depois
+
+    world, after = build_world(asteroid_count, bullet_count, seed)
+    after['gc_pause_ms'] = gc_pause_ms(repeats)
+    legacy_world, before = build_legacy_world(world, asteroid_count, bullet_count)
+    _drop(world) # A coleta do layout anterior é medida com ele sozinho
+    before['gc_pause_ms'] = gc_pause_ms(repeats)
+    _drop(legacy_world)
+    gc.unfreeze()
+
+    report['before'] = before
+    report['after'] = after
+
+    for name, result in (('antes', before), ('depois', after)):
+        print(f"{name:<6}: asteroide={result['asteroid_bytes']:6.1f} bytes ({result['asteroid_dict_attributes']} atributos no __dict__, "
+              f"{result['asteroid_gc_objects']:.1f} objetos no GC) projétil={result['bullet_bytes']:6.1f} bytes "
+              f"({result['bullet_dict_attributes']} no __dict__) | coleta das entidades={result['gc_pause_ms']:.2f}ms "
+              f"(resto do processo={process_ms:.2f}ms)")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de memória por entidade e pausa do GC.")
+    parser.add_argument('--asteroids', type=int, default=DEFAULT_ASTEROIDS, help="Asteroides criados")
+    parser.add_argument('--bullets', type=int, default=DEFAULT_BULLETS, help="Projéteis criados")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Coletas completas medidas (vale a menor)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.asteroids, args.bullets, args.repeats, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
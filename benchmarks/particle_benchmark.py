@@ -0,0 +1,164 @@
+"""
+Benchmark do sistema de partículas (src/particles.py) contra um Sprite por partícula.
+
+Para cada quantidade de partículas vivas, enche o ParticleSystem com explosões de
+detritos espalhadas por uma tela 1920x1080 (driver de vídeo 'dummy') e mede por quadro:
+- update: o passo vetorizado (movimento, arrasto e idade);
+- draw_all: um único blits() com todas as partículas;
+- draw_capped: o mesmo com o limite padrão de partículas desenhadas (DEFAULT_MAX_DRAWN);
+- emit: o custo de uma explosão de asteroide grande.
+Até --sprite-limit partículas, mede também o caminho ingênuo: um pygame.sprite.Sprite
+por partícula num Group (update() em Python e Group.draw()).
+
+Uso:
+    python benchmarks/particle_benchmark.py --counts 1000,10000,50000 --output particulas.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import numpy as np
+import pygame
+from src.headless import init_headless_display
+from src.particles import ParticleSystem, DEBRIS_BY_SIZE, DEFAULT_MAX_DRAWN, DRAG
+
+SCREEN_SIZE = (1920, 1080)
+DEFAULT_COUNTS = (1000, 10000, 50000)
+DEFAULT_SPRITE_LIMIT = 10000
+BUDGET_MS = 1000 / 60
+
+
+class SpriteParticle(pygame.sprite.Sprite):
+    """O caminho evitado: uma partícula como Sprite, atualizada em Python."""
+
+    def __init__(self, image, position, velocity):
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(center=position)
+        self.x, self.y = position
+        self.vx, self.vy = velocity
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= DRAG
+        self.vy *= DRAG
+        self.rect.center = (self.x, self.y)
+
+
+def _time_frames(function, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def fill(system, count, rng):
+    burst = DEBRIS_BY_SIZE['LG']
+    emitted = 0
+    emit_seconds = 0.0
+    bursts = 0
+    while emitted < count:
+        position = (rng.uniform(0, SCREEN_SIZE[0]), rng.uniform(0, SCREEN_SIZE[1]))
+        start = time.perf_counter()
+        system.asteroid_destroyed(position, 'LG')
+        emit_seconds += time.perf_counter() - start
+        emitted += burst
+        bursts += 1
+    system.lifetime[:] = 1e9 # Ninguém morre durante a medição
+    system.remaining_ticks = 10 ** 9
+    return emit_seconds / bursts * 1e6
+
+
+def bench_system(screen, count, frames, seed):
+    rng = random.Random(seed)
+    system = ParticleSystem(*SCREEN_SIZE, capacity=max(count, 1024), max_drawn=0, seed=seed)
+    emit_us = fill(system, count, rng)
+    result = {'live': len(system), 'emit_us_per_burst': round(emit_us, 2)}
+    result['update_ms'] = _time_frames(system.update, frames)
+    result['draw_all_ms'] = _time_frames(lambda: system.draw(screen), frames)
+    result['dirty_rects'] = len(system.draw(screen))
+    system.max_drawn = DEFAULT_MAX_DRAWN
+    result['draw_capped_ms'] = _time_frames(lambda: system.draw(screen), frames)
+    result['drawn_capped'] = len(system.draw_list()[0])
+    return result
+
+
+def bench_sprites(screen, count, frames, seed):
+    rng = np.random.default_rng(seed)
+    image = pygame.Surface((5, 5), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.circle(image, (150, 140, 130, 255), (2, 2), 2)
+    group = pygame.sprite.Group()
+    directions = rng.uniform(0, 2 * np.pi, count)
+    speeds = rng.uniform(0.5, 3.0, count)
+    xs = rng.uniform(0, SCREEN_SIZE[0], count)
+    ys = rng.uniform(0, SCREEN_SIZE[1], count)
+    for x, y, direction, speed in zip(xs.tolist(), ys.tolist(), directions.tolist(), speeds.tolist()):
+        group.add(SpriteParticle(image, (x, y), (np.cos(direction) * speed, np.sin(direction) * speed)))
+    return {
+        'update_ms': _time_frames(group.update, frames),
+        'draw_ms': _time_frames(lambda: group.draw(screen), frames),
+    }
+
+
+def run(counts, frames, sprite_limit, seed):
+    screen = init_headless_display(*SCREEN_SIZE)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'screen': SCREEN_SIZE,
+            'frames': frames,
+            'seed': seed,
+            'max_drawn': DEFAULT_MAX_DRAWN,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'counts': {},
+    }
+    for count in counts:
+        entry = {'particles': bench_system(screen, count, frames, seed)}
+        particles = entry['particles']
+        line = (f"partículas={count:<6} update={particles['update_ms']:6.3f}ms "
+                f"draw(todas)={particles['draw_all_ms']:7.2f}ms draw(limite)={particles['draw_capped_ms']:6.2f}ms "
+                f"emissão={particles['emit_us_per_burst']:6.1f}us")
+        if count <= sprite_limit:
+            entry['sprites'] = bench_sprites(screen, count, frames, seed)
+            line += f" | sprites: update={entry['sprites']['update_ms']:7.2f}ms draw={entry['sprites']['draw_ms']:7.2f}ms"
+        total = particles['update_ms'] + particles['draw_capped_ms']
+        entry['within_budget'] = total <= BUDGET_MS
+        report['counts'][str(count)] = entry
+        print(line)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do sistema de partículas NumPy contra um Sprite por partícula.")
+    parser.add_argument('--counts', type=lambda text: [int(value) for value in text.split(',')],
+                        default=list(DEFAULT_COUNTS), help="Partículas vivas (ex: 1000,10000,50000)")
+    parser.add_argument('--frames', type=int, default=60, help="Quadros medidos por quantidade")
+    parser.add_argument('--sprite-limit', type=int, default=DEFAULT_SPRITE_LIMIT,
+                        help="Maior quantidade medida também com um Sprite por partícula")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.counts, args.frames, args.sprite_limit, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Verificação das ondas de criação da população de asteroides (src/population.py).
+
+Para cada motor (um Sprite por asteroide ou AsteroidField), monta uma HeadlessSimulation
+com o orçamento padrão, destrói um asteroide grande (LG) e avança só a população, um tick
+por vez (population.update(), chamada no fim de cada tick), contando os asteroides médios
+criados em cada tick. Confere que:
+- a cota de criações por tick é menor que o orçamento total;
+- nenhum tick cria mais filhos que a cota;
+- os filhos da divisão aparecem em mais de um tick (a onda realmente é distribuída);
+- todos os filhos reservados acabam criados.
+
+Sai com código 1 se alguma verificação falhar.
+
+Uso:
+    python benchmarks/population_check.py --output populacao.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT) # As imagens são carregadas por caminho relativo à raiz do projeto
+
+import pygame
+from src.headless import HeadlessSimulation
+from src.population import SPAWN_WAVES
+
+ENGINES = ('sprites', 'field')
+MAX_TICKS = 60
+
+
+def _count(group, size_type):
+    return sum(1 for asteroid in group if asteroid.size_type == size_type)
+
+
+def check_split(use_asteroid_field, seed):
+    simulation = HeadlessSimulation(seed=seed, use_asteroid_field=use_asteroid_field, announce=False)
+    population = simulation.population
+    group = simulation.asteroids_group
+    large = next(asteroid for asteroid in group if asteroid.size_type == 'LG')
+
+    before = _count(group, 'MD')
+    reserved_before = population.counts.get('MD', 0)
+    large.kill_asteroid() # Como um acerto de projétil, durante a fase de colisão de um tick
+    children = population.counts.get('MD', 0) - reserved_before
+    per_tick = []
+    created = 0
+    for _ in range(MAX_TICKS):
+        population.update() # Fim do tick
+        now = _count(group, 'MD') - before
+        per_tick.append(now - created)
+        created = now
+        if created >= children and not population.pending:
+            break
+    while per_tick and per_tick[-1] == 0:
+        per_tick.pop()
+    ticks_with_creations = sum(1 for count in per_tick if count)
+
+    result = {
+        'total_budget': population.total_budget,
+        'max_spawns_per_tick': population.max_spawns_per_tick,
+        'children': children,
+        'created_per_tick': per_tick,
+        'cap_below_budget': population.max_spawns_per_tick < population.total_budget,
+        'cap_respected': all(count <= population.max_spawns_per_tick for count in per_tick),
+        'spans_ticks': ticks_with_creations > 1,
+        'all_created': created == children and not population.pending,
+    }
+    result['ok'] = all(result[key] for key in ('cap_below_budget', 'cap_respected', 'spans_ticks', 'all_created'))
+    return result
+
+
+def run(seed):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'spawn_waves': SPAWN_WAVES,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'engines': {},
+    }
+    for engine in ENGINES:
+        result = check_split(engine == 'field', seed)
+        report['engines'][engine] = result
+        print(f"{engine:<8} orçamento={result['total_budget']} cota={result['max_spawns_per_tick']}/tick "
+              f"filhos={result['children']} por tick={result['created_per_tick']} "
+              f"{'OK' if result['ok'] else 'FALHOU'}")
+    report['ok'] = all(result['ok'] for result in report['engines'].values())
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica que a divisão de um asteroide é distribuída por vários ticks.")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Benchmark dos estados salvos (src/savestate.py): tamanho e tempo de ida e volta.
+
+Para cada quantidade de asteroides (com um projétil a cada 10 asteroides) e cada motor
+(um Sprite por asteroide ou AsteroidField), monta uma HeadlessSimulation e mede:
+- capture: serializar o mundo no buffer contíguo;
+- restore: restaurar no mesmo mundo, reaproveitando as instâncias (caso do rollback);
+- restore_cold: restaurar num mundo novo, que precisa criar as instâncias.
+Confere que capture(restore(estado)) reproduz o mesmo buffer e o mesmo digest, e que
+um rollback com StateHistory seguido da mesma entrada chega aos mesmos estados.
+
+Uso:
+    python benchmarks/savestate_benchmark.py --counts 100,1000,10000 --output estados.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT) # As imagens são carregadas por caminho relativo à raiz do projeto
+
+import pygame
+from src import savestate
+from src.headless import HeadlessSimulation, ScriptedInput
+from src.game_entities import ASTEROID_SIZES
+
+DEFAULT_COUNTS = (100, 1000, 10000)
+SIZE_TYPES = tuple(ASTEROID_SIZES)
+ENGINES = ('sprites', 'field')
+ROLLBACK_TICKS = 300
+ROLLBACK_DEPTH = 30
+
+
+def build_world(count, use_asteroid_field, seed):
+    simulation = HeadlessSimulation(seed=seed, asteroid_limit=count + 16, use_asteroid_field=use_asteroid_field)
+    rng = random.Random(seed)
+    population = simulation.population
+    width, height = simulation.SCREEN_WIDTH, simulation.SCREEN_HEIGHT
+    while population.total_count < count:
+        size_type = rng.choice(SIZE_TYPES)
+        if population.reserve(size_type):
+            population.create((rng.randrange(width), rng.randrange(height)), size_type, simulation.all_sprites,
+                              simulation.asteroids_group, width, height, simulation.rng)
+    pool = simulation.player.bullet_pool
+    for _ in range(count // 10):
+        bullet = pool.acquire(rng.randrange(width), rng.randrange(height), rng.randrange(80) * 4.5)
+        simulation.all_sprites.add(bullet)
+        simulation.bullets_group.add(bullet)
+    return simulation
+
+
+def _median_us(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e6
+
+
+def bench(count, use_asteroid_field, repeats, seed):
+    world = build_world(count, use_asteroid_field, seed)
+    digest = world.state_digest()
+    data = savestate.capture(world)
+    entities = len(world.all_sprites) + (len(world.asteroids_group) if use_asteroid_field else 0)
+
+    result = {
+        'entities': entities,
+        'bytes': len(data),
+        'bytes_per_entity': round(len(data) / max(1, entities), 2),
+        'capture_us': _median_us(lambda: savestate.capture(world), repeats),
+        'restore_us': _median_us(lambda: savestate.restore(world, data), repeats),
+    }
+    round_trip_ok = savestate.capture(world) == data and world.state_digest() == digest
+
+    fresh = HeadlessSimulation(seed=seed, asteroid_limit=count + 16, use_asteroid_field=use_asteroid_field)
+    start = time.perf_counter()
+    savestate.restore(fresh, data)
+    result['restore_cold_us'] = (time.perf_counter() - start) * 1e6
+    round_trip_ok = round_trip_ok and savestate.capture(fresh) == data and fresh.state_digest() == digest
+    result['round_trip_ok'] = round_trip_ok
+    return result
+
+
+def check_rollback(seed):
+    """Roda ROLLBACK_TICKS ticks salvando cada um, volta ROLLBACK_DEPTH ticks e confere que a repetição é idêntica."""
+    rng = random.Random(seed)
+    events = []
+    for tick in range(ROLLBACK_TICKS):
+        if rng.random() < 0.1:
+            command = rng.choice(('rotate_left', 'rotate_right', 'thrust_on', 'shoot_request'))
+            events.append((tick, command, command == 'shoot_request' or rng.random() < 0.5))
+    simulation = HeadlessSimulation(seed=seed, input_source=ScriptedInput(events), asteroid_limit=60)
+    history = savestate.StateHistory(capacity=ROLLBACK_DEPTH + 1)
+    digests = {}
+    while simulation.tick < ROLLBACK_TICKS:
+        history.save(simulation)
+        digests[simulation.tick] = simulation.state_digest()
+        if not simulation.step():
+            break
+    target = max(0, simulation.tick - ROLLBACK_DEPTH)
+    start = time.perf_counter()
+    history.rollback(simulation, target)
+    rollback_us = (time.perf_counter() - start) * 1e6
+    matches = True
+    while simulation.tick in digests:
+        matches = matches and simulation.state_digest() == digests[simulation.tick]
+        if not simulation.step():
+            break
+    return {'ticks': len(digests), 'rolled_back_to': target, 'rollback_us': round(rollback_us, 1), 'identical': matches}
+
+
+def run(counts, repeats, seed):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'engines': {engine: {} for engine in ENGINES},
+    }
+    for engine in ENGINES:
+        for count in counts:
+            result = bench(count, engine == 'field', repeats, seed)
+            report['engines'][engine][str(count)] = result
+            print(f"{engine:<8} asteroides={count:<6} {result['bytes']:>8} bytes ({result['bytes_per_entity']:5.1f}/entidade) "
+                  f"capture={result['capture_us']:9.1f}us restore={result['restore_us']:9.1f}us "
+                  f"frio={result['restore_cold_us']:9.1f}us {'OK' if result['round_trip_ok'] else 'DIVERGIU'}")
+    report['rollback'] = check_rollback(seed)
+    print(f"rollback: {report['rollback']}")
+    report['ok'] = report['rollback']['identical'] and all(
+        result['round_trip_ok'] for results in report['engines'].values() for result in results.values())
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de tamanho e ida e volta dos estados salvos.")
+    parser.add_argument('--counts', type=lambda text: [int(value) for value in text.split(',')],
+                        default=list(DEFAULT_COUNTS), help="Quantidades de asteroides (ex: 100,1000,10000)")
+    parser.add_argument('--repeats', type=int, default=20, help="Repetições por medida (usa a mediana)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.counts, args.repeats, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Teste de carga do servidor multijogador (src/server.py) em localhost.
+
+Para cada quantidade de jogadores, sobe um servidor num processo (fixado num núcleo,
+quando possível) e os bots em outros processos, espera todos conectarem e mede
+'--duration' segundos: tempo por tick (simulação + snapshots), uso do núcleo,
+ticks descartados, banda de saída por jogador e a compressão dos snapshots delta (o
+tamanho completo dos mesmos snapshots dividido pelo tamanho enviado). O resultado é a maior quantidade
+de jogadores cujo p95 do tick cabe no orçamento (1 / tick rate) sem descartar ticks,
+e uma estimativa de jogadores por núcleo a partir do uso medido.
+
+Uso:
+    python benchmarks/server_load.py --players 10,50,100,200 --duration 10 --output carga.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+
+DEFAULT_PLAYERS = (10, 50, 100, 200)
+# Bots por processo cliente: mais que isso e os próprios bots passam a ser o gargalo
+BOTS_PER_PROCESS = 100
+# Segundos extras para os bots conectarem antes de desistir
+CONNECT_TIMEOUT = 30.0
+
+
+def _env():
+    return dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1', SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+
+
+def _split(total, parts):
+    return [total // parts + (index < total % parts) for index in range(parts)]
+
+
+def measure(players, duration, tick_rate, snapshot_interval, asteroid_limit, seed, server_cpu):
+    """Um servidor com 'players' bots. Retorna o resumo de métricas do servidor e dos bots."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        metrics_path = os.path.join(tmp_dir, 'server.json')
+        command = [sys.executable, 'asteroids.py', '--server', '--port', '0', '--seed', str(seed),
+                   '--tick-rate', str(tick_rate), '--snapshot-interval', str(snapshot_interval),
+                   '--asteroid-limit', str(asteroid_limit), '--duration', str(duration),
+                   '--expect-clients', str(players), '--report-interval', '0', '--metrics-output', metrics_path]
+        if server_cpu is not None:
+            command += ['--cpu', str(server_cpu)]
+        server = subprocess.Popen(command, cwd=REPO_ROOT, env=_env(), stdout=subprocess.PIPE, text=True)
+        bots = []
+        try:
+            line = server.stdout.readline() # "Servidor ouvindo em HOST:PORTA"
+            address = line.strip().rsplit(' ', 1)[-1]
+            for index, count in enumerate(_split(players, -(-players // BOTS_PER_PROCESS))):
+                bots.append(subprocess.Popen(
+                    [sys.executable, 'asteroids.py', '--connect', address, '--bots', str(count),
+                     '--seed', str(seed + index + 1)],
+                    cwd=REPO_ROOT, env=_env(), stdout=subprocess.DEVNULL))
+            server.communicate(timeout=duration + CONNECT_TIMEOUT)
+            for bot in bots:
+                bot.wait(timeout=CONNECT_TIMEOUT) # Saem sozinhos quando o servidor fecha
+        finally:
+            for process in [server] + bots:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+        with open(metrics_path) as metrics_file:
+            return json.load(metrics_file)['server']
+
+
+def run(players_list, duration, tick_rate, snapshot_interval, asteroid_limit, seed):
+    # Servidor no núcleo 0 e bots nos demais, se a máquina tiver mais de um
+    server_cpu = 0 if hasattr(os, 'sched_setaffinity') and (os.cpu_count() or 1) > 1 else None
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'server_cpu': server_cpu,
+            'duration': duration,
+            'tick_rate': tick_rate,
+            'snapshot_interval': snapshot_interval,
+            'asteroid_limit': asteroid_limit,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'runs': {},
+    }
+    budget_ms = 1000 / tick_rate
+    max_players = 0
+    estimates = []
+    for players in players_list:
+        summary = measure(players, duration, tick_rate, snapshot_interval, asteroid_limit, seed, server_cpu)
+        within_budget = summary['tick_ms']['p95'] <= budget_ms and summary['dropped_ticks'] == 0
+        if within_budget:
+            max_players = max(max_players, players)
+        if summary['utilization'] > 0:
+            estimates.append(players / summary['utilization'])
+        report['runs'][str(players)] = dict(summary, within_budget=within_budget)
+        print(f"jogadores={players:<5} tick p50={summary['tick_ms']['p50']:6.2f}ms p95={summary['tick_ms']['p95']:6.2f}ms "
+              f"uso={summary['utilization'] * 100:5.1f}% descartados={summary['dropped_ticks']:<4} "
+              f"saída={summary['out_bytes_per_client_per_s'] / 1024:6.2f} kB/s por jogador "
+              f"delta={summary['snapshots']['delta_bytes_mean']:.0f}B (x{summary['snapshots']['compression_ratio'] or 0:.2f}) "
+              f"{'OK' if within_budget else 'ACIMA DO ORÇAMENTO'}")
+    report['max_players_within_budget'] = max_players
+    # O uso cresce mais que linearmente (colisões, snapshots maiores): a menor estimativa é a mais segura
+    report['players_per_core_estimate'] = int(min(estimates)) if estimates else None
+    print(f"Maior teste dentro do orçamento de {budget_ms:.1f} ms: {max_players} jogadores "
+          f"(estimativa por núcleo: {report['players_per_core_estimate']})")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor multijogador com bots em localhost.")
+    parser.add_argument('--players', type=lambda text: [int(value) for value in text.split(',')],
+                        default=list(DEFAULT_PLAYERS), help="Quantidades de jogadores (ex: 10,50,100)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Segundos medidos por quantidade")
+    parser.add_argument('--tick-rate', type=int, default=60)
+    parser.add_argument('--snapshot-interval', type=int, default=2)
+    parser.add_argument('--asteroid-limit', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.players, args.duration, args.tick_rate, args.snapshot_interval, args.asteroid_limit, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
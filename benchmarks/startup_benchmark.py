@@ -0,0 +1,105 @@
+"""
+Benchmark do tempo de inicialização: do lançamento do processo até o primeiro quadro.
+
+Executa asteroids.py várias vezes com o driver de vídeo 'dummy' e
+ASTEROIDES_STARTUP_PROBE=1 (o jogo sai logo após o primeiro quadro), com o cache
+de imagens vazio (frio) e já preenchido (quente). Mede o tempo de parede de cada
+processo e o tempo até o primeiro quadro informado pelo próprio jogo, além das
+imagens que precisaram ser decodificadas.
+
+Uso:
+    python benchmarks/startup_benchmark.py --runs 5 --output startup.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import platform
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+
+FIRST_FRAME_PATTERN = re.compile(r"Primeiro quadro em ([\d.]+) ms \(imports ([\d.]+) ms\); imagens: (.*)$", re.MULTILINE)
+
+
+def launch(cache_dir):
+    """
+    Uma execução do jogo até o primeiro quadro.
+    Retorna (parede_ms, primeiro_quadro_ms, imports_ms, imagens_ms, decodificadas).
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               ASTEROIDES_STARTUP_PROBE='1', ASTEROIDES_ASSET_CACHE=cache_dir,
+               PYGAME_HIDE_SUPPORT_PROMPT='1')
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, 'asteroids.py'], cwd=REPO_ROOT, env=env,
+                               capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    match = FIRST_FRAME_PATTERN.search(completed.stdout)
+    if match is None:
+        raise RuntimeError(f"o jogo não informou o primeiro quadro:\n{completed.stdout}\n{completed.stderr}")
+    stats = match.group(3)
+    decoded = re.search(r"'decoded': \[([^\]]*)\]", stats)
+    load_ms = re.search(r"'load_ms': ([\d.]+)", stats)
+    return (wall_ms, float(match.group(1)), float(match.group(2)),
+            float(load_ms.group(1)) if load_ms else 0.0, decoded.group(1) if decoded else '')
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def run(runs):
+    cache_dir = tempfile.mkdtemp(prefix='asteroides-assets-')
+    results = {'cold': [], 'warm': []}
+    try:
+        for _ in range(runs):
+            shutil.rmtree(cache_dir, ignore_errors=True) # Frio: cache vazio, todas as imagens são processadas
+            results['cold'].append(launch(cache_dir))
+            results['warm'].append(launch(cache_dir)) # Quente: tudo vem do cache em disco
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': runs,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+    }
+    for mode, samples in results.items():
+        wall, first_frame, imports, images, decoded = zip(*samples)
+        report[mode] = {
+            'wall_ms': _mean(wall),
+            'first_frame_ms': _mean(first_frame),
+            'min_first_frame_ms': min(first_frame),
+            'imports_ms': _mean(imports),
+            'images_ms': _mean(images),
+            'decoded': decoded[-1],
+        }
+        print(f"{mode:>5}: processo={report[mode]['wall_ms']:.1f}ms primeiro_quadro={report[mode]['first_frame_ms']:.1f}ms "
+              f"(min {report[mode]['min_first_frame_ms']:.1f}ms) imports={report[mode]['imports_ms']:.1f}ms "
+              f"imagens={report[mode]['images_ms']:.2f}ms decodificadas=[{decoded[-1]}]")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo até o primeiro quadro.")
+    parser.add_argument('--runs', type=int, default=5, help="Execuções por modo (frio e quente)")
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.runs)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
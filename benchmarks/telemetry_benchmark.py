@@ -0,0 +1,217 @@
+"""
+Benchmark da telemetria (src/telemetry.py): custo do registro no quadro e leitura de registros grandes.
+
+- registro: tempo de uma chamada de registro isolada e por evento ao reproduzir a sequência
+  com o escritor em outra thread, incluindo a pior chamada e as que passam de SLOW_CALL_SECONDS
+  (com um único núcleo, a compressão de cada lote pelo escritor interrompe o jogo por
+  cerca de 1 ms a cada batch_size eventos), comparado com o caminho
+  ingênuo de escrever uma linha JSON por evento direto no arquivo;
+- escrita: eventos por segundo da thread do escritor (compressão e escrita), bytes por
+  evento no disco e eventos descartados;
+- leitura: eventos por segundo de aggregate() sobre os arquivos gerados (com rotação),
+  comparado com ler e agregar as mesmas linhas JSON.
+Os eventos seguem uma mistura parecida com a de uma partida: um quadro por tick, tiros,
+acertos e gerações por classe de tamanho e um fim de jogo a cada poucos milhares de ticks.
+
+Uso:
+    python benchmarks/telemetry_benchmark.py --events 5000000 --output telemetria.json
+"""
+import gc
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import numpy as np
+from src import telemetry as telemetry_module
+from src.telemetry import TelemetryWriter, aggregate, SIZE_NAMES, EVENT_NAMES
+
+DEFAULT_EVENTS = 5_000_000
+# Eventos gravados também como JSON por linha (o caminho ingênuo é lento demais para todos)
+DEFAULT_JSON_EVENTS = 500_000
+# Arquivos menores que o padrão para a leitura atravessar várias rotações
+BENCH_MAX_FILE_BYTES = 4 * 1024 * 1024
+GAME_OVER_EVERY_TICKS = 3000
+# Chamadas de registro acima deste tempo são contadas como lentas (1% do quadro a 60 FPS)
+SLOW_CALL_SECONDS = 166e-6
+
+
+def synthetic_events(count, seed):
+    """Uma sequência de chamadas (método, argumentos, tick) parecida com a de uma partida."""
+    rng = random.Random(seed)
+    points = {'LG': 20, 'MD': 50, 'SM': 100}
+    calls = []
+    tick = 0
+    score = 0
+    while len(calls) < count:
+        tick += 1
+        calls.append(('frame', (rng.uniform(4.0, 20.0),), tick))
+        roll = rng.random()
+        if roll < 0.15:
+            calls.append(('shot', (), tick))
+        elif roll < 0.20:
+            size_type = rng.choice(SIZE_NAMES)
+            score += points[size_type]
+            calls.append(('hit', (size_type, points[size_type]), tick))
+            calls.append(('spawn', (size_type,), tick))
+        if tick % GAME_OVER_EVERY_TICKS == 0:
+            calls.append(('game_over', (score,), tick))
+            score = 0
+    return calls[:count]
+
+
+def bench_record_call(directory, count=1_000_000):
+    """Custo de uma chamada de registro isolada (frame()), sem o laço de reprodução da sequência."""
+    writer = TelemetryWriter(directory, {'mode': 'benchmark'})
+    writer.start()
+    frame = writer.frame
+    start = time.perf_counter()
+    for _ in range(count):
+        frame(16.7)
+    elapsed = time.perf_counter() - start
+    writer.close()
+    return elapsed / count * 1e9
+
+
+def bench_record(directory, calls):
+    writer = TelemetryWriter(directory, {'mode': 'benchmark'}, max_file_bytes=BENCH_MAX_FILE_BYTES)
+    writer.start()
+    methods = {name: getattr(writer, name) for name in ('frame', 'shot', 'hit', 'spawn', 'game_over')}
+    worst = 0.0
+    slow_calls = 0
+    last_tick = 0
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for name, arguments, tick in calls:
+        if tick != last_tick:
+            writer.begin_tick(tick)
+            last_tick = tick
+        call_start = perf_counter()
+        methods[name](*arguments)
+        elapsed = perf_counter() - call_start
+        if elapsed > SLOW_CALL_SECONDS:
+            slow_calls += 1
+            worst = max(worst, elapsed)
+    record_seconds = perf_counter() - start
+    close_start = perf_counter()
+    writer.close()
+    close_seconds = perf_counter() - close_start
+    stats = writer.stats()
+    return {
+        'events': len(calls),
+        'record_ns_per_event': record_seconds / len(calls) * 1e9,
+        'worst_call_us': worst * 1e6,
+        'slow_calls': slow_calls,
+        'close_ms': close_seconds * 1000,
+        'writer_events_per_second': stats['written'] / (stats['write_ms'] / 1000) if stats['write_ms'] else None,
+        'bytes': stats['bytes'],
+        'bytes_per_event': stats['bytes'] / max(1, stats['written']),
+        'files': stats['files'],
+        'dropped': stats['dropped'],
+    }
+
+
+def bench_json_lines(path, calls):
+    """O caminho evitado: um json.dumps e um write por evento, na thread do jogo."""
+    start = time.perf_counter()
+    with open(path, 'w') as output_file:
+        for name, arguments, tick in calls:
+            output_file.write(json.dumps({'tick': tick, 'event': name, 'args': arguments}) + '\n')
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    by_type = dict.fromkeys(EVENT_NAMES, 0)
+    hits_by_size = dict.fromkeys(SIZE_NAMES, 0)
+    frame_ms = []
+    with open(path) as input_file:
+        for line in input_file:
+            event = json.loads(line)
+            by_type[event['event']] += 1
+            if event['event'] == 'hit':
+                hits_by_size[event['args'][0]] += 1
+            elif event['event'] == 'frame':
+                frame_ms.append(event['args'][0])
+    np.percentile(frame_ms, (50, 95, 99))
+    read_seconds = time.perf_counter() - start
+    return {
+        'events': len(calls),
+        'record_ns_per_event': write_seconds / len(calls) * 1e9,
+        'bytes_per_event': os.path.getsize(path) / len(calls),
+        'read_events_per_second': len(calls) / read_seconds,
+    }
+
+
+def run(events, json_events, seed):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'events': events,
+            'json_events': json_events,
+            'batch_size': telemetry_module.DEFAULT_BATCH_SIZE,
+            'max_pending_batches': telemetry_module.DEFAULT_MAX_PENDING_BATCHES,
+            'max_file_bytes': BENCH_MAX_FILE_BYTES,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+    }
+    calls = synthetic_events(events, seed)
+    gc.freeze() # Milhões de tuplas da sequência de entrada: fora das coletas medidas junto com o registro
+    directory = tempfile.mkdtemp(prefix='telemetria-')
+    try:
+        telemetry_result = bench_record(directory, calls)
+        telemetry_result['record_call_ns'] = bench_record_call(os.path.join(directory, 'isolado'))
+        start = time.perf_counter()
+        summary = aggregate([directory])
+        read_seconds = time.perf_counter() - start
+        telemetry_result['read_events_per_second'] = summary['events'] / read_seconds
+        telemetry_result['read_ok'] = summary['events'] == events - telemetry_result['dropped']
+        report['telemetry'] = telemetry_result
+        report['summary'] = summary
+
+        if json_events:
+            report['json_lines'] = bench_json_lines(os.path.join(directory, 'eventos.jsonl'), calls[:json_events])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    result = report['telemetry']
+    print(f"telemetria: {result['events']} eventos, registro={result['record_call_ns']:.0f}ns/chamada "
+          f"({result['record_ns_per_event']:.0f}ns/evento com a sequência, pior chamada {result['worst_call_us']:.1f}us, {result['slow_calls']} acima de {SLOW_CALL_SECONDS * 1e6:.0f}us), escritor={result['writer_events_per_second'] / 1e6:.1f}M eventos/s, "
+          f"{result['bytes_per_event']:.2f} bytes/evento em {result['files']} arquivos, descartados={result['dropped']}, "
+          f"leitura={result['read_events_per_second'] / 1e6:.1f}M eventos/s {'OK' if result['read_ok'] else 'DIVERGIU'}")
+    if 'json_lines' in report:
+        naive = report['json_lines']
+        print(f"json por linha: {naive['events']} eventos, registro={naive['record_ns_per_event']:.0f}ns/evento, "
+              f"{naive['bytes_per_event']:.2f} bytes/evento, leitura={naive['read_events_per_second'] / 1e6:.2f}M eventos/s")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do registro e da leitura da telemetria.")
+    parser.add_argument('--events', type=int, default=DEFAULT_EVENTS, help="Eventos gravados pela telemetria")
+    parser.add_argument('--json-events', type=int, default=DEFAULT_JSON_EVENTS,
+                        help="Eventos gravados também como JSON por linha (0 = não comparar)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    report = run(args.events, args.json_events, args.seed)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0 if report['telemetry']['read_ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Benchmark de throughput por tick e custo por fase do quadro.
+
+Monta mundos com Player, Asteroid, Bullet, asteroid_manager e collision_handler
+reais em quantidades crescentes de entidades e mede, a cada tick, as fases
+update, collision, spawn, draw e flip. Roda com o driver de vídeo 'dummy'.
+
+Uso:
+    python benchmarks/tick_benchmark.py --output bench.json
+    python benchmarks/tick_benchmark.py --output novo.json --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT) # As imagens são carregadas por caminho relativo à raiz do projeto
+
+import pygame
+from src.headless import init_headless_display
+from src.asteroid_field import AsteroidField
+from src.population import AsteroidPopulation
+from src.asteroid_manager import spawn_periodic_asteroids
+from src.collision_handler import handle_bullet_asteroid_collisions, handle_player_asteroid_collisions
+from src.bullet import Bullet
+from src.spaceship import Player
+
+PHASES = ('update', 'collision', 'spawn', 'draw', 'flip')
+DEFAULT_ASTEROID_COUNTS = (10, 100, 1000, 10000)
+DEFAULT_BULLET_COUNTS = (0, 100, 1000)
+SIZE_TYPES = ('LG', 'MD', 'SM')
+
+
+class BenchmarkWorld:
+    """Um mundo com a população alvo mantida constante a cada tick (reposição conta como 'spawn')."""
+
+    def __init__(self, screen, asteroid_count, bullet_count, seed, use_asteroid_field):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.asteroid_count = asteroid_count
+        self.bullet_count = bullet_count
+        self.rng = random.Random(seed)
+        # Orçamento com folga para que filhos e geração periódica não fiquem bloqueados
+        self.population = AsteroidPopulation(asteroid_count * 2 + 16, max_spawns_per_tick=asteroid_count * 2 + 16)
+        self.input_state = {'rotate_left': False, 'rotate_right': False, 'thrust_on': False, 'shoot_request': False}
+
+        self.all_sprites = pygame.sprite.Group()
+        self.bullets_group = pygame.sprite.Group()
+        if use_asteroid_field:
+            self.asteroids_group = AsteroidField(self.population, self.width, self.height, rng=self.rng)
+        else:
+            self.asteroids_group = pygame.sprite.Group()
+        self.use_asteroid_field = use_asteroid_field
+
+        self.player = Player(self.all_sprites, self.bullets_group, self.width, self.height,
+                             input_state_ref=self.input_state, input_lock_ref=threading.Lock())
+        self.all_sprites.add(self.player)
+        self.refill()
+
+    def _add_asteroid(self):
+        size_type = self.rng.choice(SIZE_TYPES)
+        if not self.population.reserve(size_type):
+            return
+        position = (self.rng.randrange(0, self.width), self.rng.randrange(0, self.height))
+        self.population.create(position, size_type, self.all_sprites, self.asteroids_group,
+                               self.width, self.height, self.rng)
+
+    def _add_bullet(self):
+        bullet = Bullet(self.rng.randrange(0, self.width), self.rng.randrange(0, self.height),
+                        self.rng.uniform(0, 360), self.width, self.height)
+        self.all_sprites.add(bullet)
+        self.bullets_group.add(bullet)
+
+    def refill(self):
+        for _ in range(self.asteroid_count - len(self.asteroids_group)):
+            self._add_asteroid()
+        for _ in range(self.bullet_count - len(self.bullets_group)):
+            self._add_bullet()
+
+    def tick(self, timings):
+        clock = time.perf_counter
+
+        start = clock()
+        self.all_sprites.update()
+        if self.use_asteroid_field:
+            self.asteroids_group.update()
+        after_update = clock()
+
+        handle_bullet_asteroid_collisions(self.bullets_group, self.asteroids_group, 0)
+        handle_player_asteroid_collisions(self.player, self.asteroids_group, announce=False)
+        after_collision = clock()
+
+        spawn_periodic_asteroids(self.all_sprites, self.asteroids_group, self.population,
+                                 self.width, self.height, self.rng)
+        self.refill()
+        after_spawn = clock()
+
+        self.screen.fill((0, 0, 0))
+        self.all_sprites.draw(self.screen)
+        if self.use_asteroid_field:
+            self.asteroids_group.draw(self.screen)
+        after_draw = clock()
+
+        pygame.display.flip()
+        after_flip = clock()
+
+        timings['update'].append(after_update - start)
+        timings['collision'].append(after_collision - after_update)
+        timings['spawn'].append(after_spawn - after_collision)
+        timings['draw'].append(after_draw - after_spawn)
+        timings['flip'].append(after_flip - after_draw)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'p50_ms': _percentile(ordered, 0.50) * 1000,
+        'p95_ms': _percentile(ordered, 0.95) * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def run_case(screen, asteroid_count, bullet_count, ticks, warmup, seed, use_asteroid_field):
+    world = BenchmarkWorld(screen, asteroid_count, bullet_count, seed, use_asteroid_field)
+    timings = {phase: [] for phase in PHASES}
+    for _ in range(warmup):
+        world.tick(timings)
+    timings = {phase: [] for phase in PHASES}
+    for _ in range(ticks):
+        world.tick(timings)
+
+    tick_samples = [sum(values) for values in zip(*(timings[phase] for phase in PHASES))]
+    tick_summary = summarize(tick_samples)
+    return {
+        'asteroids': asteroid_count,
+        'bullets': bullet_count,
+        'ticks': ticks,
+        'phases': {phase: summarize(timings[phase]) for phase in PHASES},
+        'tick': tick_summary,
+        'ticks_per_second': 1000 / tick_summary['mean_ms'] if tick_summary['mean_ms'] else 0.0,
+    }
+
+
+def run_suite(asteroid_counts, bullet_counts, ticks, warmup, seed, screen_size, use_asteroid_field):
+    screen = init_headless_display(*screen_size)
+    results = []
+    for asteroid_count in asteroid_counts:
+        for bullet_count in bullet_counts:
+            result = run_case(screen, asteroid_count, bullet_count, ticks, warmup, seed, use_asteroid_field)
+            phases = ' '.join(f"{phase}={result['phases'][phase]['mean_ms']:.3f}" for phase in PHASES)
+            print(f"asteroides={asteroid_count:>6} projeteis={bullet_count:>5} "
+                  f"tick={result['tick']['mean_ms']:.3f}ms ({result['ticks_per_second']:.0f}/s) {phases}")
+            results.append(result)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'screen': list(screen_size),
+            'seed': seed,
+            'ticks': ticks,
+            'warmup': warmup,
+            'asteroid_field': use_asteroid_field,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """
+    Compara as médias por fase com a referência. Uma fase regrediu se ficou mais de
+    'threshold' (fração) mais lenta e a diferença absoluta passa de min_delta_ms.
+    Retorna a lista de regressões.
+    """
+    baseline_by_case = {(r['asteroids'], r['bullets']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        reference = baseline_by_case.get((result['asteroids'], result['bullets']))
+        if reference is None:
+            continue
+        for phase in PHASES + ('tick',):
+            now = result['tick'] if phase == 'tick' else result['phases'][phase]
+            before = reference['tick'] if phase == 'tick' else reference['phases'][phase]
+            delta = now['mean_ms'] - before['mean_ms']
+            if before['mean_ms'] > 0 and delta > min_delta_ms and delta / before['mean_ms'] > threshold:
+                regressions.append({
+                    'asteroids': result['asteroids'],
+                    'bullets': result['bullets'],
+                    'phase': phase,
+                    'baseline_ms': before['mean_ms'],
+                    'current_ms': now['mean_ms'],
+                    'change': delta / before['mean_ms'],
+                })
+    return regressions
+
+
+def _counts(text):
+    return tuple(int(value) for value in text.split(','))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de custo por fase do tick.")
+    parser.add_argument('--asteroids', type=_counts, default=DEFAULT_ASTEROID_COUNTS, help="Quantidades de asteroides, ex: 10,100,1000")
+    parser.add_argument('--bullets', type=_counts, default=DEFAULT_BULLET_COUNTS, help="Quantidades de projéteis, ex: 0,100")
+    parser.add_argument('--ticks', type=int, default=120)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--screen', type=_counts, default=(1280, 720), help="Resolução, ex: 1920,1080")
+    parser.add_argument('--asteroid-field', action='store_true', help="Usa o motor vetorizado AsteroidField")
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    parser.add_argument('--compare', help="Arquivo JSON de referência para detectar regressões")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Piora relativa tolerada (0.15 = 15%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05, help="Diferença absoluta mínima para contar como regressão")
+    args = parser.parse_args(argv)
+    # Caminhos relativos ao diretório de onde o benchmark foi chamado
+    output_path = os.path.join(INVOCATION_DIR, args.output) if args.output else None
+    compare_path = os.path.join(INVOCATION_DIR, args.compare) if args.compare else None
+
+    report = run_suite(args.asteroids, args.bullets, args.ticks, args.warmup, args.seed,
+                       args.screen, args.asteroid_field)
+    if output_path:
+        with open(output_path, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if compare_path:
+        with open(compare_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSÃO asteroides={regression['asteroids']} projeteis={regression['bullets']} "
+                  f"{regression['phase']}: {regression['baseline_ms']:.3f}ms -> {regression['current_ms']:.3f}ms "
+                  f"(+{regression['change'] * 100:.0f}%)")
+        if regressions:
+            return 1
+        print("Nenhuma regressão em relação à referência.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Benchmark dos ambientes vetorizados (src/vector_env.py): passos por segundo em função de N.
+
+Para cada quantidade de mundos N (e cada número de processos em --workers), cria o
+ambiente, recomeça todos os mundos e avança cerca de --env-steps passos de ambiente (no
+mínimo MIN_BATCH_STEPS passos em lote) com ações aleatórias (um inteiro por mundo com um bit
+por tecla). Informa:
+- passos de ambiente por segundo (N x passos em lote por segundo) e passos em lote por segundo;
+- a fração do tempo gasta montando as observações (só no próprio processo);
+- episódios terminados (os mundos recomeçam sozinhos).
+Com um único processo o ganho com N vem de diluir o custo fixo de cada passo (montar as
+observações em lote); com vários processos os blocos de mundos avançam em paralelo, até o
+número de núcleos da máquina.
+
+Uso:
+    python benchmarks/vector_env_benchmark.py --counts 1,16,64,256 --workers 1,4 --output ambientes.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOCATION_DIR = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import numpy as np
+import pygame
+from src.vector_env import make_vector_env, VectorEnv, ACTION_COMMANDS
+
+DEFAULT_COUNTS = (1, 4, 16, 64, 256)
+# Passos de ambiente (N x passos em lote) medidos em cada caso; no mínimo MIN_BATCH_STEPS em lote
+DEFAULT_ENV_STEPS = 20000
+MIN_BATCH_STEPS = 50
+
+
+def bench(num_envs, workers, env_steps, seed, use_asteroid_field):
+    env = make_vector_env(num_envs, workers=workers, seed=seed, use_asteroid_field=use_asteroid_field)
+    rng = np.random.default_rng(seed)
+    batch_steps = max(MIN_BATCH_STEPS, env_steps // num_envs)
+    actions = rng.integers(0, 1 << len(ACTION_COMMANDS), (batch_steps, num_envs))
+    try:
+        start = time.perf_counter()
+        env.reset()
+        reset_seconds = time.perf_counter() - start
+
+        episodes = 0
+        rewards = 0.0
+        start = time.perf_counter()
+        for step_actions in actions:
+            _, step_rewards, dones, _ = env.step(step_actions)
+            episodes += int(dones.sum())
+            rewards += float(step_rewards.sum())
+        elapsed = time.perf_counter() - start
+
+        result = {
+            'num_envs': num_envs,
+            'workers': workers,
+            'batch_steps': batch_steps,
+            'reset_ms': reset_seconds * 1000,
+            'env_steps_per_second': num_envs * batch_steps / elapsed,
+            'batch_steps_per_second': batch_steps / elapsed,
+            'episodes': episodes,
+            'reward_per_env_step': rewards / (num_envs * batch_steps),
+        }
+        if isinstance(env, VectorEnv):
+            start = time.perf_counter()
+            for _ in range(batch_steps):
+                env.observe()
+            result['observe_fraction'] = (time.perf_counter() - start) / elapsed
+        return result
+    finally:
+        env.close()
+
+
+def run(counts, workers_list, env_steps, seed, use_asteroid_field):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'env_steps': env_steps,
+            'asteroid_field': use_asteroid_field,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': [],
+    }
+    for workers in workers_list:
+        baseline = None
+        for num_envs in counts:
+            if workers > num_envs:
+                continue
+            result = bench(num_envs, workers, env_steps, seed, use_asteroid_field)
+            if baseline is None:
+                baseline = result['env_steps_per_second']
+            result['speedup'] = result['env_steps_per_second'] / baseline
+            report['results'].append(result)
+            observe = f" observações={result['observe_fraction']:.0%}" if 'observe_fraction' in result else ""
+            print(f"processos={workers:<3} N={num_envs:<5} {result['env_steps_per_second']:9.0f} passos/s "
+                  f"({result['batch_steps_per_second']:7.1f} em lote/s, x{result['speedup']:.2f}){observe} "
+                  f"episódios={result['episodes']}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de passos por segundo dos ambientes vetorizados.")
+    parser.add_argument('--counts', type=lambda text: [int(value) for value in text.split(',')],
+                        default=list(DEFAULT_COUNTS), help="Quantidades de mundos (ex: 1,16,64,256)")
+    parser.add_argument('--workers', type=lambda text: [int(value) for value in text.split(',')],
+                        default=None, help="Números de processos (padrão: 1 e o número de núcleos)")
+    parser.add_argument('--env-steps', type=int, default=DEFAULT_ENV_STEPS, help="Passos de ambiente por caso")
+    parser.add_argument('--asteroid-field', action='store_true', help="Usa o motor vetorizado AsteroidField")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    workers_list = args.workers or sorted({1, os.cpu_count() or 1})
+    report = run(args.counts, workers_list, args.env_steps, args.seed, args.asteroid_field)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
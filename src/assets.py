@@ -0,0 +1,200 @@
+import os
+import mmap
+import time
+import struct
+import hashlib
+import pygame
+
+# Imagens de origem (PNG/JPEG) e o cache de pixels já processados
+ASSET_DIR = 'static/images'
+DEFAULT_CACHE_DIR = '.asset_cache'
+# Muda sempre que o formato ou o processamento das folhas mudar (invalida o cache)
+CACHE_VERSION = 1
+
+SHEET_MAGIC = b'ASPR'
+SHEET_HEADER = struct.Struct('<4sHI') # magic, versão, número de quadros
+FRAME_HEADER = struct.Struct('<HH') # largura, altura (seguidos dos pixels)
+# Ordem de bytes de uma superfície convert_alpha() em máquinas little-endian: os quadros
+# lidos do cache já ficam no formato da tela e dispensam a conversão
+PIXEL_FORMAT = 'BGRA'
+
+# tobytes só existe a partir do pygame 2.1.3
+_image_to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+
+
+class AssetPipeline:
+    """
+    Pipeline de imagens com cache em disco.
+    Cada variante processada de uma imagem (redimensionada, ou uma folha com todos
+    os quadros de rotação) é gravada como pixels RGBA crus em cache_dir, numa chave
+    que inclui o tamanho e a data de modificação da origem. Nas execuções seguintes
+    a variante é lida direto do cache, sem decodificar o PNG/JPEG nem redimensionar
+    ou rotacionar. Tudo é carregado sob demanda: uma imagem que ninguém pede nunca
+    é decodificada.
+    """
+
+    def __init__(self, asset_dir=ASSET_DIR, cache_dir=None):
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir or os.environ.get('ASTEROIDES_ASSET_CACHE') or DEFAULT_CACHE_DIR
+        self._sources = {}
+        self._variants = {}
+        self.decoded = [] # Origens decodificadas nesta execução, em ordem
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.load_seconds = 0.0 # Tempo gasto lendo o cache ou processando as imagens
+
+    # --- Origens ---
+
+    def source(self, name):
+        """Decodifica a imagem de origem (uma única vez). Levanta pygame.error/FileNotFoundError se faltar."""
+        image = self._sources.get(name)
+        if image is None:
+            image = _convert(pygame.image.load(os.path.join(self.asset_dir, name)))
+            self._sources[name] = image
+            self.decoded.append(name)
+        return image
+
+    # --- Variantes ---
+
+    def sheet(self, name, variant, build, keep=True):
+        """
+        Lista de superfícies da variante 'variant' da imagem 'name'. Vem do cache em
+        memória, do cache em disco ou, na primeira vez, de build(origem decodificada).
+        Com keep=False a variante não fica em memória aqui (quem pediu é dono dela).
+        """
+        key = (name, variant)
+        frames = self._variants.get(key)
+        if frames is not None:
+            return frames
+        start = time.perf_counter()
+        path = self._cache_path(name, variant)
+        frames = _read_sheet(path) if path is not None else None
+        if frames is None:
+            self.cache_misses += 1
+            frames = build(self.source(name))
+            if path is not None:
+                _write_sheet(path, frames)
+        else:
+            self.cache_hits += 1
+        self.load_seconds += time.perf_counter() - start
+        if keep:
+            self._variants[key] = frames
+        return frames
+
+    def scaled(self, name, size):
+        """A imagem redimensionada para size = (largura, altura)."""
+        width, height = size
+        return self.sheet(name, f'size-{width}x{height}',
+                          lambda image: [pygame.transform.scale(image, size)])[0]
+
+    def scaled_by(self, name, factor):
+        """A imagem com largura e altura multiplicadas por factor (truncadas, como em int(w * factor))."""
+        return self.sheet(name, f'factor-{factor}', lambda image: [_scale_by(image, factor)])[0]
+
+    def rotation_sheet(self, name, factor, frames_per_turn):
+        """
+        Folha com frames_per_turn quadros de rotação da imagem redimensionada por factor;
+        o quadro i é a rotação de i * 360 / frames_per_turn graus (como em RotationFrameCache).
+        A folha não fica em memória aqui: o RotationFrameCache decide o que manter.
+        """
+        def build(image):
+            base = _scale_by(image, factor)
+            step = 360 / frames_per_turn
+            return [pygame.transform.rotate(base, index * step) for index in range(frames_per_turn)]
+        return self.sheet(name, f'rotation-{factor}-{frames_per_turn}', build, keep=False)
+
+    def stats(self):
+        return {
+            'decoded': list(self.decoded),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'load_ms': round(self.load_seconds * 1000, 2),
+            'cache_dir': self.cache_dir,
+        }
+
+    def _cache_path(self, name, variant):
+        """Arquivo de cache da variante, ou None se a origem não existir (o erro aparece ao decodificar)."""
+        try:
+            source_stat = os.stat(os.path.join(self.asset_dir, name))
+        except OSError:
+            return None
+        identity = f'{CACHE_VERSION}|{name}|{variant}|{source_stat.st_size}|{source_stat.st_mtime_ns}'
+        digest = hashlib.sha1(identity.encode()).hexdigest()[:16]
+        stem = os.path.splitext(name)[0]
+        return os.path.join(self.cache_dir, f'{stem}-{digest}.sheet')
+
+
+def _scale_by(image, factor):
+    return pygame.transform.scale(image, (int(image.get_width() * factor), int(image.get_height() * factor)))
+
+
+def _convert(image):
+    # convert_alpha() só é possível depois de criado o modo de vídeo
+    if pygame.display.get_surface() is None:
+        return image
+    return image.convert_alpha()
+
+
+def _read_sheet(path):
+    """
+    Lê uma folha do cache sem copiar os pixels: cada quadro é uma superfície sobre
+    um trecho do arquivo mapeado em memória (cópia na escrita, então desenhar sobre
+    um quadro não altera o arquivo). Retorna None se o arquivo faltar ou for inválido.
+    """
+    try:
+        with open(path, 'rb') as sheet_file:
+            mapped = mmap.mmap(sheet_file.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < SHEET_HEADER.size:
+        return None
+    magic, version, count = SHEET_HEADER.unpack_from(mapped, 0)
+    if magic != SHEET_MAGIC or version != CACHE_VERSION:
+        return None
+    frames = []
+    offset = SHEET_HEADER.size
+    view = memoryview(mapped)
+    for _ in range(count):
+        width, height = FRAME_HEADER.unpack_from(mapped, offset)
+        offset += FRAME_HEADER.size
+        nbytes = width * height * 4
+        if offset + nbytes > len(mapped):
+            return None # Arquivo truncado: reconstrói
+        frames.append(pygame.image.frombuffer(view[offset:offset + nbytes], (width, height), PIXEL_FORMAT))
+        offset += nbytes
+    # Em máquinas big-endian (ou telas com outro formato) os quadros ainda precisam ser convertidos
+    if frames and _display_masks() not in (None, frames[0].get_masks()):
+        frames = [_convert(frame) for frame in frames]
+    return frames
+
+
+def _display_masks():
+    if pygame.display.get_surface() is None:
+        return None
+    return pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+
+
+def _write_sheet(path, frames):
+    """Grava a folha de forma atômica; falhas de escrita só desativam o cache desta variante."""
+    parts = [SHEET_HEADER.pack(SHEET_MAGIC, CACHE_VERSION, len(frames))]
+    for frame in frames:
+        parts.append(FRAME_HEADER.pack(*frame.get_size()))
+        parts.append(_image_to_bytes(frame, PIXEL_FORMAT))
+    temporary = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, 'wb') as sheet_file:
+            sheet_file.write(b''.join(parts))
+        os.replace(temporary, path)
+    except OSError as e:
+        print(f"Não foi possível gravar o cache de imagens em {path}: {e}")
+
+
+# Pipeline compartilhado pelo processo
+_assets = None
+
+def get_assets():
+    global _assets
+    if _assets is None:
+        _assets = AssetPipeline()
+    return _assets
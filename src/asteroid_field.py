@@ -0,0 +1,273 @@
+import math
+import random
+import numpy as np
+from src.game_entities import ASTEROID_SIZES, get_asteroid_frame_cache
+from src.governor import get_detail
+from src.particles import get_particle_system
+
+# Ordem fixa das classes de tamanho; o índice é o código guardado no array 'size'
+SIZE_TYPES = tuple(ASTEROID_SIZES.keys())
+SIZE_CODES = {size_type: code for code, size_type in enumerate(SIZE_TYPES)}
+
+# Filhos gerados na destruição (mesma regra de Asteroid.kill_asteroid)
+CHILDREN_BY_SIZE = {'LG': ('MD', 2), 'MD': ('SM', 4)}
+
+
+class FieldAsteroid:
+    """
+    Visão leve de um asteroide guardado no AsteroidField.
+    Expõe a mesma interface usada por collision_handler (rect, radius, mask,
+    properties, alive(), kill_asteroid()) sem ser um Sprite.
+    """
+    __slots__ = ('field', 'index', 'generation')
+
+    def __init__(self, field, index):
+        self.field = field
+        self.index = index
+        self.generation = field.generation[index]
+
+    def __eq__(self, other):
+        return (isinstance(other, FieldAsteroid) and self.field is other.field
+                and self.index == other.index and self.generation == other.generation)
+
+    def __hash__(self):
+        return hash((id(self.field), self.index, int(self.generation)))
+
+    @property
+    def size_type(self):
+        return SIZE_TYPES[self.field.size[self.index]]
+
+    @property
+    def properties(self):
+        return ASTEROID_SIZES[self.size_type]
+
+    @property
+    def radius(self):
+        return self.field.radius_by_code[self.field.size[self.index]]
+
+    @property
+    def rect(self):
+        return self.field.rect_of(self.index)
+
+    @property
+    def mask(self):
+        return self.field.mask_of(self.index)
+
+    def alive(self):
+        return bool(self.field.alive[self.index]) and self.field.generation[self.index] == self.generation
+
+    def kill_asteroid(self, spawn_children=True):
+        if self.alive():
+            self.field.kill(self.index, spawn_children)
+
+
+class AsteroidField:
+    """
+    Motor de asteroides em estrutura de arrays (NumPy).
+    Posição, velocidade, ângulo, rotação, classe de tamanho e o indicador de vida
+    ficam em arrays; update() avança o campo inteiro num único passo vetorizado.
+    Também se comporta como um grupo de sprites para asteroid_manager e
+    collision_handler (iteração, len, draw).
+    """
+
+    def __init__(self, population_ref, screen_width, screen_height, capacity=256, rng=random):
+        self.rng = rng
+        self.population_ref = population_ref
+        self.SCREEN_WIDTH = screen_width
+        self.SCREEN_HEIGHT = screen_height
+        self.frame_cache = get_asteroid_frame_cache()
+
+        # Dados por classe de tamanho, indexados pelo código da classe
+        half_sizes = [self.frame_cache.base_image(size_type).get_size() for size_type in SIZE_TYPES]
+        self.half_w_by_code = np.array([w / 2 for w, _ in half_sizes])
+        self.half_h_by_code = np.array([h / 2 for _, h in half_sizes])
+        self.radius_by_code = [ASTEROID_SIZES[size_type]['radius'] * 0.8 for size_type in SIZE_TYPES]
+
+        self.capacity = 0
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0) # Posição no tick anterior, para interpolar o desenho
+        self.prev_y = np.zeros(0)
+        self.vx = np.zeros(0)
+        self.vy = np.zeros(0)
+        self.angle = np.zeros(0)
+        self.spin = np.zeros(0)
+        self.size = np.zeros(0, dtype=np.int8)
+        self.alive = np.zeros(0, dtype=bool)
+        self.generation = np.zeros(0, dtype=np.int64)
+        self._free = []
+        self._grow(capacity)
+
+    # --- Armazenamento ---
+
+    def _grow(self, new_capacity):
+        old_capacity = self.capacity
+        for name in ('x', 'y', 'prev_x', 'prev_y', 'vx', 'vy', 'angle', 'spin', 'size', 'alive', 'generation'):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        # Índices livres em ordem decrescente, para que pop() devolva o menor
+        self._free.extend(range(new_capacity - 1, old_capacity - 1, -1))
+        self.capacity = new_capacity
+
+    def spawn(self, position, size_type):
+        """Adiciona um asteroide com as mesmas distribuições aleatórias de Asteroid. Retorna o índice."""
+        if not self._free:
+            self._grow(max(1, self.capacity * 2))
+        index = self._free.pop()
+        properties = ASTEROID_SIZES[size_type]
+
+        angle = self.rng.uniform(0, 360)
+        rotation_speed = self.rng.uniform(-2.5, 2.5)
+        while -0.5 < rotation_speed < 0.5: # Garante que não seja muito lento ou estático
+            rotation_speed = self.rng.uniform(-2.5, 2.5)
+        movement_angle_rad = math.radians(self.rng.uniform(0, 360))
+        base_speed = self.rng.uniform(1, 2.5) * properties['speed_multiplier']
+
+        self.x[index], self.y[index] = position
+        self.prev_x[index], self.prev_y[index] = position
+        self.vx[index] = base_speed * math.cos(movement_angle_rad)
+        self.vy[index] = base_speed * math.sin(movement_angle_rad)
+        self.angle[index] = angle
+        self.spin[index] = rotation_speed
+        self.size[index] = SIZE_CODES[size_type]
+        self.alive[index] = True
+        self.generation[index] += 1
+        return index
+
+    def kill(self, index, spawn_children=True):
+        """Remove o asteroide do índice, liberando a vaga na população e gerando filhos se pedido."""
+        if not self.alive[index]:
+            return
+        self.alive[index] = False
+        self._free.append(index)
+        size_type = SIZE_TYPES[self.size[index]]
+        if spawn_children:
+            # Lidos antes de gerar os filhos: o primeiro filho reaproveita este mesmo índice
+            x, y = self.x[index], self.y[index]
+            velocity = (self.vx[index], self.vy[index])
+            children = CHILDREN_BY_SIZE.get(size_type)
+            if children is not None:
+                self._spawn_children(x, y, *children)
+            particles = get_particle_system()
+            if particles is not None:
+                particles.asteroid_destroyed((x, y), size_type, velocity)
+        self.population_ref.release(size_type) # Os próprios slots do campo já são reaproveitados
+
+    def _spawn_children(self, center_x, center_y, child_size_type, count):
+        for _ in range(count):
+            if self.population_ref.reserve(child_size_type):
+                new_pos = (center_x + self.rng.randint(-10, 10), center_y + self.rng.randint(-10, 10))
+                self.population_ref.spawn(new_pos, child_size_type, None, self, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.rng)
+            else:
+                break # Para de tentar gerar mais filhos se o orçamento da população foi atingido
+
+    # --- Simulação ---
+
+    def update(self):
+        """Avança todos os asteroides vivos um quadro: rotação, movimento, envelopamento e remoção."""
+        alive = self.alive
+        if not alive.any():
+            return
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        np.add(self.angle, self.spin, out=self.angle, where=alive)
+        np.mod(self.angle, 360, out=self.angle)
+        np.add(self.x, self.vx, out=self.x, where=alive)
+        np.add(self.y, self.vy, out=self.y, where=alive)
+
+        half_w = self.half_w_by_code[self.size]
+        half_h = self.half_h_by_code[self.size]
+
+        # Envelopamento horizontal (saiu pela direita volta pela esquerda e vice-versa)
+        past_right = alive & (self.x - half_w > self.SCREEN_WIDTH)
+        past_left = alive & (self.x + half_w < 0)
+        self.x[past_right] = -half_w[past_right]
+        self.x[past_left] = self.SCREEN_WIDTH + half_w[past_left]
+
+        # Saída vertical destrói o asteroide sem gerar filhos
+        gone = alive & ((self.y - half_h > self.SCREEN_HEIGHT) | (self.y + half_h < 0))
+        for index in np.flatnonzero(gone):
+            self.kill(int(index), spawn_children=False)
+
+    def frame_indices(self, stride=1):
+        """
+        Índices vivos e os respectivos índices de quadro de rotação, calculados em lote.
+        Com stride > 1 só um a cada 'stride' quadros é usado (como em RotationFrameCache.get).
+        """
+        live = np.flatnonzero(self.alive)
+        step = 360 / self.frame_cache.frames_per_turn
+        frames = np.rint(self.angle[live] / step).astype(np.int64) % self.frame_cache.frames_per_turn
+        if stride > 1:
+            frames -= frames % stride
+        return live, frames
+
+    def interpolated_positions(self, live, alpha):
+        """Posições entre o tick anterior e o atual; quem atravessou a borda fica na posição atual."""
+        x = self.x[live]
+        y = self.y[live]
+        if alpha >= 1.0:
+            return x, y
+        behind = 1.0 - alpha
+        dx = x - self.prev_x[live]
+        dy = y - self.prev_y[live]
+        wrapped = (np.abs(dx) > self.SCREEN_WIDTH / 2) | (np.abs(dy) > self.SCREEN_HEIGHT / 2)
+        dx[wrapped] = 0.0
+        dy[wrapped] = 0.0
+        return x - dx * behind, y - dy * behind
+
+    def draw_list(self, alpha=1.0):
+        """
+        Lista (imagem, destino) pronta para Surface.blits(); alpha < 1 interpola com o tick anterior.
+        O nível de detalhe (src/governor.py) pode engrossar o passo de rotação, congelar a
+        rotação dos 'SM' e descartar os asteroides que estão fora da tela.
+        """
+        detail = get_detail()
+        live, frames = self.frame_indices(detail.rotation_stride)
+        if detail.skip_small_rotation:
+            small = self.size[live] == SIZE_CODES['SM']
+            frames[small] = 0
+        get_frame = self.frame_cache.get_frame
+        x, y = self.interpolated_positions(live, alpha)
+        if detail.cull_offscreen:
+            codes = self.size[live]
+            # Meia diagonal da imagem base: cobre qualquer quadro rotacionado
+            reach = np.hypot(self.half_w_by_code[codes], self.half_h_by_code[codes])
+            visible = ((x + reach >= 0) & (x - reach <= self.SCREEN_WIDTH) &
+                       (y + reach >= 0) & (y - reach <= self.SCREEN_HEIGHT))
+            live, frames, x, y = live[visible], frames[visible], x[visible], y[visible]
+        xs = x.astype(np.int64).tolist()
+        ys = y.astype(np.int64).tolist()
+        codes = self.size[live].tolist()
+        result = []
+        for x, y, code, frame_index in zip(xs, ys, codes, frames.tolist()):
+            frame = get_frame(SIZE_TYPES[code], frame_index)
+            result.append((frame.image, (x - frame.offset_x, y - frame.offset_y)))
+        return result
+
+    def draw(self, surface, alpha=1.0):
+        """Desenha todos os asteroides com um único blits() e retorna os retângulos desenhados."""
+        return surface.blits(self.draw_list(alpha))
+
+    def rect_of(self, index):
+        frame = self.frame_cache.get(SIZE_TYPES[self.size[index]], self.angle[index])
+        return frame.rect_at((self.x[index], self.y[index]))
+
+    def mask_of(self, index):
+        """Máscara de colisão do quadro usado em rect_of (em cache junto com o quadro)."""
+        return self.frame_cache.get(SIZE_TYPES[self.size[index]], self.angle[index]).get_mask()
+
+    # --- Interface de grupo de sprites ---
+
+    def sprites(self):
+        return [FieldAsteroid(self, int(index)) for index in np.flatnonzero(self.alive)]
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def __bool__(self):
+        return bool(self.alive.any())
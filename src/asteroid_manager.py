@@ -1,17 +1,17 @@
 import pygame
 import random
-from src.game_entities import Asteroid as GameEntityAsteroid
+from src.timestep import SIMULATION_DT
+from src.governor import get_detail
 
 # Isso seria passado de asteroids.py ou definido aqui se fosse constante
 # Por enquanto, vamos assumir que são passados para as funções.
 # SCREEN_WIDTH, SCREEN_HEIGHT
-# asteroid_semaphore
+# population (AsteroidPopulation, em src/population.py)
 # all_sprites, asteroids_group
 
-ASTEROID_SPAWN_RATE = 60 # Gera um novo asteroide (se houver espaço) a cada segundo a 60 FPS
-asteroid_spawn_timer = 0
+ASTEROID_SPAWN_INTERVAL = 1.0 # Gera um novo asteroide (se houver espaço) a cada segundo de simulação
 
-def setup_initial_asteroids(all_sprites, asteroids_group, asteroid_semaphore, screen_width, screen_height):
+def setup_initial_asteroids(all_sprites, asteroids_group, population, screen_width, screen_height, rng=random):
     """
     Gera o conjunto inicial de asteroides para o jogo.
     """
@@ -23,53 +23,49 @@ def setup_initial_asteroids(all_sprites, asteroids_group, asteroid_semaphore, sc
 
     for config in initial_asteroids_config:
         for _ in range(config['count']):
-            if asteroid_semaphore.acquire(blocking=False):
-                start_x = random.randrange(0, screen_width)
-                if random.choice([True, False]):
-                    start_y = random.choice([-100, screen_height + 100])
-                    start_x = random.randrange(0, screen_width)
+            if population.reserve(config['type']):
+                start_x = rng.randrange(0, screen_width)
+                if rng.choice([True, False]):
+                    start_y = rng.choice([-100, screen_height + 100])
+                    start_x = rng.randrange(0, screen_width)
                 else:
-                    start_x = random.choice([-100, screen_width + 100])
-                    start_y = random.randrange(0, screen_height)
+                    start_x = rng.choice([-100, screen_width + 100])
+                    start_y = rng.randrange(0, screen_height)
                 
-                new_asteroid = GameEntityAsteroid(position=(start_x, start_y), size_type=config['type'], 
-                                                  all_sprites_ref=all_sprites, asteroids_group_ref=asteroids_group, 
-                                                  asteroid_semaphore_ref=asteroid_semaphore, 
-                                                  screen_width=screen_width, screen_height=screen_height)
-                all_sprites.add(new_asteroid)
-                asteroids_group.add(new_asteroid)
+                population.create((start_x, start_y), config['type'], all_sprites, asteroids_group,
+                                  screen_width, screen_height, rng)
             else:
-                print(f"Não foi possível adquirir o semáforo para o asteroide inicial {config['type']}. Interrompendo a geração inicial.")
+                print(f"Não foi possível reservar vaga para o asteroide inicial {config['type']}. Interrompendo a geração inicial.")
                 break 
         else: 
             continue
         break
 
-def spawn_periodic_asteroids(all_sprites, asteroids_group, asteroid_semaphore, screen_width, screen_height):
+def spawn_periodic_asteroids(all_sprites, asteroids_group, population, screen_width, screen_height, rng=random, dt=SIMULATION_DT):
     """
     Gera periodicamente novos asteroides durante o jogo.
-    Gerencia seu próprio temporizador.
+    O temporizador (population.spawn_timer) é medido em segundos de simulação (dt por chamada)
+    e pertence à população, para fazer parte do estado do mundo (ver src/replay.py).
+    Deve ser chamada uma vez por tick: também avança a população (criações pendentes e reaproveitamento).
     """
-    global asteroid_spawn_timer
-    asteroid_spawn_timer += 1
-    if asteroid_spawn_timer >= ASTEROID_SPAWN_RATE:
-        asteroid_spawn_timer = 0
-        if asteroid_semaphore.acquire(blocking=False):
-            new_asteroid_type = 'LG' # Por enquanto, apenas LG conforme o estado de teste do código original
+    population.spawn_timer += dt
+    # Tolerância para o erro de arredondamento ao somar dt repetidamente
+    if population.spawn_timer >= ASTEROID_SPAWN_INTERVAL - 1e-9:
+        population.spawn_timer = 0.0
+        new_asteroid_type = 'LG' # Por enquanto, apenas LG conforme o estado de teste do código original
+        # Sob carga, o governador (src/governor.py) limita a população mantida pela geração periódica
+        if get_detail().allows_spawn(population) and population.reserve(new_asteroid_type):
             
-            if random.choice([True, False]):
-                start_y = random.choice([-100, screen_height + 100])
-                start_x = random.randrange(0, screen_width)
+            if rng.choice([True, False]):
+                start_y = rng.choice([-100, screen_height + 100])
+                start_x = rng.randrange(0, screen_width)
             else:
-                start_x = random.choice([-100, screen_width + 100])
-                start_y = random.randrange(0, screen_height)
+                start_x = rng.choice([-100, screen_width + 100])
+                start_y = rng.randrange(0, screen_height)
             
-            new_asteroid = GameEntityAsteroid(position=(start_x, start_y), size_type=new_asteroid_type, 
-                                              all_sprites_ref=all_sprites, asteroids_group_ref=asteroids_group, 
-                                              asteroid_semaphore_ref=asteroid_semaphore, 
-                                              screen_width=screen_width, screen_height=screen_height)
-            all_sprites.add(new_asteroid)
-            asteroids_group.add(new_asteroid)
+            population.spawn((start_x, start_y), new_asteroid_type, all_sprites, asteroids_group,
+                             screen_width, screen_height, rng)
         # senão:
-            # print("Semáforo cheio, nenhum novo asteroide periódico criado.")
-            # pass # Semáforo cheio
+            # print("População no limite, nenhum novo asteroide periódico criado.")
+
+    population.update()
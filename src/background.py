@@ -0,0 +1,193 @@
+import random
+import pygame
+from src.assets import get_assets
+from src.governor import get_detail
+from src.timestep import SIMULATION_HZ
+
+BLACK = (0, 0, 0)
+
+# Camadas do fundo, da mais distante à mais próxima:
+# - 'image': imagem de origem (redimensionada por 'scale' e escurecida por 'dim'), opaca;
+# - 'stars': ladrilho gerado com estrelas sobre preto transparente (colorkey), 'count' estrelas
+#   de raio até 'radius';
+# - 'tile': lado do ladrilho gerado, em pixels;
+# - 'drift': deslocamento constante em pixels por segundo;
+# - 'parallax': fração da velocidade da nave com que a camada se desloca no sentido oposto.
+BACKGROUND_LAYERS = (
+    {'name': 'nebulosa', 'image': 'wllp.jpg', 'scale': 1.0, 'dim': 110, 'drift': (-2.0, 0.0), 'parallax': 0.02},
+    {'name': 'estrelas_distantes', 'stars': True, 'tile': 256, 'count': 40, 'radius': 1,
+     'color': (150, 150, 190), 'drift': (-6.0, 0.0), 'parallax': 0.08},
+    {'name': 'estrelas_proximas', 'stars': True, 'tile': 512, 'count': 24, 'radius': 2,
+     'color': (235, 235, 255), 'drift': (-15.0, 0.0), 'parallax': 0.2},
+)
+# Ticks entre atualizações do deslocamento desenhado: as posições são acumuladas a cada tick, mas
+# as camadas só mudam de lugar (todas juntas) uma vez a cada SCROLL_INTERVAL ticks, então o fundo
+# força no máximo um quadro inteiro a cada SCROLL_INTERVAL ticks
+SCROLL_INTERVAL = 6
+
+
+class BackgroundLayer:
+    """Um ladrilho já no formato da tela e o deslocamento atual da camada (em pixels, com fração)."""
+
+    def __init__(self, name, tile, opaque, drift, parallax):
+        self.name = name
+        self.tile = tile
+        self.width, self.height = tile.get_size()
+        self.opaque = opaque
+        self.drift_x = drift[0] / SIMULATION_HZ # Pixels por tick
+        self.drift_y = drift[1] / SIMULATION_HZ
+        self.parallax = parallax
+        self.x = 0.0
+        self.y = 0.0
+        self.offset = (0, 0) # Deslocamento inteiro usado no desenho
+
+    def update(self, velocity_x, velocity_y):
+        """Avança a posição da camada um tick, sem mudar o deslocamento desenhado."""
+        self.x = (self.x + self.drift_x + velocity_x * self.parallax) % self.width
+        self.y = (self.y + self.drift_y + velocity_y * self.parallax) % self.height
+
+    def refresh(self):
+        """Arredonda a posição atual para o deslocamento desenhado; retorna True se ele mudou."""
+        offset = (int(self.x), int(self.y))
+        if offset == self.offset:
+            return False
+        self.offset = offset
+        return True
+
+    def blits(self, rect, out):
+        """
+        Acrescenta a out os blits que cobrem rect com o ladrilho repetido: cada pedaço é um
+        sub-retângulo do ladrilho (área de origem), partido onde o ladrilho dá a volta.
+        """
+        tile = self.tile
+        width, height = self.width, self.height
+        offset_x, offset_y = self.offset
+        left, right = rect.left, rect.right
+        y = rect.top
+        bottom = rect.bottom
+        while y < bottom:
+            tile_y = (y + offset_y) % height
+            piece_height = min(height - tile_y, bottom - y)
+            x = left
+            while x < right:
+                tile_x = (x + offset_x) % width
+                piece_width = min(width - tile_x, right - x)
+                out.append((tile, (x, y), (tile_x, tile_y, piece_width, piece_height)))
+                x += piece_width
+            y += piece_height
+
+
+class ParallaxBackground:
+    """
+    Fundo espacial com camadas de paralaxe pré-renderizadas.
+    Cada camada é um ladrilho pequeno, convertido para o formato da tela uma única vez ao
+    iniciar (a nebulosa vem do cache de src/assets.py; as estrelas usam colorkey com RLE, então
+    o preto transparente é pulado), e é desenhada repetida com blits de sub-retângulos que dão
+    a volta no ladrilho, sem redimensionar nada nem montar uma imagem do tamanho da tela.
+    draw_rects(surface, rects) redesenha só o fundo dessas áreas: DirtyRectRenderer usa isso
+    para apagar as áreas sujas. O deslocamento desenhado só é atualizado a cada scroll_interval
+    ticks; quando ele muda, changed fica True e o próximo quadro é redesenhado inteiro.
+    Com drift=False as camadas só se deslocam com a nave (o fundo fica parado com ela parada).
+    """
+
+    def __init__(self, screen_width, screen_height, layers=BACKGROUND_LAYERS, seed=None, drift=True,
+                 scroll_interval=SCROLL_INTERVAL):
+        self.SCREEN_WIDTH = screen_width
+        self.SCREEN_HEIGHT = screen_height
+        self.screen_rect = pygame.Rect(0, 0, screen_width, screen_height)
+        rng = random.Random(seed)
+        self.drift = drift
+        self.scroll_interval = scroll_interval
+        self.layers = []
+        for properties in layers:
+            layer = self._build_layer(properties, rng)
+            if layer is not None:
+                self.layers.append(layer)
+        # Sem uma camada opaca na base, o fundo é preenchido de preto antes das estrelas
+        self.fill_first = not (self.layers and self.layers[0].opaque)
+        self.changed = True
+        self.scroll_frames = 0 # Ticks em que alguma camada mudou de posição
+        self._ticks = 0 # Ticks desde a última atualização do deslocamento desenhado
+
+    def _build_layer(self, properties, rng):
+        if properties.get('stars'):
+            tile = self._bake_stars(properties, rng)
+            opaque = False
+        else:
+            try:
+                tile = get_assets().scaled_by(properties['image'], properties['scale']).convert()
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Erro ao carregar a camada de fundo {properties['name']}: {e}")
+                return None
+            dim = properties.get('dim', 255)
+            if dim < 255:
+                tile.fill((dim, dim, dim), special_flags=pygame.BLEND_MULT) # Escurece: o jogo fica em primeiro plano
+            opaque = True
+        drift = properties['drift'] if self.drift else (0.0, 0.0)
+        return BackgroundLayer(properties['name'], tile, opaque, drift, properties['parallax'])
+
+    @staticmethod
+    def _bake_stars(properties, rng):
+        size = properties['tile']
+        tile = pygame.Surface((size, size))
+        tile.fill(BLACK)
+        red, green, blue = properties['color']
+        radius = properties['radius']
+        for _ in range(properties['count']):
+            brightness = rng.uniform(0.5, 1.0)
+            color = (int(red * brightness), int(green * brightness), int(blue * brightness))
+            # Longe das bordas: uma estrela nunca é cortada onde o ladrilho se repete
+            position = (rng.randrange(radius, size - radius), rng.randrange(radius, size - radius))
+            star_radius = rng.randint(max(1, radius - 1), radius)
+            if star_radius <= 1:
+                tile.set_at(position, color)
+            else:
+                pygame.draw.circle(tile, color, position, star_radius)
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        tile.set_colorkey(BLACK, pygame.RLEACCEL)
+        return tile
+
+    def update(self, velocity_x=0.0, velocity_y=0.0):
+        """Avança as camadas um tick (deriva constante e paralaxe com a velocidade da nave)."""
+        if not get_detail().background_scroll:
+            return # Sob carga o fundo fica parado: cada deslocamento custa um quadro inteiro
+        for layer in self.layers:
+            layer.update(velocity_x, velocity_y)
+        self._ticks += 1
+        if self._ticks < self.scroll_interval:
+            return
+        self._ticks = 0
+        moved = False
+        for layer in self.layers:
+            if layer.refresh():
+                moved = True
+        if moved:
+            self.changed = True
+            self.scroll_frames += 1
+
+    def draw(self, surface):
+        """Desenha o fundo na tela inteira."""
+        self.changed = False
+        self.draw_rects(surface, [self.screen_rect])
+
+    def draw_rects(self, surface, rects):
+        """Redesenha o fundo só nas áreas dadas, com um único blits()."""
+        screen_rect = self.screen_rect
+        clipped = [clipped for clipped in (rect.clip(screen_rect) for rect in rects) if clipped]
+        if self.fill_first:
+            for rect in clipped:
+                surface.fill(BLACK, rect)
+        blits = []
+        for layer in self.layers: # Camada por camada: as estrelas ficam por cima da nebulosa em todas as áreas
+            for rect in clipped:
+                layer.blits(rect, blits)
+        surface.blits(blits, doreturn=False)
+
+    def stats(self):
+        return {
+            'layers': [layer.name for layer in self.layers],
+            'tile_bytes': sum(layer.tile.get_width() * layer.tile.get_height() * layer.tile.get_bytesize()
+                              for layer in self.layers),
+            'scroll_frames': self.scroll_frames,
+        }
@@ -1,35 +1,146 @@
 import pygame
 import math
+from src.slot_sprite import SlotSprite
 
 # Cores
 WHITE = (255, 255, 255)
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, angle, screen_width, screen_height):
+BULLET_SIZE = (4, 10) # Retângulo pequeno para o projétil
+BULLET_SPEED = 10
+DEFAULT_POOL_CAPACITY = 64
+
+# Imagem compartilhada por todos os projéteis (nunca é modificada depois de criada)
+_bullet_image = None
+
+def get_bullet_image():
+    global _bullet_image
+    if _bullet_image is None:
+        _bullet_image = pygame.Surface(BULLET_SIZE)
+        _bullet_image.fill(WHITE)
+    return _bullet_image
+
+def direction_vector(angle):
+    # 0 graus aponta para CIMA; sen(-ângulo) para dx, -cos(-ângulo) para dy (Pygame Y aumenta para baixo)
+    angle_rad = math.radians(angle)
+    return math.sin(-angle_rad), -math.cos(-angle_rad)
+
+class Bullet(SlotSprite):
+    # Sem __dict__; bounds (largura, altura da tela) é a mesma tupla para todos os projéteis do pool.
+    # __weakref__: o servidor guarda os ids de rede num WeakKeyDictionary
+    __slots__ = ('rect', 'vx', 'vy', 'bounds', 'pool', 'in_pool', '__weakref__')
+
+    # A imagem é a mesma para todos os projéteis
+    @property
+    def image(self):
+        return get_bullet_image()
+
+    def __init__(self, x, y, angle, screen_width, screen_height, pool=None, direction=None):
         super().__init__()
-        self.image = pygame.Surface([4, 10]) # Retângulo pequeno para o projétil
-        self.image.fill(WHITE)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.speed = 10
-        
-        # Salva as dimensões da tela para verificação de limites
-        self.SCREEN_WIDTH = screen_width
-        self.SCREEN_HEIGHT = screen_height
+        self.rect = pygame.Rect((0, 0), BULLET_SIZE)
+
+        # Dimensões da tela para verificação de limites (compartilhadas com o pool de origem)
+        self.bounds = pool.bounds if pool is not None else (screen_width, screen_height)
+
+        # Pool de origem (None para projéteis avulsos)
+        self.pool = pool
+        self.in_pool = False
 
         # Comentários originais sobre rotação podem ser mantidos ou adaptados
         # A rotação do projétil pode ser implementada se desejado,
         # de forma similar à rotação do jogador, aplicada uma vez na criação.
+        self.reset(x, y, angle, direction)
 
-        angle_rad = math.radians(angle)
-        self.vx = self.speed * math.sin(-angle_rad) # sen(-ângulo) para dx
-        self.vy = self.speed * -math.cos(-angle_rad) # -cos(-ângulo) para dy (Pygame Y aumenta para baixo)
+    def reset(self, x, y, angle, direction=None):
+        """(Re)inicializa o projétil na posição e ângulo dados; direction é o vetor unitário já calculado."""
+        self.rect.center = (x, y)
+        dx, dy = direction if direction is not None else direction_vector(angle)
+        self.vx = BULLET_SPEED * dx
+        self.vy = BULLET_SPEED * dy
 
     def update(self):
         self.rect.x += self.vx
         self.rect.y += self.vy
 
         # Remove o projétil se sair completamente da tela
-        if (self.rect.right < 0 or self.rect.left > self.SCREEN_WIDTH or
-            self.rect.bottom < 0 or self.rect.top > self.SCREEN_HEIGHT):
+        screen_width, screen_height = self.bounds
+        if (self.rect.right < 0 or self.rect.left > screen_width or
+            self.rect.bottom < 0 or self.rect.top > screen_height):
             self.kill()
+
+    def kill(self):
+        super().kill()
+        # Devolve ao pool para ser reutilizado no próximo disparo
+        if self.pool is not None and not self.in_pool:
+            self.pool.release(self)
+
+class BulletPool:
+    """
+    Pool de projéteis pré-alocados.
+    acquire() reutiliza um projétil livre (ou cria um novo se o pool estiver vazio);
+    Bullet.kill() o devolve automaticamente. As direções de disparo vêm de uma
+    tabela pré-calculada indexada pelo passo de rotação da nave.
+    """
+
+    def __init__(self, screen_width, screen_height, capacity=DEFAULT_POOL_CAPACITY, angle_step=4.5):
+        self.SCREEN_WIDTH = screen_width
+        self.SCREEN_HEIGHT = screen_height
+        self.bounds = (screen_width, screen_height)
+        self.angle_step = angle_step
+        self.steps_per_turn = max(1, int(round(360 / angle_step)))
+        # Tabela de direções: índice i corresponde ao ângulo i * angle_step
+        self.direction_table = [direction_vector(index * angle_step) for index in range(self.steps_per_turn)]
+
+        self.free = []
+        self.allocated = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.acquired = 0
+        self.reused = 0
+        self.grown = 0
+        for _ in range(capacity):
+            self.free.append(self._new_bullet())
+
+    def _new_bullet(self):
+        bullet = Bullet(0, 0, 0, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, pool=self)
+        bullet.in_pool = True
+        self.allocated += 1
+        return bullet
+
+    def direction(self, angle):
+        """Vetor unitário para o ângulo; usa a tabela quando o ângulo cai num passo de rotação."""
+        index = angle / self.angle_step
+        rounded = int(round(index))
+        if rounded == index:
+            return self.direction_table[rounded % self.steps_per_turn]
+        return direction_vector(angle)
+
+    def acquire(self, x, y, angle):
+        if self.free:
+            bullet = self.free.pop()
+            self.reused += 1
+        else:
+            bullet = self._new_bullet() # Pool vazio: cresce sob demanda
+            self.grown += 1
+        bullet.in_pool = False
+        bullet.reset(x, y, angle, self.direction(angle))
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+        return bullet
+
+    def release(self, bullet):
+        bullet.in_pool = True
+        self.in_use -= 1
+        self.free.append(bullet)
+
+    def stats(self):
+        return {
+            'allocated': self.allocated,
+            'free': len(self.free),
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+            'acquired': self.acquired,
+            'reused': self.reused,
+            'grown': self.grown,
+        }
@@ -1,31 +1,187 @@
 import pygame
+import weakref
+from src.particles import get_particle_system
+from src.telemetry import get_telemetry
+
+# Tamanho da célula da grade espacial (pixels). Próximo do diâmetro de um asteroide grande.
+BROADPHASE_CELL_SIZE = 64
+
+# Colisão jogador-asteroide por máscara (pixel a pixel) depois do pré-teste por rect.
+# Com False volta ao teste de círculos (raios de ASTEROID_SIZES reduzidos a 80%), mais
+# impreciso contra a nave de 65x78; replays gravados antes das máscaras usam esse modo.
+PRECISE_PLAYER_COLLISIONS = True
+
+
+class SpatialHash:
+    """
+    Grade uniforme (spatial hash) usada como broadphase das colisões.
+    Cada entidade é registrada em todas as células cobertas pelo seu rect.
+    update() é incremental: só entidades que mudaram de células são movidas,
+    e entidades que não estão mais no grupo são removidas.
+    """
+
+    def __init__(self, cell_size=BROADPHASE_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entity_ranges = {} # entidade -> (cx0, cy0, cx1, cy1)
+        self.order = {} # entidade -> posição na iteração do grupo (preserva a ordem do pygame)
+        self.max_radius = 0
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.left, rect.right - 1) // size, max(rect.top, rect.bottom - 1) // size)
+
+    def _insert(self, entity, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = bucket = set()
+                bucket.add(entity)
+
+    def _remove(self, entity, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(entity)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def update(self, group):
+        """Sincroniza a grade com as posições atuais das entidades do grupo."""
+        entity_ranges = self.entity_ranges
+        order = {}
+        max_radius = 0
+        for position, entity in enumerate(group):
+            order[entity] = position
+            rect = entity.rect
+            radius = getattr(entity, 'radius', None)
+            if radius is None:
+                radius = 0.5 * ((rect.width ** 2 + rect.height ** 2) ** 0.5)
+            if radius > max_radius:
+                max_radius = radius
+            new_range = self._cell_range(rect)
+            old_range = entity_ranges.get(entity)
+            if old_range != new_range:
+                if old_range is not None:
+                    self._remove(entity, old_range)
+                self._insert(entity, new_range)
+                entity_ranges[entity] = new_range
+        # Remove entidades que saíram do grupo desde o último update
+        if len(entity_ranges) != len(order):
+            for entity in [e for e in entity_ranges if e not in order]:
+                self._remove(entity, entity_ranges.pop(entity))
+        self.order = order
+        self.max_radius = max_radius
+
+    def query_rect(self, rect):
+        """Candidatos cujas células cruzam o rect, na ordem de iteração do grupo."""
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        cells = self.cells
+        found = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if len(found) > 1:
+            return sorted(found, key=self.order.__getitem__)
+        return list(found)
+
+
+# Uma grade por grupo de asteroides, descartada junto com o grupo
+_asteroid_hashes = weakref.WeakKeyDictionary()
+
+def get_asteroid_hash(asteroids_group):
+    spatial_hash = _asteroid_hashes.get(asteroids_group)
+    if spatial_hash is None:
+        spatial_hash = SpatialHash()
+        _asteroid_hashes[asteroids_group] = spatial_hash
+    spatial_hash.update(asteroids_group)
+    return spatial_hash
 
 def handle_bullet_asteroid_collisions(bullets_group, asteroids_group, score_ref):
     """
     Lida com colisões entre projéteis e asteroides.
     Atualiza a pontuação.
+    Com a telemetria ligada (src/telemetry.py), registra cada acerto com a classe de tamanho e os pontos.
     Retorna a pontuação atualizada.
     """
-    # O primeiro True remove os projéteis, False significa que os asteroides são tratados manualmente (ex: para divisão)
-    hit_dict = pygame.sprite.groupcollide(bullets_group, asteroids_group, True, False)
-    
+    if not bullets_group or not asteroids_group:
+        return score_ref
+    spatial_hash = get_asteroid_hash(asteroids_group)
+
+    # Equivalente a pygame.sprite.groupcollide(bullets_group, asteroids_group, True, False),
+    # mas cada projétil só é testado contra os asteroides das células que ocupa
+    hit_dict = {}
+    for bullet in bullets_group.sprites():
+        bullet_rect = bullet.rect
+        asteroids_hit_list = [asteroid for asteroid in spatial_hash.query_rect(bullet_rect)
+                              if bullet_rect.colliderect(asteroid.rect)]
+        if asteroids_hit_list:
+            bullet.kill() # O projétil é removido, os asteroides são tratados manualmente (ex: para divisão)
+            hit_dict[bullet] = asteroids_hit_list
+
     current_score = score_ref # Usa uma variável local para acumular alterações de pontuação neste quadro
+    particles = get_particle_system()
+    telemetry = get_telemetry()
     for bullet_hit, asteroids_hit_list in hit_dict.items():
+        if particles is not None:
+            particles.bullet_hit(bullet_hit.rect.center) # Faíscas no ponto de impacto
         for asteroid_hit in asteroids_hit_list:
             if asteroid_hit.alive(): # Verifica se o asteroide ainda está vivo (não foi destruído por outro projétil no mesmo quadro)
                 # Assumindo que asteroid_hit.properties['score'] existe em game_entities.Asteroid
                 # Caso contrário, podemos precisar passar ASTEROID_SIZES ou obter a pontuação de forma diferente
-                current_score += asteroid_hit.properties.get('score', 10) # Pontuação padrão se não encontrada
+                points = asteroid_hit.properties.get('score', 10) # Pontuação padrão se não encontrada
+                current_score += points
+                if telemetry is not None:
+                    telemetry.hit(asteroid_hit.size_type, points) # Acerto por classe de tamanho
                 asteroid_hit.kill_asteroid(spawn_children=True)
     return current_score
 
-def handle_player_asteroid_collisions(player, asteroids_group):
+def _announce_player_hit(player, announce):
+    particles = get_particle_system()
+    if particles is not None:
+        particles.ship_destroyed(player.rect.center, (player.vx, player.vy))
+    if announce:
+        print("\033[91mGAME OVER! JOGADOR ATINGIU UM ASTEROIDE!\033[0m")
+
+def handle_player_asteroid_collisions(player, asteroids_group, precise=None, announce=True):
     """
     Lida com colisões entre o jogador e asteroides.
+    Com precise (PRECISE_PLAYER_COLLISIONS por padrão), os candidatos da grade espacial
+    passam por um pré-teste de rects e só então pelas máscaras de colisão, que ficam em
+    cache por quadro de rotação (sprite_cache); caso contrário usa collide_circle.
+    Com announce=False o aviso de fim de jogo não é impresso (ex: servidor multijogador).
+    Se houver um sistema de partículas (src/particles.py), a nave atingida explode.
     Retorna True se o jogo deve terminar, False caso contrário.
     """
-    if player.alive(): # Só verifica a colisão se o jogador estiver vivo
-        if pygame.sprite.spritecollide(player, asteroids_group, False, pygame.sprite.collide_circle):
-            print("\033[91mGAME OVER! JOGADOR ATINGIU UM ASTEROIDE!\033[0m")
-            return True # O jogo deve terminar
+    if precise is None:
+        precise = PRECISE_PLAYER_COLLISIONS
+    if player.alive() and asteroids_group and precise:
+        spatial_hash = get_asteroid_hash(asteroids_group)
+        player_rect = player.rect
+        for asteroid in spatial_hash.query_rect(player_rect):
+            if player_rect.colliderect(asteroid.rect) and pygame.sprite.collide_mask(player, asteroid):
+                _announce_player_hit(player, announce)
+                return True # O jogo deve terminar
+    elif player.alive() and asteroids_group: # Só verifica a colisão se o jogador estiver vivo
+        if not hasattr(player, 'radius'):
+            # Mesmo raio que collide_circle calcularia (e guardaria) na primeira chamada
+            player.radius = 0.5 * ((player.rect.width ** 2 + player.rect.height ** 2) ** 0.5)
+        spatial_hash = get_asteroid_hash(asteroids_group)
+        # Um asteroide só pode tocar o círculo do jogador se seu centro estiver dentro deste alcance
+        reach = int(player.radius + spatial_hash.max_radius) + 1
+        query_rect = pygame.Rect(0, 0, 2 * reach, 2 * reach)
+        query_rect.center = player.rect.center
+        for asteroid in spatial_hash.query_rect(query_rect):
+            if pygame.sprite.collide_circle(player, asteroid):
+                _announce_player_hit(player, announce)
+                return True # O jogo deve terminar
     return False # O jogo continua
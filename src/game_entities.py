@@ -1,6 +1,11 @@
 import pygame
 import random
 import math
+from src.assets import get_assets
+from src.sprite_cache import RotationFrameCache, DEFAULT_ANGLE_RESOLUTION, DEFAULT_MAX_BYTES
+from src.governor import get_detail
+from src.particles import get_particle_system
+from src.slot_sprite import SlotSprite
 
 # Define os tamanhos dos asteroides e suas propriedades
 ASTEROID_SIZES = {
@@ -9,79 +14,200 @@ ASTEROID_SIZES = {
     'SM': {'scale': 0.06, 'score': 100, 'speed_multiplier': 1.6, 'radius': 3}
 }
 
-# Variável global para armazenar a imagem do asteroide carregada para evitar recarregamento
-_asteroid_original_image = None
+# Imagem de origem dos asteroides (decodificada só se o cache em disco não tiver a variante pedida)
+ASTEROID_IMAGE = 'asteroid.png'
+# Imagem alternativa, usada quando a imagem do asteroide não pode ser carregada
+_asteroid_fallback_image = None
 
 def load_asteroid_image():
-    global _asteroid_original_image
-    if _asteroid_original_image is None:
-        try:
-            _asteroid_original_image = pygame.image.load('static/images/asteroid.png').convert_alpha()
-        except pygame.error as e:
+    global _asteroid_fallback_image
+    try:
+        return get_assets().source(ASTEROID_IMAGE)
+    except (pygame.error, FileNotFoundError) as e:
+        if _asteroid_fallback_image is None:
             print(f"Erro ao carregar imagem do asteroide: {e}")
             # Cria uma superfície circular de fallback se a imagem falhar ao carregar
-            _asteroid_original_image = pygame.Surface((100, 100), pygame.SRCALPHA)
-            pygame.draw.circle(_asteroid_original_image, (128, 128, 128), (50, 50), 50)
-    return _asteroid_original_image
+            _asteroid_fallback_image = pygame.Surface((100, 100), pygame.SRCALPHA)
+            pygame.draw.circle(_asteroid_fallback_image, (128, 128, 128), (50, 50), 50)
+        return _asteroid_fallback_image
 
-class Asteroid(pygame.sprite.Sprite):
-    def __init__(self, position, size_type, all_sprites_ref, asteroids_group_ref, asteroid_semaphore_ref, screen_width, screen_height):
-        super().__init__()
-        
+def _scale_asteroid_image(size_type):
+    # Redimensiona uma única vez por classe de tamanho (ou lê a versão já redimensionada do cache em disco)
+    scale = ASTEROID_SIZES[size_type]['scale']
+    try:
+        return get_assets().scaled_by(ASTEROID_IMAGE, scale)
+    except (pygame.error, FileNotFoundError):
+        original_image = load_asteroid_image()
+        scaled_width = int(original_image.get_width() * scale)
+        scaled_height = int(original_image.get_height() * scale)
+        return pygame.transform.scale(original_image, (scaled_width, scaled_height))
+
+def _asteroid_rotation_sheet(size_type, frames_per_turn):
+    # Todos os quadros de rotação da classe, do cache em disco; None volta a rotacionar em memória
+    try:
+        return get_assets().rotation_sheet(ASTEROID_IMAGE, ASTEROID_SIZES[size_type]['scale'], frames_per_turn)
+    except (pygame.error, FileNotFoundError):
+        return None
+
+# Cache de quadros de rotação compartilhado por todos os asteroides
+_asteroid_frame_cache = None
+
+def get_asteroid_frame_cache():
+    global _asteroid_frame_cache
+    if _asteroid_frame_cache is None:
+        _asteroid_frame_cache = RotationFrameCache(_scale_asteroid_image, sheet_factory=_asteroid_rotation_sheet)
+    return _asteroid_frame_cache
+
+def configure_asteroid_frame_cache(angle_resolution=DEFAULT_ANGLE_RESOLUTION, max_bytes=DEFAULT_MAX_BYTES, prerender=False):
+    """
+    Recria o cache de quadros dos asteroides com a resolução angular e o limite de memória dados.
+    Com prerender=True, todos os quadros de todas as classes são renderizados imediatamente.
+    """
+    global _asteroid_frame_cache
+    _asteroid_frame_cache = RotationFrameCache(_scale_asteroid_image, angle_resolution, max_bytes,
+                                               sheet_factory=_asteroid_rotation_sheet)
+    if prerender:
+        for size_type in ASTEROID_SIZES:
+            _asteroid_frame_cache.prerender(size_type)
+    return _asteroid_frame_cache
+
+class AsteroidClass:
+    """Dados de uma classe de tamanho, compartilhados por todos os asteroides da classe."""
+    __slots__ = ('size_type', 'properties', 'score', 'speed_multiplier', 'radius', 'base_image')
+
+    def __init__(self, size_type, frame_cache):
         self.size_type = size_type
         self.properties = ASTEROID_SIZES[size_type]
-        self.original_image = load_asteroid_image() # Carrega a imagem base (ou obtém do cache)
+        self.score = self.properties['score']
+        self.speed_multiplier = self.properties['speed_multiplier']
+        self.radius = self.properties['radius'] * 0.8 # Para detecção de colisão (reduzido para 80%)
+        self.base_image = frame_cache.base_image(size_type) # Imagem redimensionada, compartilhada pela classe
+
+class AsteroidWorld:
+    """
+    Contexto compartilhado pelos asteroides de um mundo: grupos, população, dimensões da tela,
+    cache de quadros e as classes de tamanho. Cada asteroide guarda só uma referência a ele.
+    """
+    __slots__ = ('all_sprites', 'asteroids_group', 'population', 'SCREEN_WIDTH', 'SCREEN_HEIGHT',
+                 'frame_cache', 'classes')
+
+    def __init__(self, all_sprites, asteroids_group, population, screen_width, screen_height, frame_cache):
+        self.all_sprites = all_sprites
+        self.asteroids_group = asteroids_group
+        self.population = population # Gerenciador de população (orçamento e reaproveitamento de instâncias)
+        self.SCREEN_WIDTH = screen_width
+        self.SCREEN_HEIGHT = screen_height
+        self.frame_cache = frame_cache
+        self.classes = {}
+
+    def size_class(self, size_type):
+        size_class = self.classes.get(size_type)
+        if size_class is None:
+            size_class = self.classes[size_type] = AsteroidClass(size_type, self.frame_cache)
+        return size_class
+
+def asteroid_world(all_sprites, asteroids_group, population, screen_width, screen_height):
+    """O contexto dos asteroides desses grupos e dimensões; um só por população, reaproveitado por todos."""
+    frame_cache = get_asteroid_frame_cache()
+    key = (all_sprites, asteroids_group, screen_width, screen_height, frame_cache)
+    world = population.asteroid_worlds.get(key)
+    if world is None:
+        world = population.asteroid_worlds[key] = AsteroidWorld(all_sprites, asteroids_group, population,
+                                                                screen_width, screen_height, frame_cache)
+    return world
+
+class Asteroid(SlotSprite):
+    # Sem __dict__ (SlotSprite): o que é comum ao mundo fica em AsteroidWorld e o que é comum à
+    # classe de tamanho em AsteroidClass. __weakref__ mantém as referências fracas usadas pelos
+    # ids de rede do servidor (MultiplayerSimulation.net_id)
+    __slots__ = ('world', 'size_class', 'size_type', 'radius', 'rng', 'image', 'rect', 'frame',
+                 'angle', 'rotation_speed', 'vx', 'vy', '__weakref__')
+
+    def __init__(self, position, size_type, all_sprites_ref, asteroids_group_ref, population_ref, screen_width, screen_height, rng=random):
+        super().__init__()
+        self.world = asteroid_world(all_sprites_ref, asteroids_group_ref, population_ref, screen_width, screen_height)
+        self.reset(position, size_type, rng)
+
+    @property
+    def properties(self):
+        return self.size_class.properties
+
+    def _set_size_type(self, size_type):
+        size_class = self.world.size_class(size_type)
+        self.size_class = size_class
+        self.size_type = size_type
+        self.radius = size_class.radius
+
+    def reset(self, position, size_type, rng=random):
+        """(Re)inicializa o asteroide; usado na criação e quando uma instância é reaproveitada."""
+        self.rng = rng # Gerador aleatório (o módulo random por padrão, ou um random.Random com semente)
         
-        # Redimensiona a imagem
-        scaled_width = int(self.original_image.get_width() * self.properties['scale'])
-        scaled_height = int(self.original_image.get_height() * self.properties['scale'])
-        self.base_image = pygame.transform.scale(self.original_image, (scaled_width, scaled_height)) # Armazena a imagem redimensionada antes da rotação
-        self.image = self.base_image.copy() # A imagem inicial é uma cópia da imagem base
+        self._set_size_type(size_type)
+        self.image = self.size_class.base_image
+        self.frame = None # Quadro de rotação atual (None enquanto a imagem for a base)
         self.rect = self.image.get_rect(center=position)
-        self.radius = self.properties['radius'] * 0.8 # Para detecção de colisão (reduzido para 80%)
 
         # Atributos de rotação
-        self.angle = random.uniform(0, 360) # Ângulo de rotação visual
-        self.rotation_speed = random.uniform(-2.5, 2.5) # Graus por quadro
+        self.angle = self.rng.uniform(0, 360) # Ângulo de rotação visual
+        self.rotation_speed = self.rng.uniform(-2.5, 2.5) # Graus por quadro
         while -0.5 < self.rotation_speed < 0.5: # Garante que não seja muito lento ou estático
-            self.rotation_speed = random.uniform(-2.5, 2.5)
+            self.rotation_speed = self.rng.uniform(-2.5, 2.5)
 
         # Movimento
-        movement_angle_deg = random.uniform(0, 360) # Ângulo para a direção inicial do movimento
+        movement_angle_deg = self.rng.uniform(0, 360) # Ângulo para a direção inicial do movimento
         movement_angle_rad = math.radians(movement_angle_deg)
-        base_speed = random.uniform(1, 2.5) * self.properties['speed_multiplier']
+        base_speed = self.rng.uniform(1, 2.5) * self.size_class.speed_multiplier
         self.vx = base_speed * math.cos(movement_angle_rad)
         self.vy = base_speed * math.sin(movement_angle_rad)
-        
-        self.all_sprites_ref = all_sprites_ref
-        self.asteroids_group_ref = asteroids_group_ref
-        self.asteroid_semaphore_ref = asteroid_semaphore_ref
-        self.SCREEN_WIDTH = screen_width
-        self.SCREEN_HEIGHT = screen_height
+
+    def restore(self, size_type, rect, angle, rotation_speed, vx, vy, rng=random):
+        """Coloca o asteroide num estado salvo (src/savestate.py), sem consumir números aleatórios."""
+        self.rng = rng
+        self._set_size_type(size_type)
+        self.angle = angle
+        self.rotation_speed = rotation_speed
+        self.vx = vx
+        self.vy = vy
+        self.frame = self.world.frame_cache.get(size_type, angle) # O quadro que update() escolheu para este ângulo
+        self.image = self.frame.image
+        self.rect = pygame.Rect(rect)
 
     def update(self):
+        world = self.world
         # Rotação
         self.angle = (self.angle + self.rotation_speed) % 360
-        self.image = pygame.transform.rotate(self.base_image, self.angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        # Sob carga, o nível de detalhe (src/governor.py) pode manter o quadro atual
+        detail = get_detail()
+        if detail.rotates(self.size_type, self.rect, world.SCREEN_WIDTH, world.SCREEN_HEIGHT):
+            frame = world.frame_cache.get(self.size_type, self.angle, detail.rotation_stride) # Quadro pré-renderizado em vez de rotacionar
+            self.frame = frame
+            self.image = frame.image
+            self.rect = frame.rect_at(self.rect.center)
 
         # Movimento
         self.rect.x += self.vx
         self.rect.y += self.vy
 
         # Envelopamento de tela (versão simples por enquanto)
-        if self.rect.left > self.SCREEN_WIDTH:
+        if self.rect.left > world.SCREEN_WIDTH:
             self.rect.right = 0
         elif self.rect.right < 0:
-            self.rect.left = self.SCREEN_WIDTH
+            self.rect.left = world.SCREEN_WIDTH
         
-        if self.rect.top > self.SCREEN_HEIGHT:
-            # Em vez de envelopar, se sair pela parte inferior, deve ser destruído e liberar o semáforo
+        if self.rect.top > world.SCREEN_HEIGHT:
+            # Em vez de envelopar, se sair pela parte inferior, deve ser destruído e liberar a vaga na população
             self.kill_asteroid(spawn_children=False)
         elif self.rect.bottom < 0:
             # Se sair pelo topo, também destrói e libera (menos comum com o spawn inicial)
             self.kill_asteroid(spawn_children=False)
 
+    @property
+    def mask(self):
+        """Máscara de colisão da imagem atual, em cache por quadro de rotação (usada por collide_mask)."""
+        if self.frame is None:
+            return self.world.frame_cache.base_mask(self.size_type)
+        return self.frame.get_mask()
+
     def kill_asteroid(self, spawn_children=True):
         # Espaço reservado para quebrar em asteroides menores
         if spawn_children:
@@ -90,23 +216,25 @@ class Asteroid(pygame.sprite.Sprite):
             elif self.size_type == 'MD':
                 self._spawn_children('SM', 4) # Gera 4 asteroides pequenos
             # Asteroides SM não geram filhos
+            # Detritos da destruição (só com o jogo com janela; asteroides que saem da tela não explodem)
+            particles = get_particle_system()
+            if particles is not None:
+                particles.asteroid_destroyed(self.rect.center, self.size_type, (self.vx, self.vy))
         
         self.kill() # Remove dos grupos de sprites
-        self.asteroid_semaphore_ref.release()
-        # print(f"Asteroide ({self.size_type}) destruído. Semáforo liberado. Contagem: {self.asteroid_semaphore_ref._value}")
+        self.world.population.release(self.size_type, self) # Libera a vaga e devolve a instância para reaproveitamento
 
     def _spawn_children(self, child_size_type, count):
+        world = self.world
         for _ in range(count):
-            if self.asteroid_semaphore_ref.acquire(blocking=False):
-                new_pos = (self.rect.centerx + random.randint(-10,10), self.rect.centery + random.randint(-10,10))
-                child_asteroid = Asteroid(new_pos, child_size_type, 
-                                          self.all_sprites_ref, self.asteroids_group_ref, 
-                                          self.asteroid_semaphore_ref, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
-                self.all_sprites_ref.add(child_asteroid)
-                self.asteroids_group_ref.add(child_asteroid)
+            if world.population.reserve(child_size_type):
+                new_pos = (self.rect.centerx + self.rng.randint(-10,10), self.rect.centery + self.rng.randint(-10,10))
+                # Criado agora ou, se a cota do tick acabou, distribuído pelos próximos ticks
+                world.population.spawn(new_pos, child_size_type, 
+                                       world.all_sprites, world.asteroids_group, 
+                                       world.SCREEN_WIDTH, world.SCREEN_HEIGHT, rng=self.rng)
             else:
-                # print(f"Não foi possível adquirir semáforo para asteroide filho ({child_size_type})")
-                break # Para de tentar gerar mais filhos se o limite do semáforo for atingido
+                break # Para de tentar gerar mais filhos se o orçamento da população foi atingido
 
 # Exemplo de como você pode chamar isso (para teste, não para o loop final do jogo)
 if __name__ == '__main__':
@@ -117,9 +245,9 @@ if __name__ == '__main__':
     
     all_sprites = pygame.sprite.Group()
     asteroids = pygame.sprite.Group()
-    # Semáforo fictício para teste
-    import threading
-    test_semaphore = threading.Semaphore(10) 
+    # População de teste
+    from src.population import AsteroidPopulation
+    test_population = AsteroidPopulation(total_budget=10)
 
     # Tenta carregar a imagem
     img = load_asteroid_image()
@@ -127,8 +255,8 @@ if __name__ == '__main__':
         print("Imagem do asteroide carregada com sucesso para teste.")
 
     # Cria um asteroide grande
-    if test_semaphore.acquire(blocking=False):
-        asteroid_lg = Asteroid((screen_width_test // 2, screen_height_test // 2), 'LG', all_sprites, asteroids, test_semaphore, screen_width_test, screen_height_test)
+    if test_population.reserve('LG'):
+        asteroid_lg = Asteroid((screen_width_test // 2, screen_height_test // 2), 'LG', all_sprites, asteroids, test_population, screen_width_test, screen_height_test)
         all_sprites.add(asteroid_lg)
         asteroids.add(asteroid_lg)
     
@@ -140,6 +268,7 @@ if __name__ == '__main__':
                 running = False
         
         all_sprites.update()
+        test_population.update()
         
         screen.fill((0,0,0))
         all_sprites.draw(screen)
@@ -0,0 +1,147 @@
+from collections import deque
+
+# Quadros por janela de medição: o governador decide no máximo uma mudança por janela
+DEFAULT_WINDOW_FRAMES = 30
+# Piora a qualidade quando a média da janela passa do orçamento do quadro (1 / FPS alvo)...
+DEGRADE_RATIO = 1.0
+# ...e só melhora depois de RECOVER_WINDOWS janelas seguidas abaixo desta fração do orçamento
+RECOVER_RATIO = 0.7
+RECOVER_WINDOWS = 4
+
+
+class DetailLevel:
+    """
+    Um nível de qualidade do desenho e da geração de asteroides.
+    - cull_offscreen: asteroides fora da tela não atualizam o quadro de rotação
+      (e o AsteroidField nem os desenha);
+    - skip_small_rotation: asteroides 'SM' mantêm o último quadro de rotação;
+    - rotation_stride: usa só um a cada N quadros de rotação (passo angular mais grosso);
+    - spawn_cap: fração do orçamento da população acima da qual a geração periódica é suspensa;
+    - particle_scale: fração das partículas de efeito emitidas (src/particles.py);
+    - background_scroll: as camadas do fundo se deslocam (src/background.py); cada deslocamento
+      obriga a redesenhar a tela inteira.
+    Os ângulos continuam avançando: só a imagem desenhada deixa de acompanhá-los.
+    """
+    __slots__ = ('name', 'cull_offscreen', 'skip_small_rotation', 'rotation_stride', 'spawn_cap', 'particle_scale',
+                 'background_scroll')
+
+    def __init__(self, name, cull_offscreen=False, skip_small_rotation=False, rotation_stride=1, spawn_cap=None,
+                 particle_scale=1.0, background_scroll=True):
+        self.name = name
+        self.cull_offscreen = cull_offscreen
+        self.skip_small_rotation = skip_small_rotation
+        self.rotation_stride = rotation_stride
+        self.spawn_cap = spawn_cap
+        self.particle_scale = particle_scale
+        self.background_scroll = background_scroll
+
+    def rotates(self, size_type, rect, screen_width, screen_height):
+        """Se o asteroide deve trocar o quadro de rotação neste tick."""
+        if self.skip_small_rotation and size_type == 'SM':
+            return False
+        if self.cull_offscreen and (rect.right < 0 or rect.left > screen_width or
+                                    rect.bottom < 0 or rect.top > screen_height):
+            return False
+        return True
+
+    def allows_spawn(self, population):
+        """Se a geração periódica pode criar mais um asteroide com a população atual."""
+        return self.spawn_cap is None or population.total_count < self.spawn_cap * population.total_budget
+
+    def __repr__(self):
+        return f"DetailLevel({self.name!r})"
+
+
+# Do mais bonito ao mais barato; o nível 0 é o comportamento original
+QUALITY_LEVELS = (
+    DetailLevel('alta'),
+    DetailLevel('media', cull_offscreen=True),
+    DetailLevel('baixa', cull_offscreen=True, skip_small_rotation=True, rotation_stride=2, particle_scale=0.5,
+                background_scroll=False),
+    DetailLevel('minima', cull_offscreen=True, skip_small_rotation=True, rotation_stride=4, spawn_cap=0.5,
+                particle_scale=0.25, background_scroll=False),
+)
+
+# Nível em vigor no processo, lido pelos asteroides (game_entities, asteroid_field) e por asteroid_manager.
+# Só o jogo com janela o altera; a simulação sem janela sempre usa o nível 0.
+_detail = QUALITY_LEVELS[0]
+
+def get_detail():
+    return _detail
+
+def set_detail(level):
+    global _detail
+    _detail = level
+
+
+class LoadGovernor:
+    """
+    Governador de carga: compara o tempo de trabalho de cada quadro com o orçamento
+    do FPS alvo e ajusta o nível de qualidade (QUALITY_LEVELS).
+    A cada janela de window_frames quadros: se a média passou do orçamento, desce um
+    nível; se ficou abaixo de RECOVER_RATIO do orçamento por RECOVER_WINDOWS janelas
+    seguidas, sobe um nível. Cada mudança é registrada em changes e impressa.
+    """
+
+    def __init__(self, target_fps=60, window_frames=DEFAULT_WINDOW_FRAMES, levels=QUALITY_LEVELS,
+                 degrade_ratio=DEGRADE_RATIO, recover_ratio=RECOVER_RATIO, recover_windows=RECOVER_WINDOWS):
+        self.budget = 1.0 / target_fps
+        self.window_frames = window_frames
+        self.levels = levels
+        self.degrade_ratio = degrade_ratio
+        self.recover_ratio = recover_ratio
+        self.recover_windows = recover_windows
+        self.level_index = 0
+        self.frame_index = 0
+        self.changes = [] # (quadro, nível anterior, novo nível, média da janela em ms)
+        self.frames_per_level = [0] * len(levels)
+        self._window = deque(maxlen=window_frames)
+        self._headroom_windows = 0
+        set_detail(levels[0])
+
+    @property
+    def level(self):
+        return self.levels[self.level_index]
+
+    def frame(self, work_time):
+        """Registra o tempo de trabalho (em segundos, sem a espera do limite de FPS) de um quadro."""
+        self.frame_index += 1
+        self.frames_per_level[self.level_index] += 1
+        self._window.append(work_time)
+        if len(self._window) < self.window_frames:
+            return
+        average = sum(self._window) / len(self._window)
+        self._window.clear()
+        if average > self.budget * self.degrade_ratio:
+            self._headroom_windows = 0
+            if self.level_index < len(self.levels) - 1:
+                self._change(self.level_index + 1, average)
+        elif average < self.budget * self.recover_ratio:
+            self._headroom_windows += 1
+            if self._headroom_windows >= self.recover_windows and self.level_index > 0:
+                self._headroom_windows = 0
+                self._change(self.level_index - 1, average)
+        else:
+            self._headroom_windows = 0
+
+    def _change(self, level_index, average):
+        previous = self.level
+        self.level_index = level_index
+        set_detail(self.level)
+        self.changes.append((self.frame_index, previous.name, self.level.name, round(average * 1000, 2)))
+        print(f"Governador de carga: qualidade {previous.name} -> {self.level.name} "
+              f"(quadro {self.frame_index}, média {average * 1000:.1f} ms, orçamento {self.budget * 1000:.1f} ms)")
+
+    def reset(self):
+        """Volta ao nível 0 (também restaura o nível do processo)."""
+        self.level_index = 0
+        self._window.clear()
+        self._headroom_windows = 0
+        set_detail(self.levels[0])
+
+    def summary(self):
+        return {
+            'level': self.level.name,
+            'changes': len(self.changes),
+            'frames_per_level': {level.name: frames for level, frames in zip(self.levels, self.frames_per_level)},
+        }
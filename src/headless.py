@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import random
+import hashlib
+import argparse
+import threading
+import pygame
+from src.asteroid_field import AsteroidField
+from src.population import AsteroidPopulation
+from src.asteroid_manager import setup_initial_asteroids, spawn_periodic_asteroids
+from src.collision_handler import handle_bullet_asteroid_collisions, handle_player_asteroid_collisions, PRECISE_PLAYER_COLLISIONS
+from src.spaceship import Player
+from src.telemetry import TelemetryWriter, get_telemetry, set_telemetry
+
+# Resolução lógica usada na simulação sem janela
+HEADLESS_SCREEN_SIZE = (1280, 720)
+# Mesmo orçamento de asteroides do jogo com janela
+HEADLESS_ASTEROID_LIMIT = 15
+
+
+def init_headless_display(screen_width, screen_height):
+    """
+    Inicializa o Pygame com o driver de vídeo 'dummy' (nenhuma janela é aberta).
+    Um modo de vídeo ainda é necessário para convert()/convert_alpha() das imagens.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    if not pygame.display.get_init():
+        pygame.display.init()
+    surface = pygame.display.get_surface()
+    if surface is None or surface.get_size() != (screen_width, screen_height):
+        surface = pygame.display.set_mode((screen_width, screen_height))
+    return surface
+
+
+def new_input_state():
+    # Mesmos campos de input_handler.shared_input_state, mas próprios de cada simulação
+    return {
+        'rotate_left': False,
+        'rotate_right': False,
+        'thrust_on': False,
+        'shoot_request': False
+    }
+
+
+class ScriptedInput:
+    """
+    Fonte de entrada roteirizada, usada no lugar da fila + thread de entrada.
+    events é uma lista de (tick, comando, estado) com os mesmos comandos de input_queue
+    ('rotate_left', 'rotate_right', 'thrust_on', 'shoot_request').
+    """
+
+    def __init__(self, events=()):
+        self.events_by_tick = {}
+        for tick, command, key_state in events:
+            self.events_by_tick.setdefault(tick, []).append((command, key_state))
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as script_file:
+            return cls(json.load(script_file))
+
+    def apply(self, tick, input_state):
+        for command, key_state in self.events_by_tick.get(tick, ()):
+            if command == 'shoot_request':
+                if key_state: # Evento único, resetado por Player.update()
+                    input_state['shoot_request'] = True
+            else:
+                input_state[command] = key_state
+
+
+class HeadlessSimulation:
+    """
+    Uma partida completa sem janela, sem thread de entrada e sem limite de FPS.
+    Toda a aleatoriedade vem de um random.Random com a semente dada, de modo que
+    a mesma semente e o mesmo roteiro produzem o mesmo estado final.
+    """
+
+    def __init__(self, seed=0, input_source=None, screen_size=HEADLESS_SCREEN_SIZE,
+                 asteroid_limit=HEADLESS_ASTEROID_LIMIT, use_asteroid_field=False,
+                 precise_collisions=PRECISE_PLAYER_COLLISIONS, announce=True):
+        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = screen_size
+        init_headless_display(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.input_source = input_source if input_source is not None else ScriptedInput()
+        self.input_state = new_input_state()
+        self.input_lock = threading.Lock()
+        self.population = AsteroidPopulation(asteroid_limit)
+
+        self.all_sprites = pygame.sprite.Group()
+        self.bullets_group = pygame.sprite.Group()
+        if use_asteroid_field:
+            self.asteroids_group = AsteroidField(self.population, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, rng=self.rng)
+        else:
+            self.asteroids_group = pygame.sprite.Group()
+        self.use_asteroid_field = use_asteroid_field
+        self.precise_collisions = precise_collisions # Máscaras ou círculos (ver collision_handler)
+        self.announce = announce # Imprime o aviso de fim de jogo (desligado nos ambientes de src/vector_env.py)
+
+        self.player = Player(self.all_sprites, self.bullets_group, self.SCREEN_WIDTH, self.SCREEN_HEIGHT,
+                             input_state_ref=self.input_state, input_lock_ref=self.input_lock)
+        self.all_sprites.add(self.player)
+
+        self.score = 0
+        self.tick = 0
+        self.game_over = False
+
+        setup_initial_asteroids(self.all_sprites, self.asteroids_group, self.population,
+                                self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.rng)
+
+    def step(self):
+        """Avança um tick, na mesma ordem de game_loop. Retorna False quando o jogo termina."""
+        if self.game_over:
+            return False
+        self.input_source.apply(self.tick, self.input_state)
+        telemetry = get_telemetry()
+        if telemetry is not None:
+            telemetry.begin_tick(self.tick)
+
+        self.all_sprites.update()
+        if self.use_asteroid_field:
+            self.asteroids_group.update()
+
+        self.score = handle_bullet_asteroid_collisions(self.bullets_group, self.asteroids_group, self.score)
+        if handle_player_asteroid_collisions(self.player, self.asteroids_group, self.precise_collisions, self.announce):
+            self.game_over = True
+            if telemetry is not None:
+                telemetry.game_over(self.score)
+
+        spawn_periodic_asteroids(self.all_sprites, self.asteroids_group, self.population,
+                                 self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.rng)
+        self.tick += 1
+        return not self.game_over
+
+    def run(self, ticks):
+        """Executa até 'ticks' ticks (ou até o fim de jogo) o mais rápido possível."""
+        for _ in range(ticks):
+            if not self.step():
+                break
+        return self.state()
+
+    def state(self):
+        """Estado do mundo em tipos simples, comparável entre execuções."""
+        player = self.player
+        return {
+            'seed': self.seed,
+            'tick': self.tick,
+            'score': self.score,
+            'game_over': self.game_over,
+            'player': {
+                'center': list(player.rect.center),
+                'velocity': [round(player.vx, 9), round(player.vy, 9)],
+                'angle': round(player.angle, 9),
+            },
+            'asteroids': sorted([asteroid.size_type, *asteroid.rect.center] for asteroid in self.asteroids_group),
+            'bullets': sorted(list(bullet.rect.center) for bullet in self.bullets_group),
+        }
+
+    def state_digest(self):
+        encoded = json.dumps(self.state(), sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa uma partida de Asteroides sem janela.")
+    parser.add_argument('--headless', action='store_true', help="Aceito para compatibilidade com asteroids.py")
+    parser.add_argument('--ticks', type=int, default=3600, help="Número de ticks a simular")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do gerador aleatório")
+    parser.add_argument('--script', help="Arquivo JSON com eventos [tick, comando, estado]")
+    parser.add_argument('--asteroid-field', action='store_true', help="Usa o motor vetorizado AsteroidField")
+    parser.add_argument('--circle-collisions', action='store_true',
+                        help="Colisão jogador-asteroide por círculos, como antes das máscaras")
+    parser.add_argument('--record', help="Grava a partida neste arquivo de replay (ver src/replay.py)")
+    parser.add_argument('--keyframe-interval', type=int, default=None, help="Ticks entre quadros-chave do replay")
+    parser.add_argument('--telemetry', help="Grava os eventos da partida neste diretório (ver src/telemetry.py)")
+    args = parser.parse_args(argv)
+
+    telemetry = None
+    if args.telemetry:
+        # Registrado antes da simulação para incluir a geração dos asteroides iniciais
+        telemetry = TelemetryWriter(args.telemetry, {'mode': 'headless', 'seed': args.seed,
+                                                     'asteroid_field': args.asteroid_field})
+        telemetry.start()
+        set_telemetry(telemetry)
+
+    input_source = ScriptedInput.from_file(args.script) if args.script else ScriptedInput()
+    simulation = HeadlessSimulation(seed=args.seed, input_source=input_source,
+                                    use_asteroid_field=args.asteroid_field,
+                                    precise_collisions=not args.circle_collisions)
+    recorder = None
+    if args.record:
+        from src.replay import ReplayRecorder, DEFAULT_KEYFRAME_INTERVAL # Importado aqui: replay depende deste módulo
+        recorder = ReplayRecorder(args.record, simulation, args.keyframe_interval or DEFAULT_KEYFRAME_INTERVAL)
+    state = simulation.run(args.ticks)
+    if recorder is not None:
+        recorder.close()
+    if telemetry is not None:
+        set_telemetry(None)
+        telemetry.close()
+        print(f"telemetria={telemetry.stats()}")
+    print(f"tick={state['tick']} score={state['score']} game_over={state['game_over']} "
+          f"asteroides={len(state['asteroids'])} projeteis={len(state['bullets'])}")
+    print(f"pool_projeteis={simulation.player.bullet_pool.stats()}")
+    print(f"populacao={simulation.population.stats()}")
+    print(f"digest={simulation.state_digest()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,49 @@
 import threading
 import queue
+import pygame
+from collections import deque
+from contextlib import nullcontext
 
-# Configuração de threading para entrada
-input_queue = queue.Queue()
+# Configuração de threading para entrada.
+# A fila, o lock e o evento de parada só são criados por init_threaded_input(), quando o
+# caminho com thread é usado: importar este módulo não cria objetos de sincronização.
+input_queue = None
+input_lock = None
+stop_input_thread_event = None
 shared_input_state = {
     'rotate_left': False,
     'rotate_right': False,
     'thrust_on': False,
     'shoot_request': False
 }
-input_lock = threading.Lock()
-stop_input_thread_event = threading.Event()
+# Entradas já aplicadas pela thread: (tick de chegada, comando, descartado). Lidas por InputSystem
+applied_inputs = deque()
+
+# Teclas mapeadas para os comandos da nave
+KEY_COMMANDS = {
+    pygame.K_LEFT: 'rotate_left',
+    pygame.K_RIGHT: 'rotate_right',
+    pygame.K_UP: 'thrust_on',
+    pygame.K_SPACE: 'shoot_request',
+}
+
+def init_threaded_input():
+    """Cria (uma única vez) a fila, o lock e o evento do caminho com thread. Retorna o lock."""
+    global input_queue, input_lock, stop_input_thread_event
+    if input_queue is None:
+        input_queue = queue.Queue()
+        input_lock = threading.Lock()
+        stop_input_thread_event = threading.Event()
+    return input_lock
 
 # Função da thread de processamento de entrada
 def input_processing_thread_func():
     print("Thread de processamento de entrada iniciada.")
     while not stop_input_thread_event.is_set():
         try:
-            command, key_state = input_queue.get(timeout=0.1) # Timeout para permitir a verificação de stop_event
+            item = input_queue.get(timeout=0.1) # Timeout para permitir a verificação de stop_event
+            command, key_state = item[0], item[1]
+            dropped = False
             with input_lock:
                 if command == 'rotate_left':
                     shared_input_state['rotate_left'] = key_state
@@ -27,8 +53,12 @@ def input_processing_thread_func():
                     shared_input_state['thrust_on'] = key_state
                 elif command == 'shoot_request': # Este é um evento, não um estado contínuo
                     if key_state: # True em KEYDOWN
-                        shared_input_state['shoot_request'] = True 
+                        # Um disparo ainda não consumido absorve este (o disparo é perdido)
+                        dropped = shared_input_state['shoot_request']
+                        shared_input_state['shoot_request'] = True
                     # Não é necessário 'else', pois shoot_request é resetado por Player.update()
+            if len(item) > 2: # Item com tick de chegada: registra para a métrica de latência
+                applied_inputs.append((item[2], command, dropped))
             input_queue.task_done()
         except queue.Empty:
             continue # Sem entrada, volta ao loop e verifica stop_event
@@ -36,3 +66,132 @@ def input_processing_thread_func():
             print(f"Erro na thread de entrada: {e}") # Tratamento básico de erro
             break # Sai da thread em erro inesperado
     print("Thread de processamento de entrada parada.")
+
+
+class InputLatencyStats:
+    """Histograma de latência de entrada, em ticks entre o pressionamento e o efeito."""
+
+    def __init__(self):
+        self.histogram = {}
+        self.count = 0
+        self.total = 0
+        self.dropped_shots = 0
+
+    def record(self, latency_ticks):
+        self.histogram[latency_ticks] = self.histogram.get(latency_ticks, 0) + 1
+        self.count += 1
+        self.total += latency_ticks
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for latency_ticks in sorted(self.histogram):
+            seen += self.histogram[latency_ticks]
+            if seen >= target:
+                return latency_ticks
+        return max(self.histogram)
+
+    def summary(self):
+        return {
+            'inputs': self.count,
+            'mean_ticks': self.total / self.count if self.count else 0.0,
+            'p95_ticks': self.percentile(0.95),
+            'max_ticks': max(self.histogram) if self.histogram else 0,
+            'dropped_shots': self.dropped_shots,
+        }
+
+
+class InputSystem:
+    """
+    Entrada do jogador processada na thread principal.
+    Os eventos de teclado são bufferizados com o tick em que chegaram; begin_tick(),
+    chamado antes de cada tick de simulação, monta o estado de entrada do tick
+    (mesmos campos de shared_input_state) sem fila, thread nem disputa de lock.
+    Cada disparo pedido entre ticks é mantido e consumido um por tick.
+    Com threaded=True usa o caminho antigo (input_queue + thread), para comparação.
+    Se recorder estiver definido (um ReplayRecorder de src/replay.py), o estado montado
+    em cada tick é entregue a ele para a gravação da partida.
+    """
+
+    def __init__(self, threaded=False):
+        self.threaded = threaded
+        self.tick = 0 # Próximo tick de simulação
+        self.latency = InputLatencyStats()
+        self.recorder = None
+        self._thread = None
+        if threaded:
+            self.input_state = shared_input_state
+            self.input_lock = init_threaded_input()
+        else:
+            self.input_state = {
+                'rotate_left': False,
+                'rotate_right': False,
+                'thrust_on': False,
+                'shoot_request': False
+            }
+            self.input_lock = nullcontext() # Só a thread principal acessa o estado
+            self._pending_changes = [] # (comando, estado, tick de chegada)
+            self._pending_shots = deque() # Tick de chegada de cada disparo pedido
+
+    def start(self):
+        if self.threaded:
+            stop_input_thread_event.clear()
+            self._thread = threading.Thread(target=input_processing_thread_func, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            stop_input_thread_event.set()
+            input_queue.join() # Aguarda até que todos os itens na fila sejam processados
+            self._thread.join()
+            self._thread = None
+
+    def handle_event(self, event):
+        """Converte KEYDOWN/KEYUP das teclas da nave em comandos. Retorna True se o evento foi usado."""
+        command = KEY_COMMANDS.get(getattr(event, 'key', None))
+        if command is None:
+            return False
+        if event.type == pygame.KEYDOWN:
+            self.push(command, True)
+        elif event.type == pygame.KEYUP and command != 'shoot_request': # Sem KEYUP para shoot_request, pois é um evento único
+            self.push(command, False)
+        else:
+            return False
+        return True
+
+    def push(self, command, key_state):
+        if self.threaded:
+            input_queue.put((command, key_state, self.tick))
+        elif command == 'shoot_request':
+            if key_state:
+                self._pending_shots.append(self.tick)
+        else:
+            self._pending_changes.append((command, key_state, self.tick))
+
+    def begin_tick(self):
+        """Monta o estado de entrada do tick atual e registra a latência das entradas aplicadas."""
+        tick = self.tick
+        if self.threaded:
+            while applied_inputs:
+                arrival_tick, command, dropped = applied_inputs.popleft()
+                if dropped:
+                    self.latency.dropped_shots += 1
+                else:
+                    self.latency.record(tick - arrival_tick)
+        else:
+            input_state = self.input_state
+            for command, key_state, arrival_tick in self._pending_changes:
+                input_state[command] = key_state
+                self.latency.record(tick - arrival_tick)
+            self._pending_changes.clear()
+            # Um disparo por tick; os demais continuam no buffer para os próximos ticks
+            if self._pending_shots and not input_state['shoot_request']:
+                input_state['shoot_request'] = True
+                self.latency.record(tick - self._pending_shots.popleft())
+        if self.recorder is not None:
+            # Com a thread de entrada o estado ainda pode mudar durante o tick: grava-se o do início
+            with self.input_lock:
+                self.recorder.record(self.input_state)
+        self.tick = tick + 1
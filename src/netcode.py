@@ -0,0 +1,227 @@
+import struct
+
+# Protocolo do modo multijogador (src/server.py), little-endian sobre TCP.
+# Cada mensagem: comprimento do corpo (u32), tipo (u8), corpo.
+#   HELLO    (servidor -> cliente): id do cliente, id da nave, ticks por segundo,
+#            ticks entre snapshots, largura e altura do mundo
+#   INPUT    (cliente -> servidor): comando e estado, como os itens de input_queue
+#   SNAPSHOT (servidor -> cliente): estado do mundo quantizado, completo ou como
+#            diferença (delta) em relação ao último snapshot que o cliente recebeu
+FRAME_HEADER = struct.Struct('<IB')
+MSG_HELLO, MSG_INPUT, MSG_SNAPSHOT = 1, 2, 3
+HELLO = struct.Struct('<IIHHHH')
+INPUT = struct.Struct('<B?')
+# Maior corpo aceito: protege o servidor de um cliente que mande lixo
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+# Mesmos comandos de input_queue / InputSystem.push, na ordem do byte enviado
+COMMANDS = ('rotate_left', 'rotate_right', 'thrust_on', 'shoot_request')
+COMMAND_CODES = {command: code for code, command in enumerate(COMMANDS)}
+
+# Snapshot: tick, tick da base (NO_BASELINE = completo), ids removidos, registros completos
+# e registros delta
+SNAPSHOT_HEADER = struct.Struct('<IIHHH')
+NO_BASELINE = 0xFFFFFFFF
+ENTITY_ID = struct.Struct('<I')
+# Registro completo (entidades novas ou todas, sem base): id, um byte com o tipo (3 bits altos)
+# e a máscara dos campos presentes (5 bits baixos), seguidos dos campos marcados na máscara
+RECORD_HEADER = struct.Struct('<IB')
+KIND_SHIP, KIND_ASTEROID, KIND_BULLET = 0, 1, 2
+# Campos quantizados de cada tipo: posição em pixels (int16), ângulo em 1/256 de volta
+KIND_FIELDS = {
+    KIND_SHIP: (('x', 'h'), ('y', 'h'), ('angle', 'B'), ('score', 'i'), ('flags', 'B')),
+    KIND_ASTEROID: (('x', 'h'), ('y', 'h'), ('angle', 'B'), ('size', 'B')),
+    KIND_BULLET: (('x', 'h'), ('y', 'h')),
+}
+FIELD_STRUCTS = {kind: [struct.Struct('<' + code) for _, code in fields] for kind, fields in KIND_FIELDS.items()}
+# Bytes de um registro completo de cada tipo
+FULL_RECORD_SIZES = {kind: RECORD_HEADER.size + sum(field.size for field in fields) for kind, fields in FIELD_STRUCTS.items()}
+# Campos de um byte são enviados como diferença módulo 256 (ângulo dá a volta); os outros
+# como diferença com sinal, ou o valor inteiro quando ela não cabe num int8
+MODULAR_FIELDS = {kind: [field.size == 1 for field in fields] for kind, fields in FIELD_STRUCTS.items()}
+# Registro delta (entidade que já estava na base, do mesmo tipo), em ordem crescente de id:
+# diferença para o id anterior (varint), um byte com a máscara dos campos que mudaram
+# (5 bits baixos) e DELTA_ESCAPE quando algum campo vai inteiro, seguido então de um byte
+# com a máscara desses campos; depois, cada campo marcado: int8 com a diferença ou o valor inteiro
+DELTA_ESCAPE = 0x80
+INT8 = struct.Struct('<b')
+SHIP_ALIVE = 1 # Bit de 'flags' da nave
+
+
+def frame(message_type, body=b''):
+    return FRAME_HEADER.pack(len(body), message_type) + body
+
+
+async def read_frame(reader):
+    """Lê uma mensagem de um asyncio.StreamReader. Retorna (tipo, corpo)."""
+    length, message_type = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"mensagem grande demais ({length} bytes)")
+    return message_type, await reader.readexactly(length) if length else b''
+
+
+def pack_input(command, key_state):
+    return frame(MSG_INPUT, INPUT.pack(COMMAND_CODES[command], key_state))
+
+
+def unpack_input(body):
+    code, key_state = INPUT.unpack(body)
+    return COMMANDS[code], key_state
+
+
+def quantize_angle(angle):
+    return int(round(angle * 256 / 360)) % 256
+
+
+def _clamp16(value):
+    return max(-32768, min(32767, int(value)))
+
+
+def quantize_position(center):
+    return _clamp16(center[0]), _clamp16(center[1])
+
+
+# --- Delta ---
+
+def _pack_varint(value, parts):
+    while value >= 0x80:
+        parts.append(bytes((value & 0x7F | 0x80,)))
+        value >>= 7
+    parts.append(bytes((value,)))
+
+
+def _unpack_varint(body, offset):
+    value = shift = 0
+    while True:
+        byte = body[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def full_snapshot_size(entities):
+    """Bytes do snapshot completo de 'entities' (sem codificar), para comparar com os deltas."""
+    return SNAPSHOT_HEADER.size + sum(FULL_RECORD_SIZES[kind] for kind, _ in entities.values())
+
+
+def encode_snapshot(tick, entities, baseline=None, baseline_tick=NO_BASELINE):
+    """
+    Codifica o snapshot 'entities' (id -> (tipo, valores quantizados)).
+    Com baseline (o snapshot do tick baseline_tick já recebido pelo cliente), vão os ids
+    removidos, as entidades novas como registros completos e, das existentes que mudaram,
+    registros delta com a diferença de cada campo alterado num byte.
+    """
+    if baseline is None:
+        baseline = {}
+        baseline_tick = NO_BASELINE
+    removed = [entity_id for entity_id in baseline if entity_id not in entities]
+    full_parts = []
+    delta_parts = []
+    full_records = 0
+    delta_records = 0
+    previous_id = 0
+    for entity_id in sorted(entities):
+        kind, values = entities[entity_id]
+        previous = baseline.get(entity_id)
+        if previous is None or previous[0] != kind:
+            full_parts.append(RECORD_HEADER.pack(entity_id, (kind << 5) | ((1 << len(values)) - 1)))
+            for field_struct, value in zip(FIELD_STRUCTS[kind], values):
+                full_parts.append(field_struct.pack(value))
+            full_records += 1
+            continue
+        previous_values = previous[1]
+        if previous_values == values:
+            continue
+        mask = escape = 0
+        fields = []
+        modular = MODULAR_FIELDS[kind]
+        for index, value in enumerate(values):
+            difference = value - previous_values[index]
+            if not difference:
+                continue
+            mask |= 1 << index
+            if modular[index]:
+                fields.append(INT8.pack(((difference + 128) & 0xFF) - 128))
+            elif -128 <= difference <= 127:
+                fields.append(INT8.pack(difference))
+            else:
+                escape |= 1 << index
+                fields.append(FIELD_STRUCTS[kind][index].pack(value))
+        _pack_varint(entity_id - previous_id, delta_parts)
+        previous_id = entity_id
+        if escape:
+            delta_parts.append(bytes((mask | DELTA_ESCAPE, escape)))
+        else:
+            delta_parts.append(bytes((mask,)))
+        delta_parts.extend(fields)
+        delta_records += 1
+    header = SNAPSHOT_HEADER.pack(tick, baseline_tick, len(removed), full_records, delta_records)
+    return (header + b''.join(ENTITY_ID.pack(entity_id) for entity_id in removed)
+            + b''.join(full_parts) + b''.join(delta_parts))
+
+
+class SnapshotDecoder:
+    """
+    Réplica do mundo no cliente: aplica snapshots completos ou deltas, em ordem.
+    entities: id -> [tipo, lista de valores quantizados].
+    """
+
+    def __init__(self):
+        self.tick = None
+        self.entities = {}
+        self.snapshots = 0
+        self.full_snapshots = 0
+
+    def apply(self, body):
+        tick, baseline_tick, removed_count, full_count, delta_count = SNAPSHOT_HEADER.unpack_from(body, 0)
+        if baseline_tick == NO_BASELINE:
+            self.entities = {}
+            self.full_snapshots += 1
+        elif baseline_tick != self.tick:
+            raise ValueError(f"delta sobre o tick {baseline_tick}, mas a réplica está no tick {self.tick}")
+        offset = SNAPSHOT_HEADER.size
+        entities = self.entities
+        for _ in range(removed_count):
+            entities.pop(ENTITY_ID.unpack_from(body, offset)[0], None)
+            offset += ENTITY_ID.size
+        for _ in range(full_count):
+            entity_id, kind_mask = RECORD_HEADER.unpack_from(body, offset)
+            offset += RECORD_HEADER.size
+            kind, mask = kind_mask >> 5, kind_mask & 0x1F
+            values = [0] * len(FIELD_STRUCTS[kind])
+            for index, field_struct in enumerate(FIELD_STRUCTS[kind]):
+                if mask & (1 << index):
+                    values[index] = field_struct.unpack_from(body, offset)[0]
+                    offset += field_struct.size
+            entities[entity_id] = [kind, values]
+        entity_id = 0
+        for _ in range(delta_count):
+            gap, offset = _unpack_varint(body, offset)
+            entity_id += gap
+            mask = body[offset]
+            offset += 1
+            escape = 0
+            if mask & DELTA_ESCAPE:
+                escape = body[offset]
+                offset += 1
+            entity = entities.get(entity_id)
+            if entity is None:
+                raise ValueError(f"delta para a entidade {entity_id}, que não está na réplica")
+            kind, values = entity
+            field_structs = FIELD_STRUCTS[kind]
+            modular = MODULAR_FIELDS[kind]
+            for index in range(len(values)):
+                if not mask & (1 << index):
+                    continue
+                if escape & (1 << index):
+                    values[index] = field_structs[index].unpack_from(body, offset)[0]
+                    offset += field_structs[index].size
+                else:
+                    difference = INT8.unpack_from(body, offset)[0]
+                    offset += 1
+                    values[index] = (values[index] + difference) & 0xFF if modular[index] else values[index] + difference
+        self.tick = tick
+        self.snapshots += 1
+        return tick
@@ -0,0 +1,213 @@
+import math
+import numpy as np
+import pygame
+from src.governor import get_detail
+
+# Partículas simultâneas no buffer circular; as mais antigas são sobrescritas quando ele enche
+DEFAULT_CAPACITY = 65536
+# Máximo de partículas desenhadas por quadro: acima disso só uma fração uniforme é desenhada
+# (todas continuam sendo simuladas). Cada blit custa cerca de 0,7 us, então ~8 ms no pior caso.
+DEFAULT_MAX_DRAWN = 12000
+# Estágios de esmaecimento pré-renderizados por tipo de partícula
+FADE_STAGES = 8
+# Lado das células usadas para os retângulos sujos (uma célula por região com partículas)
+DIRTY_CELL_SIZE = 64
+# Redução da velocidade por tick
+DRAG = 0.96
+
+# Tipos de partícula: cor, raio em pixels, velocidade (pixels por tick) e vida (ticks)
+PARTICLE_KINDS = {
+    'debris': {'color': (150, 140, 130), 'radius': 2, 'speed': (0.5, 3.0), 'lifetime': (25, 50)},
+    'spark': {'color': (255, 200, 80), 'radius': 1, 'speed': (1.5, 5.0), 'lifetime': (8, 18)},
+    'flame': {'color': (255, 120, 40), 'radius': 3, 'speed': (0.5, 4.0), 'lifetime': (30, 60)},
+}
+KIND_NAMES = tuple(PARTICLE_KINDS)
+KIND_CODES = {name: code for code, name in enumerate(KIND_NAMES)}
+
+# Detritos gerados quando um asteroide é destruído, por classe de tamanho
+DEBRIS_BY_SIZE = {'LG': 48, 'MD': 24, 'SM': 12}
+# Faíscas no ponto de impacto de um projétil
+SPARKS_PER_HIT = 6
+# Explosão da nave
+SHIP_EXPLOSION_PARTICLES = 120
+
+
+class ParticleSystem:
+    """
+    Partículas de efeito (detritos, faíscas, explosões) sem um Sprite por partícula.
+    O estado fica em arrays NumPy pré-alocados usados como buffer circular (posição,
+    velocidade, idade, vida e tipo); update() avança todas num único passo vetorizado e
+    draw() desenha as vivas com um único Surface.blits() a partir de um cache pequeno
+    de superfícies pré-renderizadas (um estágio de esmaecimento por faixa de idade).
+    As partículas são só visuais: usam o próprio gerador aleatório e não afetam a simulação.
+    """
+
+    def __init__(self, screen_width, screen_height, capacity=DEFAULT_CAPACITY,
+                 max_drawn=DEFAULT_MAX_DRAWN, seed=None):
+        self.SCREEN_WIDTH = screen_width
+        self.SCREEN_HEIGHT = screen_height
+        self.capacity = capacity
+        self.max_drawn = max_drawn
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32) # Idade 0 e vida 0: posição livre
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.head = 0 # Próxima posição escrita
+        self.used = 0 # Posições já escritas alguma vez (o resto do buffer nunca foi usado)
+        self.remaining_ticks = 0 # Ticks até a partícula mais longa morrer (0 = nenhuma viva)
+        self.emitted = 0
+        self.overwritten = 0 # Partículas vivas sobrescritas porque o buffer encheu
+
+        # Cache de superfícies: índice = código do tipo * FADE_STAGES + estágio
+        self.surfaces = []
+        offsets = []
+        for name in KIND_NAMES:
+            radius = PARTICLE_KINDS[name]['radius']
+            for stage in range(FADE_STAGES):
+                self.surfaces.append(self._bake(PARTICLE_KINDS[name]['color'], radius, stage))
+                offsets.append(radius)
+        self.offset_by_surface = np.array(offsets, dtype=np.float32)
+        self.max_radius = max(offsets)
+
+    @staticmethod
+    def _bake(color, radius, stage):
+        fade = 1.0 - stage / FADE_STAGES
+        surface = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (*color, int(255 * fade)), (radius, radius), radius)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() # Formato da tela: blit sem conversão
+        return surface
+
+    def __len__(self):
+        """Partículas vivas."""
+        if not self.remaining_ticks:
+            return 0
+        used = self.used
+        return int(np.count_nonzero(self.age[:used] < self.lifetime[:used]))
+
+    # --- Emissão ---
+
+    def emit(self, kind, position, count, velocity=(0.0, 0.0)):
+        """Emite 'count' partículas do tipo 'kind' em todas as direções a partir de position."""
+        count = int(count * get_detail().particle_scale) # Sob carga, o nível de detalhe reduz as emissões
+        if count <= 0:
+            return
+        count = min(count, self.capacity)
+        properties = PARTICLE_KINDS[kind]
+        rng = self.rng
+        slots = (self.head + np.arange(count)) % self.capacity
+        self.overwritten += int(np.count_nonzero(self.age[slots] < self.lifetime[slots]))
+
+        directions = rng.uniform(0.0, 2 * math.pi, count)
+        speeds = rng.uniform(*properties['speed'], count)
+        lifetimes = rng.integers(*properties['lifetime'], count, endpoint=True)
+        self.x[slots] = position[0]
+        self.y[slots] = position[1]
+        self.vx[slots] = np.cos(directions) * speeds + velocity[0]
+        self.vy[slots] = np.sin(directions) * speeds + velocity[1]
+        self.age[slots] = 0.0
+        self.lifetime[slots] = lifetimes
+        self.kind[slots] = KIND_CODES[kind]
+
+        self.head = (self.head + count) % self.capacity
+        self.used = min(self.capacity, self.used + count)
+        self.remaining_ticks = max(self.remaining_ticks, properties['lifetime'][1])
+        self.emitted += count
+
+    def asteroid_destroyed(self, position, size_type, velocity=(0.0, 0.0)):
+        """Detritos de um asteroide destruído (chamado por kill_asteroid)."""
+        self.emit('debris', position, DEBRIS_BY_SIZE.get(size_type, 0), velocity)
+
+    def bullet_hit(self, position):
+        """Faíscas no ponto de impacto de um projétil (chamado por collision_handler)."""
+        self.emit('spark', position, SPARKS_PER_HIT)
+
+    def ship_destroyed(self, position, velocity=(0.0, 0.0)):
+        """Explosão da nave atingida por um asteroide (chamado por collision_handler)."""
+        self.emit('flame', position, SHIP_EXPLOSION_PARTICLES, velocity)
+
+    # --- Simulação ---
+
+    def update(self):
+        """Avança todas as partículas um tick (movimento, arrasto e idade) num único passo vetorizado."""
+        if not self.remaining_ticks:
+            return
+        self.remaining_ticks -= 1
+        used = self.used
+        x, y, vx, vy = self.x[:used], self.y[:used], self.vx[:used], self.vy[:used]
+        x += vx
+        y += vy
+        vx *= DRAG
+        vy *= DRAG
+        self.age[:used] += 1.0
+
+    def clear(self):
+        self.lifetime[:] = 0.0
+        self.age[:] = 0.0
+        self.remaining_ticks = 0
+
+    # --- Desenho ---
+
+    def draw_list(self):
+        """
+        (superfícies, posições de destino) das partículas vivas e visíveis, calculados em lote.
+        Acima de max_drawn partículas só uma a cada N é incluída.
+        """
+        used = self.used
+        age = self.age[:used]
+        lifetime = self.lifetime[:used]
+        x = self.x[:used]
+        y = self.y[:used]
+        margin = self.max_radius
+        live = np.flatnonzero((age < lifetime) & (x >= -margin) & (x <= self.SCREEN_WIDTH + margin) &
+                              (y >= -margin) & (y <= self.SCREEN_HEIGHT + margin))
+        if self.max_drawn and len(live) > self.max_drawn:
+            live = live[::-(-len(live) // self.max_drawn)]
+        stage = (age[live] * FADE_STAGES / lifetime[live]).astype(np.int64)
+        surface_index = self.kind[live].astype(np.int64) * FADE_STAGES + np.minimum(stage, FADE_STAGES - 1)
+        offset = self.offset_by_surface[surface_index]
+        return surface_index, (x[live] - offset).astype(np.int64), (y[live] - offset).astype(np.int64)
+
+    def dirty_rects(self, left, top):
+        """Um retângulo por célula de DIRTY_CELL_SIZE com partículas desenhadas (para DirtyRectRenderer)."""
+        if not len(left):
+            return []
+        size = DIRTY_CELL_SIZE
+        columns = self.SCREEN_WIDTH // size + 2
+        rows = self.SCREEN_HEIGHT // size + 2
+        # Células deslocadas de uma para cobrir partículas na margem negativa
+        cell_x = np.clip(left // size + 1, 0, columns - 1)
+        cell_y = np.clip(top // size + 1, 0, rows - 1)
+        occupied = np.flatnonzero(np.bincount(cell_y * columns + cell_x, minlength=columns * rows))
+        pad = 2 * self.max_radius + 1 # Partículas que começam perto da borda da célula
+        return [pygame.Rect((cell % columns - 1) * size, (cell // columns - 1) * size, size + pad, size + pad)
+                for cell in occupied.tolist()]
+
+    def draw(self, surface):
+        """Desenha as partículas com um único blits() e retorna os retângulos sujos."""
+        if not self.remaining_ticks:
+            return []
+        surface_index, left, top = self.draw_list()
+        surfaces = self.surfaces
+        surface.blits(zip(map(surfaces.__getitem__, surface_index.tolist()), zip(left.tolist(), top.tolist())),
+                      doreturn=False)
+        return self.dirty_rects(left, top)
+
+    def stats(self):
+        return {'live': len(self), 'capacity': self.capacity, 'emitted': self.emitted, 'overwritten': self.overwritten}
+
+
+# Sistema de partículas em uso, lido por game_entities, asteroid_field e collision_handler.
+# Só o jogo com janela cria um; sem ele (sem janela, replays, varreduras, servidor) nada é emitido.
+_particle_system = None
+
+def get_particle_system():
+    return _particle_system
+
+def set_particle_system(system):
+    global _particle_system
+    _particle_system = system
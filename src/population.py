@@ -0,0 +1,142 @@
+import random
+from collections import deque
+from src.game_entities import Asteroid
+from src.asteroid_field import AsteroidField
+from src.telemetry import get_telemetry
+
+# Limite total de asteroides (o mesmo valor do antigo threading.Semaphore(15))
+DEFAULT_TOTAL_BUDGET = 15
+# A cota de criações por tick vem do orçamento: criar o orçamento inteiro leva pelo menos SPAWN_WAVES ticks.
+# Com o orçamento padrão a cota é 1, então os filhos de uma divisão aparecem em ticks seguidos;
+# o excedente (ex: divisões em cadeia) fica para os próximos ticks
+SPAWN_WAVES = 8
+
+
+def default_max_spawns_per_tick(total_budget):
+    """Cota de criações por tick para um orçamento total (no mínimo 1)."""
+    return max(1, total_budget // SPAWN_WAVES)
+
+
+class AsteroidPopulation:
+    """
+    Gerenciador da população de asteroides.
+    Substitui o semáforo: reserve() / release() controlam um orçamento total e,
+    opcionalmente, um orçamento por classe de tamanho. Instâncias destruídas vão
+    para uma lista livre por classe e são reaproveitadas em vez de recriadas.
+    Criações além de max_spawns_per_tick são enfileiradas e distribuídas pelos
+    ticks seguintes (ondas), evitando picos de alocação; por padrão a cota vem do
+    orçamento (default_max_spawns_per_tick).
+    Tudo roda na thread principal, sem locks.
+    """
+
+    def __init__(self, total_budget=DEFAULT_TOTAL_BUDGET, size_budgets=None, max_spawns_per_tick=None):
+        if max_spawns_per_tick is None:
+            max_spawns_per_tick = default_max_spawns_per_tick(total_budget)
+        self.total_budget = total_budget
+        self.size_budgets = dict(size_budgets) if size_budgets else {}
+        self.max_spawns_per_tick = max_spawns_per_tick
+        self.total_count = 0
+        self.counts = {}
+        self.free_lists = {}
+        self._released = [] # Instâncias destruídas neste tick (só viram reutilizáveis em update())
+        self.pending = deque()
+        self.spawns_left = max_spawns_per_tick
+        self.spawn_timer = 0.0 # Segundos de simulação desde a última geração periódica (asteroid_manager)
+        self.asteroid_worlds = {} # Contextos compartilhados pelos asteroides (game_entities.asteroid_world)
+
+        self.created = 0
+        self.recycled = 0
+        self.deferred = 0
+        self.rejected = 0
+
+    # --- Orçamento ---
+
+    def reserve(self, size_type):
+        """Reserva uma vaga para um asteroide da classe dada. Retorna False se o orçamento acabou."""
+        if self.total_count >= self.total_budget:
+            self.rejected += 1
+            return False
+        size_budget = self.size_budgets.get(size_type)
+        count = self.counts.get(size_type, 0)
+        if size_budget is not None and count >= size_budget:
+            self.rejected += 1
+            return False
+        self.counts[size_type] = count + 1
+        self.total_count += 1
+        return True
+
+    def release(self, size_type, instance=None):
+        """Devolve a vaga; a instância (se houver) será reaproveitada a partir do próximo tick."""
+        self.counts[size_type] -= 1
+        self.total_count -= 1
+        if instance is not None:
+            self._released.append(instance)
+
+    def available(self, size_type=None):
+        free_total = self.total_budget - self.total_count
+        if size_type is None or size_type not in self.size_budgets:
+            return free_total
+        return min(free_total, self.size_budgets[size_type] - self.counts.get(size_type, 0))
+
+    # --- Criação ---
+
+    def create(self, position, size_type, all_sprites, asteroids_group, screen_width, screen_height, rng=random):
+        """Cria (ou reaproveita) um asteroide já reservado e o adiciona aos grupos."""
+        telemetry = get_telemetry()
+        if telemetry is not None:
+            telemetry.spawn(size_type)
+        if isinstance(asteroids_group, AsteroidField):
+            asteroids_group.spawn(position, size_type)
+            self.created += 1
+            return
+        free_list = self.free_lists.get(size_type)
+        if free_list:
+            asteroid = free_list.pop()
+            asteroid.reset(position, size_type, rng)
+            self.recycled += 1
+        else:
+            asteroid = Asteroid(position, size_type, all_sprites, asteroids_group, self,
+                                screen_width, screen_height, rng=rng)
+            self.created += 1
+        all_sprites.add(asteroid)
+        asteroids_group.add(asteroid)
+
+    def spawn(self, position, size_type, all_sprites, asteroids_group, screen_width, screen_height, rng=random):
+        """Cria agora se ainda houver cota neste tick (e nada esperando na fila); senão agenda para os próximos ticks."""
+        if self.spawns_left > 0 and not self.pending:
+            self.spawns_left -= 1
+            self.create(position, size_type, all_sprites, asteroids_group, screen_width, screen_height, rng)
+        else:
+            self.schedule(position, size_type, all_sprites, asteroids_group, screen_width, screen_height, rng)
+
+    def schedule(self, position, size_type, all_sprites, asteroids_group, screen_width, screen_height, rng=random):
+        """Enfileira uma criação já reservada, executada em update() respeitando a cota por tick."""
+        self.pending.append((position, size_type, all_sprites, asteroids_group, screen_width, screen_height, rng))
+        self.deferred += 1
+
+    def update(self):
+        """
+        Chamado uma vez por tick, no fim: cria as pendentes que ainda couberem na cota deste
+        tick, libera as instâncias destruídas para reutilização e renova a cota para o próximo.
+        """
+        pending = self.pending
+        while pending and self.spawns_left > 0:
+            self.spawns_left -= 1
+            self.create(*pending.popleft())
+        # Só depois de criar: uma instância destruída neste tick não reaparece no mesmo tick
+        for instance in self._released:
+            self.free_lists.setdefault(instance.size_type, []).append(instance)
+        self._released.clear()
+        self.spawns_left = self.max_spawns_per_tick
+
+    def stats(self):
+        return {
+            'total': self.total_count,
+            'by_size': dict(self.counts),
+            'pending': len(self.pending),
+            'free': {size_type: len(free_list) for size_type, free_list in self.free_lists.items()},
+            'created': self.created,
+            'recycled': self.recycled,
+            'deferred': self.deferred,
+            'rejected': self.rejected,
+        }
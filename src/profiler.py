@@ -0,0 +1,172 @@
+import gc
+import os
+import sys
+import csv
+import json
+import time
+from collections import deque
+import pygame
+
+# Fases medidas em game_loop, na ordem em que acontecem
+FRAME_PHASES = ('events', 'update', 'collision', 'spawn', 'draw', 'flip')
+# Quantidade de quadros considerada nos percentis do overlay
+ROLLING_WINDOW = 300
+# O texto do overlay é refeito a cada N quadros
+OVERLAY_REFRESH_FRAMES = 15
+OVERLAY_COLOR = (0, 255, 0)
+
+
+class ProfileExporter:
+    """
+    Exportação contínua de um registro por quadro, em CSV (.csv) ou JSON por linha (.jsonl/.json).
+    As linhas são escritas conforme chegam e o arquivo é descarregado periodicamente.
+    """
+
+    def __init__(self, path, flush_every=120):
+        self.path = path
+        self.format = 'csv' if path.endswith('.csv') else 'jsonl'
+        self.flush_every = flush_every
+        self._file = open(path, 'w', newline='')
+        self._writer = None
+        self._rows = 0
+
+    def write(self, record):
+        if self.format == 'csv':
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._file, fieldnames=list(record.keys()), extrasaction='ignore')
+                self._writer.writeheader()
+            self._writer.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + '\n')
+        self._rows += 1
+        if self._rows % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class FrameProfiler:
+    """
+    Perfilador de quadros com custo quase nulo quando desligado.
+    Uso em game_loop: begin_frame(), mark('fase') ao fim de cada fase (o tempo desde a
+    marca anterior é somado à fase; uma fase pode aparecer várias vezes por quadro, ex:
+    vários ticks de simulação), count('grupo', n) e end_frame().
+    Também registra a variação de blocos alocados e as coletas do GC por quadro,
+    mantém janelas móveis para os percentis do overlay e exporta cada quadro (opcional).
+    """
+
+    def __init__(self, enabled=False, export_path=None, window=ROLLING_WINDOW):
+        self.enabled = enabled or export_path is not None
+        self.overlay_visible = False
+        self.exporter = ProfileExporter(export_path) if export_path else None
+        self.window = window
+        self.history = {phase: deque(maxlen=window) for phase in FRAME_PHASES + ('frame',)}
+        self.frame_index = 0
+        self.phase_times = dict.fromkeys(FRAME_PHASES, 0.0)
+        self.counts = {}
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+        self._in_frame = False # Só quadros medidos desde begin_frame() entram no histórico
+        self._allocated_blocks = 0
+        self._gc_collections = 0
+        self._overlay_surface = None
+        self._overlay_font = None
+
+    def toggle_overlay(self):
+        """Liga/desliga o overlay (ligar o overlay também liga a medição)."""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            if not self.enabled:
+                self._in_frame = False # Ligado no meio de um quadro: esse quadro parcial é descartado
+            self.enabled = True
+        elif self.exporter is None:
+            self.enabled = False
+        self._overlay_surface = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        for phase in self.phase_times:
+            self.phase_times[phase] = 0.0
+        self.counts = {}
+        self._allocated_blocks = sys.getallocatedblocks()
+        self._gc_collections = _gc_collections()
+        self._frame_start = self._last_mark = time.perf_counter()
+        self._in_frame = True
+
+    def mark(self, phase):
+        if not self.enabled or not self._in_frame:
+            return
+        now = time.perf_counter()
+        self.phase_times[phase] += now - self._last_mark
+        self._last_mark = now
+
+    def count(self, name, value):
+        if self.enabled:
+            self.counts[name] = value
+
+    def end_frame(self):
+        if not self.enabled or not self._in_frame:
+            return
+        self._in_frame = False
+        frame_time = time.perf_counter() - self._frame_start
+        for phase, elapsed in self.phase_times.items():
+            self.history[phase].append(elapsed)
+        self.history['frame'].append(frame_time)
+        if self.exporter is not None:
+            record = {'frame': self.frame_index, 'time': time.time(), 'frame_ms': frame_time * 1000}
+            for phase, elapsed in self.phase_times.items():
+                record[f'{phase}_ms'] = elapsed * 1000
+            record['allocated_blocks_delta'] = sys.getallocatedblocks() - self._allocated_blocks
+            record['gc_collections'] = _gc_collections() - self._gc_collections
+            record.update(self.counts)
+            self.exporter.write(record)
+        self.frame_index += 1
+
+    def percentiles(self, phase, fractions=(0.5, 0.95, 0.99)):
+        values = sorted(self.history[phase])
+        if not values:
+            return tuple(0.0 for _ in fractions)
+        last = len(values) - 1
+        return tuple(values[min(last, int(round(fraction * last)))] for fraction in fractions)
+
+    def draw_overlay(self, surface, position=(10, 10)):
+        """Desenha o overlay (se visível) e retorna a lista de retângulos desenhados."""
+        if not self.overlay_visible:
+            return []
+        if self._overlay_surface is None or self.frame_index % OVERLAY_REFRESH_FRAMES == 0:
+            self._overlay_surface = self._render_overlay()
+        return [surface.blit(self._overlay_surface, position)]
+
+    def _render_overlay(self):
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.Font(None, 22)
+        lines = ["fase        p50     p95     p99 (ms)"]
+        for phase in ('frame',) + FRAME_PHASES:
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append(f"{phase:<10}{p50 * 1000:>7.2f} {p95 * 1000:>7.2f} {p99 * 1000:>7.2f}")
+        if self.counts:
+            lines.append('  '.join(f"{name}={value}" for name, value in self.counts.items()))
+        rendered = [self._overlay_font.render(line, True, OVERLAY_COLOR) for line in lines]
+        width = max(line.get_width() for line in rendered)
+        line_height = self._overlay_font.get_linesize()
+        overlay = pygame.Surface((width, line_height * len(rendered)))
+        for index, line in enumerate(rendered):
+            overlay.blit(line, (0, index * line_height))
+        return overlay
+
+    def close(self):
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+def _gc_collections():
+    return sum(generation['collections'] for generation in gc.get_stats())
+
+
+def profiler_from_environment():
+    """Cria o perfilador a partir de ASTEROIDES_PROFILE (caminho do arquivo de exportação), se definida."""
+    export_path = os.environ.get('ASTEROIDES_PROFILE')
+    return FrameProfiler(export_path=export_path or None)
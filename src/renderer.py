@@ -0,0 +1,127 @@
+import pygame
+
+# Cores
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GREY = (128, 128, 128)
+
+# Fração da tela a partir da qual atualizar retângulos sai mais caro que um flip completo
+FULL_REDRAW_RATIO = 0.4
+
+# Geometria do botão de pausa (mesma do desenho original em game_loop)
+PAUSE_BUTTON_MARGIN = 20
+PAUSE_BUTTON_SIZE = 40
+PAUSE_ICON_LINE_LENGTH = 20
+PAUSE_ICON_LINE_WIDTH = 4
+PAUSE_ICON_SPACING = 10
+
+
+class DirtyRectRenderer:
+    """
+    Desenho por retângulos sujos.
+    A cada quadro, begin_frame() apaga as áreas desenhadas no quadro anterior;
+    os retângulos desenhados no quadro atual são registrados com add();
+    end_frame() envia à tela só a união das áreas antigas e novas com
+    pygame.display.update(rects), ou faz um flip completo quando a área suja é grande.
+    Com um background (ParallaxBackground, src/background.py), as áreas são apagadas
+    redesenhando o fundo delas em vez de preenchê-las com background_color, e o quadro é
+    redesenhado inteiro quando o fundo se desloca.
+    """
+
+    def __init__(self, screen, background_color=BLACK, full_redraw_ratio=FULL_REDRAW_RATIO, background=None):
+        self.screen = screen
+        self.background_color = background_color
+        self.background = background
+        self.screen_rect = screen.get_rect()
+        self.full_redraw_area = self.screen_rect.width * self.screen_rect.height * full_redraw_ratio
+        self.previous_rects = []
+        self.current_rects = []
+        self.full_redraw = True # O primeiro quadro sempre é completo
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """Força o próximo quadro a redesenhar e enviar a tela inteira."""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        background = self.background
+        if background is not None:
+            if background.changed:
+                self.full_redraw = True
+            if self.full_redraw:
+                background.draw(self.screen)
+            else:
+                background.draw_rects(self.screen, self.previous_rects)
+        elif self.full_redraw:
+            self.screen.fill(self.background_color)
+        else:
+            fill = self.screen.fill
+            background_color = self.background_color
+            for rect in self.previous_rects:
+                fill(background_color, rect)
+        self.current_rects = []
+
+    def add(self, rects):
+        self.current_rects.extend(rects)
+
+    def end_frame(self):
+        dirty = self.previous_rects + self.current_rects
+        dirty_area = 0
+        for rect in dirty:
+            dirty_area += rect.width * rect.height
+        if self.full_redraw or dirty_area > self.full_redraw_area:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+        self.full_redraw = False
+        # Só as áreas deste quadro precisam ser apagadas no próximo
+        self.previous_rects = [rect.clip(self.screen_rect) for rect in self.current_rects]
+
+
+class HudCache:
+    """
+    Superfícies do HUD renderizadas uma única vez: o texto da pontuação só é
+    refeito quando a pontuação muda; o botão de pausa e o aviso "PAUSADO" são pré-renderizados.
+    """
+
+    def __init__(self, font, screen_width, screen_height):
+        self.font = font
+        self.SCREEN_WIDTH = screen_width
+        self.SCREEN_HEIGHT = screen_height
+        self._score = None
+        self._score_surface = None
+        self._score_rect = None
+        self.pause_button_surface, self.pause_button_rect = self._bake_pause_button()
+        self.paused_surface = font.render("PAUSADO", True, WHITE)
+        self.paused_rect = self.paused_surface.get_rect(center=(screen_width // 2, screen_height // 2))
+
+    def _bake_pause_button(self):
+        surface = pygame.Surface((PAUSE_BUTTON_SIZE, PAUSE_BUTTON_SIZE))
+        surface.fill(GREY)
+        # Ícone de pausa (duas linhas verticais)
+        line1_x = PAUSE_BUTTON_SIZE // 2 - PAUSE_ICON_SPACING // 2
+        line2_x = PAUSE_BUTTON_SIZE // 2 + PAUSE_ICON_SPACING // 2
+        icon_y_start = (PAUSE_BUTTON_SIZE - PAUSE_ICON_LINE_LENGTH) // 2
+        icon_y_end = icon_y_start + PAUSE_ICON_LINE_LENGTH
+        pygame.draw.line(surface, WHITE, (line1_x, icon_y_start), (line1_x, icon_y_end), PAUSE_ICON_LINE_WIDTH)
+        pygame.draw.line(surface, WHITE, (line2_x, icon_y_start), (line2_x, icon_y_end), PAUSE_ICON_LINE_WIDTH)
+        rect = surface.get_rect(topleft=(self.SCREEN_WIDTH - PAUSE_BUTTON_SIZE - PAUSE_BUTTON_MARGIN, PAUSE_BUTTON_MARGIN))
+        return surface, rect
+
+    def score_surface(self, score):
+        if score != self._score:
+            self._score = score
+            self._score_surface = self.font.render(str(score), True, WHITE)
+            self._score_rect = self._score_surface.get_rect(center=(self.SCREEN_WIDTH // 2, 50))
+        return self._score_surface, self._score_rect
+
+    def draw(self, screen, score, paused):
+        """Desenha o HUD e retorna os retângulos ocupados."""
+        score_surface, score_rect = self.score_surface(score)
+        blits = [(score_surface, score_rect), (self.pause_button_surface, self.pause_button_rect)]
+        if paused:
+            blits.append((self.paused_surface, self.paused_rect))
+        return screen.blits(blits)
@@ -0,0 +1,240 @@
+import sys
+import mmap
+import time
+import struct
+import bisect
+import argparse
+from src.headless import HeadlessSimulation
+from src import savestate
+from src.savestate import pack_input, unpack_input
+
+# Formato do arquivo (little-endian):
+#   cabeçalho | quadro-chave 0 | entradas do bloco 0 | quadro-chave 1 | ... | índice | rodapé
+# Cada tick grava 1 byte com os campos de shared_input_state (savestate.INPUT_BITS).
+# Um quadro-chave é o estado completo do mundo no início de um tick, incluindo o
+# estado do gerador aleatório; o índice no fim do arquivo permite buscar qualquer
+# tick lendo só o quadro-chave anterior e as entradas seguintes (via mmap).
+# Os quadros-chave são estados de src/savestate.py (versão 2).
+REPLAY_MAGIC = b'ASRP'
+INDEX_MAGIC = b'ASRI'
+REPLAY_VERSION = 2
+# Um quadro-chave a cada N ticks (5 segundos de simulação)
+DEFAULT_KEYFRAME_INTERVAL = 300
+
+HEADER = struct.Struct('<4sHqHHHBI') # magic, versão, semente, largura, altura, limite de asteroides, flags, intervalo
+INDEX_ENTRY = struct.Struct('<IQIQI') # tick, offset do quadro-chave, tamanho, offset das entradas, ticks no bloco
+FOOTER = struct.Struct('<QI4s') # offset do índice, entradas no índice, magic
+FLAG_ASTEROID_FIELD = 1
+FLAG_PRECISE_COLLISIONS = 2 # Ausente nos replays gravados antes das máscaras: reproduzidos com círculos
+
+
+# --- Gravação ---
+
+class ReplayRecorder:
+    """
+    Grava uma partida em arquivo: a semente, o estado de entrada de cada tick (1 byte)
+    e um quadro-chave a cada keyframe_interval ticks.
+    'world' é uma HeadlessSimulation, cuja fonte de entrada o gravador substitui (repassando
+    cada tick à fonte original), ou o Game com janela, cujo InputSystem chama record() ao
+    montar a entrada de cada tick. Voltar a um tick já gravado (F9 no jogo) descarta o que
+    foi gravado a partir dele. close() escreve o índice; sem ele o arquivo não pode ser lido.
+    """
+
+    def __init__(self, path, world, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        if world.population.size_budgets:
+            raise ValueError("Orçamentos por classe de tamanho não são gravados no replay")
+        self.world = world
+        self.keyframe_interval = keyframe_interval
+        self.input_system = getattr(world, 'input_system', None)
+        if self.input_system is not None:
+            self.input_system.recorder = self
+        else:
+            self.inner_source = world.input_source
+            world.input_source = self
+
+        self._file = open(path, 'wb')
+        flags = FLAG_ASTEROID_FIELD if world.use_asteroid_field else 0
+        if world.precise_collisions:
+            flags |= FLAG_PRECISE_COLLISIONS
+        self._file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, world.seed,
+                                     world.SCREEN_WIDTH, world.SCREEN_HEIGHT,
+                                     world.population.total_budget, flags, keyframe_interval))
+        self._index = [] # [tick, offset do quadro-chave, tamanho, offset das entradas, ticks]
+        self._inputs = bytearray()
+        self._next_tick = None
+
+    def apply(self, tick, input_state):
+        self.inner_source.apply(tick, input_state)
+        self.record(input_state)
+
+    def record(self, input_state):
+        """Grava o estado de entrada do tick atual do mundo, já montado e antes de qualquer atualização."""
+        tick = self.world.tick
+        if tick != self._next_tick:
+            self._rewind(tick)
+            self._write_keyframe()
+        elif tick % self.keyframe_interval == 0:
+            self._write_keyframe()
+        self._inputs.append(pack_input(input_state))
+        self._next_tick = tick + 1
+
+    def _flush_inputs(self):
+        if self._index and self._inputs:
+            entry = self._index[-1]
+            entry[3] = self._file.tell()
+            entry[4] = len(self._inputs)
+            self._file.write(self._inputs)
+            self._inputs.clear()
+
+    def _rewind(self, tick):
+        """Descarta os quadros-chave e as entradas de 'tick' em diante (estado anterior restaurado)."""
+        self._flush_inputs()
+        index = self._index
+        while index and index[-1][0] >= tick:
+            self._file.seek(index.pop()[1])
+            self._file.truncate()
+        if index:
+            # As entradas do bloco anterior passam a terminar em 'tick'
+            entry = index[-1]
+            entry[4] = min(entry[4], tick - entry[0])
+
+    def _write_keyframe(self):
+        self._flush_inputs()
+        keyframe = savestate.capture(self.world)
+        self._index.append([self.world.tick, self._file.tell(), len(keyframe), 0, 0])
+        self._file.write(keyframe)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush_inputs()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(FOOTER.pack(index_offset, len(self._index), INDEX_MAGIC))
+        self._file.close()
+        if self.input_system is not None:
+            self.input_system.recorder = None
+        else:
+            self.world.input_source = self.inner_source
+
+
+# --- Leitura e reprodução ---
+
+class ReplayReader:
+    """Acesso ao arquivo de replay por mmap: cabeçalho, quadros-chave e a entrada de qualquer tick."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.seed, width, height, self.asteroid_limit, flags, self.keyframe_interval = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} não é um replay compatível (versão {REPLAY_VERSION})")
+        self.screen_size = (width, height)
+        self.use_asteroid_field = bool(flags & FLAG_ASTEROID_FIELD)
+        self.precise_collisions = bool(flags & FLAG_PRECISE_COLLISIONS)
+
+        index_offset, entries, index_magic = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if index_magic != INDEX_MAGIC:
+            raise ValueError(f"{path} está incompleto (gravação não foi fechada)")
+        self.index = [INDEX_ENTRY.unpack_from(self._map, index_offset + i * INDEX_ENTRY.size) for i in range(entries)]
+        self.keyframe_ticks = [entry[0] for entry in self.index]
+        self.start_tick = self.keyframe_ticks[0]
+        last_tick, _, _, _, last_count = self.index[-1]
+        self.end_tick = last_tick + last_count # Primeiro tick não gravado
+
+    def keyframe_for(self, tick):
+        """Posição no índice do último quadro-chave em ou antes de 'tick'."""
+        return max(0, bisect.bisect_right(self.keyframe_ticks, tick) - 1)
+
+    def keyframe(self, position):
+        _, offset, size, _, _ = self.index[position]
+        return self._map[offset:offset + size]
+
+    def input_bits(self, tick):
+        keyframe_tick, _, _, inputs_offset, count = self.index[self.keyframe_for(tick)]
+        if not self.start_tick <= tick < keyframe_tick + count:
+            raise IndexError(f"tick {tick} fora do replay ({self.start_tick}..{self.end_tick - 1})")
+        return self._map[inputs_offset + tick - keyframe_tick]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class ReplayInput:
+    """Fonte de entrada que reproduz o estado gravado em cada tick (no lugar de ScriptedInput)."""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def apply(self, tick, input_state):
+        unpack_input(self.reader.input_bits(tick), input_state)
+
+
+class ReplayPlayer:
+    """
+    Reproduz um replay numa HeadlessSimulation, sem janela e sem limite de FPS.
+    seek() restaura o quadro-chave anterior ao tick pedido e simula só o restante.
+    """
+
+    def __init__(self, path):
+        self.reader = ReplayReader(path)
+        self.simulation = HeadlessSimulation(seed=self.reader.seed, input_source=ReplayInput(self.reader),
+                                             screen_size=self.reader.screen_size,
+                                             asteroid_limit=self.reader.asteroid_limit,
+                                             use_asteroid_field=self.reader.use_asteroid_field,
+                                             precise_collisions=self.reader.precise_collisions)
+        self.seek(self.reader.start_tick)
+
+    def seek(self, tick):
+        """Leva a simulação ao início de 'tick'. Retorna o número de ticks simulados após o quadro-chave."""
+        tick = max(self.reader.start_tick, min(tick, self.reader.end_tick))
+        simulation = self.simulation
+        position = self.reader.keyframe_for(tick)
+        # Só restaura se o quadro-chave estiver à frente do estado atual (ou se for preciso voltar)
+        if tick < simulation.tick or self.reader.keyframe_ticks[position] > simulation.tick:
+            savestate.restore(simulation, self.reader.keyframe(position))
+        simulated = 0
+        while simulation.tick < tick and simulation.step():
+            simulated += 1
+        return simulated
+
+    def run(self):
+        """Simula do tick atual até o fim da gravação. Retorna o estado final."""
+        return self.simulation.run(self.reader.end_tick - self.simulation.tick)
+
+    def close(self):
+        self.reader.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz um replay gravado com --headless --record ou pelo jogo com janela.")
+    parser.add_argument('--replay', required=True, help="Arquivo de replay")
+    parser.add_argument('--seek', type=int, help="Começa a reprodução neste tick (a partir do quadro-chave anterior)")
+    args = parser.parse_args(argv)
+
+    player = ReplayPlayer(args.replay)
+    reader = player.reader
+    print(f"replay: semente={reader.seed} tela={reader.screen_size} ticks={reader.start_tick}..{reader.end_tick} "
+          f"quadros_chave={len(reader.index)} campo={reader.use_asteroid_field}")
+    start = time.perf_counter()
+    if args.seek is not None:
+        simulated = player.seek(args.seek)
+        print(f"busca: tick={player.simulation.tick} ({simulated} ticks após o quadro-chave, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms)")
+    first_tick = player.simulation.tick
+    state = player.run()
+    elapsed = time.perf_counter() - start
+    ticks = state['tick'] - first_tick
+    print(f"tick={state['tick']} score={state['score']} game_over={state['game_over']} "
+          f"asteroides={len(state['asteroids'])} projeteis={len(state['bullets'])}")
+    print(f"reprodução: {ticks} ticks em {elapsed:.3f} s ({ticks / elapsed if elapsed else 0:.0f} ticks/s)")
+    print(f"digest={player.simulation.state_digest()}")
+    player.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import struct
+from collections import deque
+import numpy as np
+import pygame
+from src.asteroid_field import SIZE_TYPES, SIZE_CODES
+from src.game_entities import Asteroid
+from src.bullet import Bullet
+
+# Estado completo de um mundo (HeadlessSimulation ou o Game com janela) num único buffer
+# contíguo (little-endian), no início de um tick:
+#   cabeçalho | gerador aleatório | nave | tipos na ordem de all_sprites | projéteis |
+#   asteroides | arrays do AsteroidField e lista livre | criações pendentes
+# Os blocos de entidades são arrays NumPy com registros de tamanho fixo: capture() copia
+# os campos de cada entidade para um array e restore() lê os arrays direto do buffer
+# (sem cópia) e reaproveita as instâncias existentes em vez de criar sprites novos.
+SAVE_MAGIC = b'ASSV'
+SAVE_VERSION = 1
+
+# magic, versão, flags, tick, pontuação, temporizador de geração, cota de criações, entradas,
+# fim de jogo, sprites, projéteis, asteroides, capacidade do campo, slots do campo, slots livres, pendentes
+HEADER = struct.Struct('<4sHBIidHB?IIIIIII')
+FLAG_ASTEROID_FIELD = 1
+RNG_STATE = struct.Struct('<625I?d') # estado do Mersenne Twister (random.Random.getstate) e gauss_next
+PLAYER_STATE = struct.Struct('<iiiiddd??d') # rect, vx, vy, ângulo (e se é int), raio de colisão (se já calculado)
+
+KIND_PLAYER, KIND_BULLET, KIND_ASTEROID = 0, 1, 2
+BULLET_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('vx', '<f8'), ('vy', '<f8')])
+ASTEROID_DTYPE = np.dtype([('size', 'u1'), ('x', '<i4'), ('y', '<i4'), ('w', '<i4'), ('h', '<i4'),
+                           ('angle', '<f8'), ('spin', '<f8'), ('vx', '<f8'), ('vy', '<f8')])
+PENDING_DTYPE = np.dtype([('x', '<f8'), ('y', '<f8'), ('size', 'u1')])
+FIELD_ARRAYS = ('x', 'y', 'prev_x', 'prev_y', 'vx', 'vy', 'angle', 'spin', 'size', 'alive', 'generation')
+
+# Campos de shared_input_state num byte; também é o byte por tick dos replays (src/replay.py)
+INPUT_BITS = (('rotate_left', 1), ('rotate_right', 2), ('thrust_on', 4), ('shoot_request', 8))
+
+
+def pack_input(input_state):
+    bits = 0
+    for command, bit in INPUT_BITS:
+        if input_state[command]:
+            bits |= bit
+    return bits
+
+def unpack_input(bits, input_state):
+    for command, bit in INPUT_BITS:
+        input_state[command] = bool(bits & bit)
+
+
+def capture(world):
+    """
+    Serializa o mundo num buffer contíguo (bytes).
+    'world' é uma HeadlessSimulation ou um Game: precisa de tick, score, game_over, rng,
+    input_state, population, player, all_sprites, bullets_group, asteroids_group e
+    use_asteroid_field.
+    """
+    population = world.population
+    player = world.player
+
+    # Uma passada por all_sprites: a ordem de atualização e de colisão faz parte do estado
+    kinds = bytearray()
+    bullets = []
+    asteroids = []
+    for sprite in world.all_sprites.sprites():
+        if sprite is player:
+            kinds.append(KIND_PLAYER)
+        elif type(sprite) is Bullet:
+            kinds.append(KIND_BULLET)
+            bullets.append((sprite.rect.x, sprite.rect.y, sprite.vx, sprite.vy))
+        else:
+            kinds.append(KIND_ASTEROID)
+            rect = sprite.rect
+            asteroids.append((SIZE_CODES[sprite.size_type], rect.x, rect.y, rect.w, rect.h,
+                              sprite.angle, sprite.rotation_speed, sprite.vx, sprite.vy))
+    pending = [(position[0], position[1], SIZE_CODES[size_type]) for position, size_type, *_ in population.pending]
+
+    flags = 0
+    field_parts = []
+    capacity = used = free_count = 0
+    if world.use_asteroid_field:
+        flags |= FLAG_ASTEROID_FIELD
+        field = world.asteroids_group
+        # Só os slots até o último vivo; os demais são recriados zerados
+        live = np.flatnonzero(field.alive)
+        used = int(live[-1]) + 1 if len(live) else 0
+        capacity = field.capacity
+        field_parts = [getattr(field, name)[:used].tobytes() for name in FIELD_ARRAYS]
+        free_count = len(field._free)
+        field_parts.append(np.array(field._free, dtype='<u4').tobytes())
+
+    _, mt_state, gauss_next = world.rng.getstate()
+    radius = getattr(player, 'radius', None)
+    parts = [
+        HEADER.pack(SAVE_MAGIC, SAVE_VERSION, flags, world.tick, world.score, population.spawn_timer,
+                    population.spawns_left, pack_input(world.input_state), world.game_over,
+                    len(kinds), len(bullets), len(asteroids), capacity, used, free_count, len(pending)),
+        RNG_STATE.pack(*mt_state, gauss_next is not None, gauss_next or 0.0),
+        # O ângulo começa como int (0) e só vira float ao girar; state() distingue os dois
+        PLAYER_STATE.pack(*player.rect, player.vx, player.vy, player.angle, isinstance(player.angle, int),
+                          radius is not None, radius or 0.0),
+        bytes(kinds),
+        np.array(bullets, dtype=BULLET_DTYPE).tobytes(),
+        np.array(asteroids, dtype=ASTEROID_DTYPE).tobytes(),
+        *field_parts,
+        np.array(pending, dtype=PENDING_DTYPE).tobytes(),
+    ]
+    return b''.join(parts)
+
+
+def describe(data):
+    """Resumo de um buffer de capture(): tick, contagens e tamanho."""
+    (_, version, flags, tick, score, _, _, _, game_over, sprites, bullets, asteroids,
+     _, used, _, pending) = HEADER.unpack_from(data, 0)
+    return {'version': version, 'tick': tick, 'score': score, 'game_over': game_over, 'sprites': sprites,
+            'bullets': bullets, 'asteroids': asteroids, 'field_slots': used, 'pending': pending,
+            'asteroid_field': bool(flags & FLAG_ASTEROID_FIELD), 'bytes': len(data)}
+
+
+def restore(world, data, restore_input=True):
+    """
+    Restaura em 'world' o estado gravado por capture() (o mundo deve ter a mesma
+    configuração: tamanho da tela, orçamento e motor de asteroides).
+    Os asteroides atuais e os das listas livres da população são reaproveitados; só
+    faltando instâncias um Asteroid novo é criado. O gerador aleatório é restaurado
+    por último, então nenhuma criação afeta a sequência gravada.
+    Com restore_input=False o estado de entrada atual é mantido (ex: teclas seguradas no jogo com janela).
+    """
+    (magic, version, flags, tick, score, spawn_timer, spawns_left, input_bits, game_over,
+     sprite_count, bullet_count, asteroid_count, capacity, used, free_count, pending_count) = HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC or version != SAVE_VERSION:
+        raise ValueError(f"estado salvo incompatível (versão {SAVE_VERSION})")
+    if bool(flags & FLAG_ASTEROID_FIELD) != bool(world.use_asteroid_field):
+        raise ValueError("estado salvo com outro motor de asteroides (USE_ASTEROID_FIELD)")
+    offset = HEADER.size
+    rng_values = RNG_STATE.unpack_from(data, offset)
+    offset += RNG_STATE.size
+    player_values = PLAYER_STATE.unpack_from(data, offset)
+    offset += PLAYER_STATE.size
+    kinds = data[offset:offset + sprite_count]
+    offset += sprite_count
+    bullets = np.frombuffer(data, dtype=BULLET_DTYPE, count=bullet_count, offset=offset)
+    offset += bullets.nbytes
+    asteroids = np.frombuffer(data, dtype=ASTEROID_DTYPE, count=asteroid_count, offset=offset)
+    offset += asteroids.nbytes
+
+    population = world.population
+    all_sprites = world.all_sprites
+    asteroids_group = world.asteroids_group
+    player = world.player
+
+    # Instâncias que podem ser reaproveitadas: os asteroides atuais e os já destruídos
+    spare = [] if world.use_asteroid_field else asteroids_group.sprites()
+    for free_list in population.free_lists.values():
+        spare.extend(free_list)
+    spare.extend(population._released)
+    population.free_lists.clear()
+    population._released.clear()
+    population.pending.clear()
+
+    # Esvazia o mundo atual: projéteis voltam ao pool
+    for bullet in world.bullets_group.sprites():
+        bullet.kill()
+    all_sprites.empty()
+    if not world.use_asteroid_field:
+        asteroids_group.empty()
+
+    player_x, player_y, player_w, player_h, player.vx, player.vy, angle, angle_is_int, has_radius, radius = player_values
+    player.angle = int(angle) if angle_is_int else angle
+    player.image = pygame.transform.rotate(player.original_image, player.angle)
+    player.rect = pygame.Rect(player_x, player_y, player_w, player_h)
+    if has_radius:
+        player.radius = radius
+    elif hasattr(player, 'radius'):
+        del player.radius
+
+    # Projéteis do pool da nave, na ordem gravada
+    acquire = player.bullet_pool.acquire
+    new_bullets = []
+    for bullet_x, bullet_y, vx, vy in bullets.tolist():
+        bullet = acquire(0, 0, 0)
+        bullet.rect.topleft = (bullet_x, bullet_y)
+        bullet.vx = vx
+        bullet.vy = vy
+        new_bullets.append(bullet)
+
+    counts = {}
+    new_asteroids = []
+    rng = world.rng
+    screen_width, screen_height = world.SCREEN_WIDTH, world.SCREEN_HEIGHT
+    for code, ax, ay, aw, ah, angle, rotation_speed, vx, vy in asteroids.tolist():
+        size_type = SIZE_TYPES[code]
+        if spare:
+            asteroid = spare.pop()
+        else:
+            # O construtor consome números aleatórios; o estado do gerador é restaurado no fim
+            asteroid = Asteroid((0, 0), size_type, all_sprites, asteroids_group, population,
+                                screen_width, screen_height, rng=rng)
+        asteroid.restore(size_type, (ax, ay, aw, ah), angle, rotation_speed, vx, vy, rng)
+        new_asteroids.append(asteroid)
+        counts[size_type] = counts.get(size_type, 0) + 1
+    # Sobras continuam disponíveis para reaproveitamento
+    for asteroid in spare:
+        population.free_lists.setdefault(asteroid.size_type, []).append(asteroid)
+
+    # all_sprites na ordem gravada
+    bullet_iter = iter(new_bullets)
+    asteroid_iter = iter(new_asteroids)
+    ordered = [player if kind == KIND_PLAYER else next(bullet_iter) if kind == KIND_BULLET else next(asteroid_iter)
+               for kind in kinds]
+    all_sprites.add(*ordered)
+    world.bullets_group.add(*new_bullets)
+    if not world.use_asteroid_field:
+        asteroids_group.add(*new_asteroids)
+
+    if world.use_asteroid_field:
+        field = asteroids_group
+        if field.capacity != capacity:
+            field.capacity = capacity
+            for name in FIELD_ARRAYS:
+                setattr(field, name, np.zeros(capacity, dtype=getattr(field, name).dtype))
+        for name in FIELD_ARRAYS:
+            array = getattr(field, name)
+            array[:used] = np.frombuffer(data, dtype=array.dtype, count=used, offset=offset)
+            array[used:] = 0
+            offset += used * array.itemsize
+        field._free = np.frombuffer(data, dtype='<u4', count=free_count, offset=offset).tolist()
+        offset += 4 * free_count
+        codes, code_counts = np.unique(field.size[:used][field.alive[:used]], return_counts=True)
+        for code, count in zip(codes.tolist(), code_counts.tolist()):
+            counts[SIZE_TYPES[code]] = counts.get(SIZE_TYPES[code], 0) + count
+
+    pending = np.frombuffer(data, dtype=PENDING_DTYPE, count=pending_count, offset=offset)
+    for pending_x, pending_y, code in pending.tolist():
+        size_type = SIZE_TYPES[code]
+        population.pending.append(((pending_x, pending_y), size_type, all_sprites, asteroids_group,
+                                   screen_width, screen_height, rng))
+        counts[size_type] = counts.get(size_type, 0) + 1
+
+    # As vagas reservadas são os asteroides vivos mais as criações pendentes
+    population.counts = counts
+    population.total_count = sum(counts.values())
+    population.spawn_timer = spawn_timer
+    population.spawns_left = spawns_left
+
+    world.tick = tick
+    world.score = score
+    world.game_over = game_over
+    if restore_input:
+        unpack_input(input_bits, world.input_state)
+    *mt_state, has_gauss, gauss_next = rng_values
+    rng.setstate((3, tuple(mt_state), gauss_next if has_gauss else None))
+
+
+class StateHistory:
+    """
+    Últimos estados salvos por tick, para rollback (ex: netcode com previsão):
+    save() a cada tick e rollback(tick) para voltar a qualquer um dos 'capacity' últimos.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.states = {}
+        self.ticks = deque()
+
+    def save(self, world):
+        data = capture(world)
+        self.states[world.tick] = data
+        self.ticks.append(world.tick)
+        while len(self.ticks) > self.capacity:
+            self.states.pop(self.ticks.popleft(), None)
+        return data
+
+    def rollback(self, world, tick, restore_input=True):
+        """Restaura o estado salvo no início de 'tick'. KeyError se ele já saiu do histórico."""
+        restore(world, self.states[tick], restore_input)
+        # Os estados posteriores serão refeitos a partir daqui
+        while self.ticks and self.ticks[-1] > tick:
+            self.states.pop(self.ticks.pop(), None)
+
+    def __contains__(self, tick):
+        return tick in self.states
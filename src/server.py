@@ -0,0 +1,584 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import socket
+import struct
+import asyncio
+import argparse
+import weakref
+from collections import OrderedDict
+import pygame
+from src import netcode
+from src.headless import init_headless_display, HEADLESS_SCREEN_SIZE
+from src.population import AsteroidPopulation
+from src.asteroid_manager import setup_initial_asteroids, spawn_periodic_asteroids
+from src.asteroid_field import SIZE_CODES
+from src.collision_handler import handle_bullet_asteroid_collisions, handle_player_asteroid_collisions
+from src.input_handler import InputSystem
+from src.spaceship import Player
+from src.timestep import FixedTimestep, SIMULATION_HZ
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7777
+# Várias naves dividem o mesmo campo: mais asteroides que no jogo solo
+MULTIPLAYER_ASTEROID_LIMIT = 40
+# Um snapshot a cada N ticks de simulação (30 por segundo a 60 Hz)
+DEFAULT_SNAPSHOT_INTERVAL = 2
+# Ticks até uma nave destruída voltar, e ticks de proteção depois de entrar ou voltar
+RESPAWN_TICKS = 120
+SPAWN_PROTECTION_TICKS = 90
+# Snapshots guardados como base de deltas para clientes que ficaram para trás
+SNAPSHOT_HISTORY = 64
+# Com mais que isso esperando no buffer de envio, o cliente pula snapshots (recebe um delta maior depois)
+MAX_BUFFERED_BYTES = 256 * 1024
+# Segundos entre as linhas de métricas impressas pelo servidor (0 = nenhuma)
+DEFAULT_REPORT_INTERVAL = 5.0
+
+
+class Ship:
+    """Uma nave conectada: entrada própria (InputSystem), projéteis, pontuação e renascimento."""
+
+    def __init__(self, client_id, simulation, spawn_point):
+        self.client_id = client_id
+        self.spawn_point = spawn_point
+        self.input = InputSystem() # Mesma bufferização por tick do jogo local, sem thread
+        self.bullets_group = pygame.sprite.Group()
+        self.player = Player(simulation.all_sprites, self.bullets_group,
+                             simulation.SCREEN_WIDTH, simulation.SCREEN_HEIGHT,
+                             input_state_ref=self.input.input_state, input_lock_ref=self.input.input_lock)
+        self.player.rect.center = spawn_point
+        self.score = 0
+        self.deaths = 0
+        self.respawn_tick = None
+        self.protected_until = simulation.tick + SPAWN_PROTECTION_TICKS
+
+
+class MultiplayerSimulation:
+    """
+    Várias naves num único campo de asteroides, sem janela (como HeadlessSimulation).
+    Usa os mesmos asteroid_manager e collision_handler do jogo solo; cada nave tem
+    seus projéteis e sua pontuação. Uma nave atingida some por RESPAWN_TICKS ticks e
+    volta ao seu ponto de partida.
+    """
+
+    def __init__(self, seed=0, screen_size=HEADLESS_SCREEN_SIZE, asteroid_limit=MULTIPLAYER_ASTEROID_LIMIT):
+        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = screen_size
+        init_headless_display(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.population = AsteroidPopulation(asteroid_limit)
+        self.all_sprites = pygame.sprite.Group()
+        self.asteroids_group = pygame.sprite.Group()
+        self.ships = {}
+        self.tick = 0
+        # Ids de rede estáveis por objeto (instâncias reaproveitadas mantêm o id)
+        self._net_ids = weakref.WeakKeyDictionary()
+        self._next_net_id = 0
+        setup_initial_asteroids(self.all_sprites, self.asteroids_group, self.population,
+                                self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.rng)
+
+    def add_ship(self, client_id):
+        # Pontos de partida espalhados num círculo em volta do centro
+        angle = client_id * 2.399963 # Ângulo áureo, em radianos
+        radius = min(self.SCREEN_WIDTH, self.SCREEN_HEIGHT) * 0.25
+        spawn_point = (int(self.SCREEN_WIDTH / 2 + radius * math.cos(angle)),
+                       int(self.SCREEN_HEIGHT / 2 + radius * math.sin(angle)))
+        ship = Ship(client_id, self, spawn_point)
+        self.all_sprites.add(ship.player)
+        self.ships[client_id] = ship
+        return ship
+
+    def remove_ship(self, client_id):
+        ship = self.ships.pop(client_id, None)
+        if ship is not None:
+            ship.player.kill()
+            for bullet in ship.bullets_group.sprites():
+                bullet.kill()
+
+    def _respawn(self, ship):
+        player = ship.player
+        player.rect.center = ship.spawn_point
+        player.vx = player.vy = 0.0
+        player.angle = 0
+        self.all_sprites.add(player)
+        ship.respawn_tick = None
+        ship.protected_until = self.tick + SPAWN_PROTECTION_TICKS
+
+    def step(self):
+        """Avança um tick, na mesma ordem de HeadlessSimulation.step, para todas as naves."""
+        ships = self.ships.values()
+        for ship in ships:
+            ship.input.begin_tick()
+
+        self.all_sprites.update()
+
+        asteroids_group = self.asteroids_group
+        for ship in ships:
+            ship.score = handle_bullet_asteroid_collisions(ship.bullets_group, asteroids_group, ship.score)
+            player = ship.player
+            if player.alive():
+                if self.tick >= ship.protected_until and \
+                        handle_player_asteroid_collisions(player, asteroids_group, announce=False):
+                    player.kill()
+                    ship.deaths += 1
+                    ship.respawn_tick = self.tick + RESPAWN_TICKS
+            elif ship.respawn_tick is not None and self.tick >= ship.respawn_tick:
+                self._respawn(ship)
+
+        spawn_periodic_asteroids(self.all_sprites, asteroids_group, self.population,
+                                 self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.rng)
+        self.tick += 1
+
+    def net_id(self, entity):
+        entity_id = self._net_ids.get(entity)
+        if entity_id is None:
+            self._next_net_id += 1
+            entity_id = self._net_ids[entity] = self._next_net_id
+        return entity_id
+
+    def snapshot(self):
+        """Estado quantizado do mundo: id -> (tipo, valores) no formato de netcode.KIND_FIELDS."""
+        net_id = self.net_id
+        quantize_position = netcode.quantize_position
+        quantize_angle = netcode.quantize_angle
+        entities = {}
+        for ship in self.ships.values():
+            player = ship.player
+            x, y = quantize_position(player.rect.center)
+            flags = netcode.SHIP_ALIVE if player.alive() else 0
+            entities[net_id(player)] = (netcode.KIND_SHIP, (x, y, quantize_angle(player.angle), ship.score, flags))
+        for asteroid in self.asteroids_group:
+            x, y = quantize_position(asteroid.rect.center)
+            entities[net_id(asteroid)] = (netcode.KIND_ASTEROID,
+                                          (x, y, quantize_angle(asteroid.angle), SIZE_CODES[asteroid.size_type]))
+        for ship in self.ships.values():
+            for bullet in ship.bullets_group:
+                entities[net_id(bullet)] = (netcode.KIND_BULLET, quantize_position(bullet.rect.center))
+        return entities
+
+
+def _percentiles(values, fractions=(0.5, 0.95, 0.99)):
+    ordered = sorted(values)
+    if not ordered:
+        return [0.0 for _ in fractions]
+    last = len(ordered) - 1
+    return [ordered[min(last, int(round(fraction * last)))] for fraction in fractions]
+
+
+def _timing_summary(seconds):
+    p50, p95, p99 = _percentiles(seconds)
+    return {
+        'mean': round(sum(seconds) / len(seconds) * 1000, 4) if seconds else 0.0,
+        'p50': round(p50 * 1000, 4),
+        'p95': round(p95 * 1000, 4),
+        'p99': round(p99 * 1000, 4),
+        'max': round(max(seconds) * 1000, 4) if seconds else 0.0,
+    }
+
+
+class ServerMetrics:
+    """Tempo por tick (simulação e envio de snapshots), banda e snapshots do servidor."""
+
+    def __init__(self, tick_rate):
+        self.tick_rate = tick_rate
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.step_seconds = [] # Simulação de cada tick
+        self.send_seconds = [] # Codificação e envio dos snapshots (só nos ticks com snapshot)
+        self.busy_seconds = [] # Tudo o que o tick custou ao servidor
+        self.clients_peak = 0
+        self.dropped_ticks = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.inputs = 0
+        self.full_snapshots = 0
+        self.full_bytes = 0
+        self.delta_snapshots = 0
+        self.delta_bytes = 0
+        self.delta_full_bytes = 0 # O que os mesmos snapshots dos deltas custariam completos
+        self.skipped_snapshots = 0
+        self._report_from = 0
+
+    def record_tick(self, step_time, send_time, clients):
+        self.step_seconds.append(step_time)
+        if send_time:
+            self.send_seconds.append(send_time)
+        self.busy_seconds.append(step_time + send_time)
+        if clients > self.clients_peak:
+            self.clients_peak = clients
+
+    def record_snapshot(self, size, full, full_size=None):
+        if full:
+            self.full_snapshots += 1
+            self.full_bytes += size
+        else:
+            self.delta_snapshots += 1
+            self.delta_bytes += size
+            self.delta_full_bytes += full_size
+
+    def summary(self, clients=0):
+        elapsed = max(1e-9, time.perf_counter() - self.started)
+        busy = sum(self.busy_seconds)
+        client_seconds = max(1e-9, elapsed * max(1, self.clients_peak))
+        return {
+            'seconds': round(elapsed, 3),
+            'ticks': len(self.step_seconds),
+            'tick_rate': self.tick_rate,
+            'budget_ms': round(1000 / self.tick_rate, 4),
+            'clients': clients,
+            'clients_peak': self.clients_peak,
+            'step_ms': _timing_summary(self.step_seconds),
+            'snapshot_ms': _timing_summary(self.send_seconds),
+            'tick_ms': _timing_summary(self.busy_seconds),
+            'utilization': round(busy / elapsed, 4), # Fração de um núcleo ocupada pelos ticks
+            'dropped_ticks': self.dropped_ticks,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'out_kbytes_per_s': round(self.bytes_sent / elapsed / 1024, 2),
+            'out_bytes_per_client_per_s': round(self.bytes_sent / client_seconds, 1),
+            'inputs': self.inputs,
+            'snapshots': {
+                'full': self.full_snapshots,
+                'delta': self.delta_snapshots,
+                'skipped': self.skipped_snapshots,
+                'full_bytes_mean': round(self.full_bytes / self.full_snapshots, 1) if self.full_snapshots else 0.0,
+                'delta_bytes_mean': round(self.delta_bytes / self.delta_snapshots, 1) if self.delta_snapshots else 0.0,
+                # Tamanho completo / tamanho delta dos mesmos snapshots
+                'compression_ratio': round(self.delta_full_bytes / self.delta_bytes, 2) if self.delta_bytes else None,
+            },
+        }
+
+    def report_line(self, clients):
+        """Resumo dos ticks desde a última linha, para acompanhar o servidor rodando."""
+        recent = self.busy_seconds[self._report_from:]
+        self._report_from = len(self.busy_seconds)
+        p50, p95, _ = _percentiles(recent)
+        elapsed = max(1e-9, time.perf_counter() - self.started)
+        return (f"clientes={clients} ticks={len(recent)} tick p50={p50 * 1000:.2f}ms p95={p95 * 1000:.2f}ms "
+                f"saída={self.bytes_sent / elapsed / 1024:.1f} kB/s descartados={self.dropped_ticks}")
+
+
+class ClientConnection:
+    def __init__(self, client_id, ship, writer):
+        self.client_id = client_id
+        self.ship = ship
+        self.writer = writer
+        self.baseline_tick = None # Último snapshot enviado (base do próximo delta)
+
+
+class GameServer:
+    """
+    Servidor autoritativo com asyncio.
+    Os clientes mandam comandos (netcode.MSG_INPUT, os mesmos de input_queue), que
+    entram no InputSystem da sua nave; a simulação roda a tick_rate ticks por
+    segundo com passo fixo e, a cada snapshot_interval ticks, cada cliente recebe
+    o mundo quantizado como delta do último snapshot que lhe foi enviado (TCP
+    entrega em ordem, então a base sempre chegou antes). Clientes com o buffer de
+    envio cheio pulam snapshots; se a base sair do histórico, recebem um completo.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, seed=0, tick_rate=SIMULATION_HZ,
+                 snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL, asteroid_limit=MULTIPLAYER_ASTEROID_LIMIT,
+                 screen_size=HEADLESS_SCREEN_SIZE, report_interval=DEFAULT_REPORT_INTERVAL):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.report_interval = report_interval
+        self.simulation = MultiplayerSimulation(seed, screen_size, asteroid_limit)
+        self.clients = {}
+        self.history = OrderedDict() # tick -> snapshot quantizado
+        self.metrics = ServerMetrics(tick_rate)
+        self._next_client_id = 0
+        self._handlers = set()
+        self._server = None
+        self._stopping = False
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1] # Porta real, se port=0
+        return self.port
+
+    def stop(self):
+        self._stopping = True
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        for connection in list(self.clients.values()):
+            connection.writer.close()
+        # Espera as leituras dos clientes terminarem (fechar o socket as encerra)
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _serve_client(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        client_id = self._next_client_id
+        self._next_client_id += 1
+        simulation = self.simulation
+        ship = simulation.add_ship(client_id)
+        connection = ClientConnection(client_id, ship, writer)
+        self.clients[client_id] = connection
+        self._send(connection, netcode.frame(netcode.MSG_HELLO, netcode.HELLO.pack(
+            client_id, simulation.net_id(ship.player), self.tick_rate, self.snapshot_interval,
+            simulation.SCREEN_WIDTH, simulation.SCREEN_HEIGHT)))
+        try:
+            while True:
+                message_type, body = await netcode.read_frame(reader)
+                self.metrics.bytes_received += netcode.FRAME_HEADER.size + len(body)
+                if message_type == netcode.MSG_INPUT:
+                    command, key_state = netcode.unpack_input(body)
+                    ship.input.push(command, key_state)
+                    self.metrics.inputs += 1
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, IndexError, struct.error):
+            pass # Cliente saiu ou mandou uma mensagem inválida: desconecta
+        finally:
+            self.clients.pop(client_id, None)
+            simulation.remove_ship(client_id)
+            writer.close()
+            self._handlers.discard(handler)
+
+    def _send(self, connection, data):
+        if connection.writer.is_closing():
+            return
+        connection.writer.write(data)
+        self.metrics.bytes_sent += len(data)
+
+    def broadcast(self):
+        """Envia o snapshot do tick atual a todos os clientes (um delta codificado por base distinta)."""
+        tick = self.simulation.tick
+        entities = self.simulation.snapshot()
+        history = self.history
+        history[tick] = entities
+        while len(history) > SNAPSHOT_HISTORY:
+            history.popitem(last=False)
+        encoded = {}
+        full_size = None
+        metrics = self.metrics
+        for connection in list(self.clients.values()):
+            if connection.writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                metrics.skipped_snapshots += 1
+                continue
+            baseline_tick = connection.baseline_tick
+            if baseline_tick not in history:
+                baseline_tick = None
+            payload = encoded.get(baseline_tick)
+            if payload is None:
+                if baseline_tick is None:
+                    body = netcode.encode_snapshot(tick, entities)
+                else:
+                    body = netcode.encode_snapshot(tick, entities, history[baseline_tick], baseline_tick)
+                payload = encoded[baseline_tick] = netcode.frame(netcode.MSG_SNAPSHOT, body)
+            self._send(connection, payload)
+            connection.baseline_tick = tick
+            if baseline_tick is not None and full_size is None:
+                full_size = netcode.FRAME_HEADER.size + netcode.full_snapshot_size(entities)
+            metrics.record_snapshot(len(payload), baseline_tick is None, full_size)
+
+    async def run(self, duration=None, expect_clients=0):
+        """
+        Loop de ticks com passo fixo. Com expect_clients, as métricas (e a contagem de
+        'duration' segundos) só começam quando esse número de clientes estiver conectado.
+        """
+        loop = asyncio.get_running_loop()
+        timestep = FixedTimestep(self.tick_rate)
+        metrics = self.metrics
+        measuring = expect_clients <= 0
+        started = last = loop.time()
+        next_report = started + self.report_interval
+        while not self._stopping:
+            now = loop.time()
+            if not measuring and len(self.clients) >= expect_clients:
+                measuring = True
+                metrics.reset()
+                started = now
+                next_report = now + self.report_interval
+            if duration is not None and measuring and now - started >= duration:
+                break
+
+            dropped_before = timestep.dropped_steps
+            steps = timestep.advance(now - last)
+            last = now
+            metrics.dropped_ticks += timestep.dropped_steps - dropped_before
+            for _ in range(steps):
+                start = time.perf_counter()
+                self.simulation.step()
+                step_time = time.perf_counter() - start
+                send_time = 0.0
+                if self.simulation.tick % self.snapshot_interval == 0:
+                    start = time.perf_counter()
+                    self.broadcast()
+                    send_time = time.perf_counter() - start
+                metrics.record_tick(step_time, send_time, len(self.clients))
+
+            if self.report_interval and now >= next_report:
+                print(metrics.report_line(len(self.clients)), flush=True)
+                next_report += self.report_interval
+            # Dorme até o próximo tick (a leitura dos clientes roda enquanto isso)
+            await asyncio.sleep(max(0.0, timestep.dt - timestep.accumulator))
+
+
+# --- Clientes simulados ---
+
+class BotClient:
+    """
+    Cliente simulado para testes de carga em localhost: aperta e solta teclas ao
+    acaso (mesmos comandos de input_queue) e mantém a réplica do mundo aplicando
+    cada snapshot recebido (um delta fora de ordem conta como erro).
+    """
+
+    def __init__(self, seed, host=DEFAULT_HOST, port=DEFAULT_PORT, input_interval=0.2):
+        self.rng = random.Random(seed)
+        self.host = host
+        self.port = port
+        self.input_interval = input_interval
+        self.decoder = netcode.SnapshotDecoder()
+        self.client_id = None
+        self.ship_id = None
+        self.bytes_received = 0
+        self.inputs_sent = 0
+        self.errors = 0
+
+    async def run(self, duration=None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sender = None
+        try:
+            message_type, body = await netcode.read_frame(reader)
+            if message_type != netcode.MSG_HELLO:
+                raise ValueError("o servidor não começou com HELLO")
+            self.client_id, self.ship_id = netcode.HELLO.unpack(body)[:2]
+            sender = asyncio.create_task(self._send_inputs(writer))
+            if duration is None:
+                await self._receive(reader)
+            else:
+                await asyncio.wait_for(self._receive(reader), duration)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.TimeoutError):
+            pass # Fim do teste ou servidor encerrado
+        except (ValueError, struct.error):
+            self.errors += 1
+        finally:
+            if sender is not None:
+                sender.cancel()
+            writer.close()
+
+    async def _receive(self, reader):
+        while True:
+            message_type, body = await netcode.read_frame(reader)
+            self.bytes_received += netcode.FRAME_HEADER.size + len(body)
+            if message_type == netcode.MSG_SNAPSHOT:
+                self.decoder.apply(body)
+
+    async def _send_inputs(self, writer):
+        rng = self.rng
+        held = dict.fromkeys(netcode.COMMANDS, False)
+        while not writer.is_closing():
+            await asyncio.sleep(self.input_interval * rng.uniform(0.5, 1.5))
+            command = rng.choice(netcode.COMMANDS)
+            if command == 'shoot_request':
+                key_state = True # Evento único, sem KEYUP (como em InputSystem.handle_event)
+            else:
+                key_state = held[command] = not held[command]
+            writer.write(netcode.pack_input(command, key_state))
+            self.inputs_sent += 1
+
+
+def bots_summary(bots):
+    count = max(1, len(bots))
+    return {
+        'bots': len(bots),
+        'connected': sum(bot.client_id is not None for bot in bots),
+        'snapshots_mean': round(sum(bot.decoder.snapshots for bot in bots) / count, 1),
+        'full_snapshots': sum(bot.decoder.full_snapshots for bot in bots),
+        'bytes_received_mean': round(sum(bot.bytes_received for bot in bots) / count, 1),
+        'inputs_sent': sum(bot.inputs_sent for bot in bots),
+        'errors': sum(bot.errors for bot in bots),
+    }
+
+
+async def run_bots(count, host, port, duration=None, seed=0, input_interval=0.2):
+    bots = [BotClient(seed * 100003 + index, host, port, input_interval) for index in range(count)]
+    await asyncio.gather(*(bot.run(duration) for bot in bots))
+    return bots
+
+
+async def serve(args):
+    server = GameServer(args.host, args.port, seed=args.seed, tick_rate=args.tick_rate,
+                        snapshot_interval=args.snapshot_interval, asteroid_limit=args.asteroid_limit,
+                        report_interval=args.report_interval)
+    port = await server.start()
+    print(f"Servidor ouvindo em {args.host}:{port}", flush=True)
+    bots_task = None
+    if args.bots:
+        # Bots no mesmo processo: prático para testar, mas dividem o núcleo com o servidor
+        bots_task = asyncio.ensure_future(run_bots(args.bots, args.host, port, seed=args.seed,
+                                                   input_interval=args.input_interval))
+    expect_clients = args.expect_clients if args.expect_clients is not None else args.bots
+    try:
+        await server.run(args.duration, expect_clients)
+    finally:
+        await server.close()
+    summary = {'server': server.metrics.summary(len(server.clients))}
+    if bots_task is not None:
+        summary['bots'] = bots_summary(await bots_task)
+    return summary
+
+
+def _parse_address(text):
+    host, _, port = text.rpartition(':')
+    return host or DEFAULT_HOST, int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor multijogador de Asteroides (asyncio) e bots de carga.")
+    parser.add_argument('--server', action='store_true', help="Aceito para compatibilidade com asteroids.py")
+    parser.add_argument('--connect', help="Só bots: conecta em HOST:PORTA em vez de abrir um servidor")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Porta do servidor (0 = qualquer livre)")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do gerador aleatório")
+    parser.add_argument('--tick-rate', type=int, default=SIMULATION_HZ, help="Ticks de simulação por segundo")
+    parser.add_argument('--snapshot-interval', type=int, default=DEFAULT_SNAPSHOT_INTERVAL,
+                        help="Ticks entre snapshots enviados")
+    parser.add_argument('--asteroid-limit', type=int, default=MULTIPLAYER_ASTEROID_LIMIT)
+    parser.add_argument('--duration', type=float, help="Segundos de execução (sem limite por padrão)")
+    parser.add_argument('--bots', type=int, default=0, help="Clientes simulados")
+    parser.add_argument('--input-interval', type=float, default=0.2, help="Segundos médios entre comandos de um bot")
+    parser.add_argument('--expect-clients', type=int, help="Métricas só começam com este número de clientes")
+    parser.add_argument('--report-interval', type=float, default=DEFAULT_REPORT_INTERVAL)
+    parser.add_argument('--cpu', type=int, help="Fixa o processo neste núcleo (Linux)")
+    parser.add_argument('--metrics-output', help="Arquivo JSON com as métricas finais")
+    args = parser.parse_args(argv)
+
+    if args.cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {args.cpu})
+    try:
+        if args.connect:
+            host, port = _parse_address(args.connect)
+            bots = asyncio.run(run_bots(args.bots or 1, host, port, args.duration, args.seed, args.input_interval))
+            summary = {'bots': bots_summary(bots)}
+        else:
+            summary = asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+    for name, values in summary.items():
+        print(f"{name}: {values}")
+    if args.metrics_output:
+        with open(args.metrics_output, 'w') as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+class SlotSprite:
+    """
+    Sprite sem __dict__ para entidades numerosas (asteroides e projéteis).
+    pygame.sprite.Sprite não declara __slots__, então toda subclasse dele tem um __dict__
+    por instância, mesmo declarando os próprios __slots__. Esta classe implementa o mesmo
+    protocolo que os grupos do Pygame usam (add_internal, remove_internal, kill, alive,
+    groups, update) com os grupos numa tupla em __slots__; as subclasses declaram os demais
+    atributos em __slots__. Group.add/remove aceitam esses objetos pelo caminho de sprites
+    que não herdam de Sprite, e as funções de colisão só usam rect, radius e mask/image.
+    """
+    __slots__ = ('_groups',)
+
+    def __init__(self, *groups):
+        self._groups = ()
+        if groups:
+            self.add(*groups)
+
+    def add(self, *groups):
+        for group in groups:
+            if group not in self._groups:
+                group.add_internal(self)
+                self.add_internal(group)
+
+    def remove(self, *groups):
+        for group in groups:
+            if group in self._groups:
+                group.remove_internal(self)
+                self.remove_internal(group)
+
+    def add_internal(self, group):
+        self._groups += (group,)
+
+    def remove_internal(self, group):
+        self._groups = tuple(other for other in self._groups if other is not group)
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def kill(self):
+        for group in self._groups:
+            group.remove_internal(self)
+        self._groups = ()
+
+    def groups(self):
+        return list(self._groups)
+
+    def alive(self):
+        return bool(self._groups)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} SlotSprite(em {len(self._groups)} grupos)>"
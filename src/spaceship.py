@@ -1,22 +1,29 @@
 import pygame
 import math
-from src.input_handler import input_lock, shared_input_state
-from src.bullet import Bullet
+from contextlib import nullcontext
+from src.input_handler import shared_input_state
+from src.bullet import BulletPool
+from src.assets import get_assets
+from src.sprite_cache import MaskCache
+from src.telemetry import get_telemetry
 
 # Cores (definidas localmente ou importadas se forem globais)
 WHITE = (255, 255, 255)
 
+# Máscaras de colisão da nave por (imagem original, ângulo), compartilhadas por todas as naves do processo
+_ship_masks = MaskCache()
+
 class Player(pygame.sprite.Sprite):
-    def __init__(self, all_sprites_ref, bullets_group_ref, screen_width, screen_height):
+    def __init__(self, all_sprites_ref, bullets_group_ref, screen_width, screen_height, input_state_ref=shared_input_state, input_lock_ref=None, bullet_pool=None):
         super().__init__()
         self.SCREEN_WIDTH = screen_width
         self.SCREEN_HEIGHT = screen_height
         try:
-            loaded_image = pygame.image.load('static/images/spaceship.png').convert_alpha()
             desired_width = 65 # Tamanho aumentado
             desired_height = 78 # Tamanho aumentado
-            self.original_image = pygame.transform.scale(loaded_image, (desired_width, desired_height))
-        except pygame.error as e:
+            # Já redimensionada, do cache em disco quando possível (src/assets.py)
+            self.original_image = get_assets().scaled('spaceship.png', (desired_width, desired_height))
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Erro ao carregar imagem do jogador: {e}. Usando forma alternativa.")
             self.original_image = pygame.Surface([52, 65], pygame.SRCALPHA) # Tamanho alternativo ajustado
             pygame.draw.polygon(self.original_image, WHITE, [(26, 0), (0, 65), (52, 65)]) # Forma alternativa ajustada
@@ -37,16 +44,25 @@ class Player(pygame.sprite.Sprite):
 
         self.all_sprites_ref = all_sprites_ref
         self.bullets_group_ref = bullets_group_ref
+        # Estado de entrada lido a cada quadro (o compartilhado com a thread de entrada por padrão)
+        self.input_state_ref = input_state_ref
+        # Sem lock, a nave não cria o da entrada com thread (init_threaded_input): quem usa esse
+        # caminho passa o próprio lock; os demais leem a entrada na mesma thread
+        self.input_lock_ref = input_lock_ref if input_lock_ref is not None else nullcontext()
+        # Projéteis reutilizáveis, com direções pré-calculadas para cada passo de rotação
+        self.bullet_pool = bullet_pool if bullet_pool is not None else BulletPool(
+            self.SCREEN_WIDTH, self.SCREEN_HEIGHT, angle_step=self.rotation_speed)
 
     def update(self):
         # Lê o estado de entrada compartilhado
-        with input_lock:
-            is_rotating_left = shared_input_state['rotate_left']
-            is_rotating_right = shared_input_state['rotate_right']
-            is_thrusting = shared_input_state['thrust_on']
-            wants_to_shoot = shared_input_state['shoot_request']
+        input_state = self.input_state_ref
+        with self.input_lock_ref:
+            is_rotating_left = input_state['rotate_left']
+            is_rotating_right = input_state['rotate_right']
+            is_thrusting = input_state['thrust_on']
+            wants_to_shoot = input_state['shoot_request']
             if wants_to_shoot:
-                shared_input_state['shoot_request'] = False # Reseta a solicitação
+                input_state['shoot_request'] = False # Reseta a solicitação
         
         # Rotação
         if is_rotating_left:
@@ -71,6 +87,9 @@ class Player(pygame.sprite.Sprite):
             if bullet:
                 self.all_sprites_ref.add(bullet)
                 self.bullets_group_ref.add(bullet)
+                telemetry = get_telemetry()
+                if telemetry is not None:
+                    telemetry.shot()
             
         # Aplica arrasto
         self.vx *= self.drag
@@ -97,12 +116,17 @@ class Player(pygame.sprite.Sprite):
         if self.rect.bottom < 0:
             self.rect.top = self.SCREEN_HEIGHT
 
+    @property
+    def mask(self):
+        """Máscara de colisão da imagem rotacionada atual, em cache por ângulo (usada por collide_mask)."""
+        return _ship_masks.get((self.original_image, self.angle), self.image)
+
     def shoot(self):
-        angle_rad = math.radians(self.angle)
+        dx, dy = self.bullet_pool.direction(self.angle)
         ship_length = self.original_image.get_height() / 2
-        start_x = self.rect.centerx + ship_length * math.sin(-angle_rad)
-        start_y = self.rect.centery + ship_length * -math.cos(-angle_rad)
+        start_x = self.rect.centerx + ship_length * dx
+        start_y = self.rect.centery + ship_length * dy
         
-        # Passa as dimensões da tela para o construtor do Projétil
-        bullet = Bullet(start_x, start_y, self.angle, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+        # Reutiliza um projétil do pool em vez de alocar um novo
+        bullet = self.bullet_pool.acquire(start_x, start_y, self.angle)
         return bullet
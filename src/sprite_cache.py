@@ -0,0 +1,197 @@
+import pygame
+from collections import OrderedDict
+
+# Resolução angular padrão (graus por quadro de rotação pré-renderizado)
+DEFAULT_ANGLE_RESOLUTION = 3
+# Limite padrão de memória do cache (em bytes de pixels)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Limite padrão de máscaras em um MaskCache (a nave usa uma por ângulo: 80 com passos de 4,5°)
+DEFAULT_MAX_MASKS = 720
+
+
+class RotationFrame:
+    """
+    Um quadro de rotação pré-renderizado.
+    Guarda a superfície rotacionada e o deslocamento do centro até o canto
+    superior esquerdo, para que o rect seja posicionado sem recalcular.
+    A máscara de colisão do quadro é calculada na primeira colisão que precisar
+    dela e fica junto do quadro (sai do cache com ele).
+    """
+    __slots__ = ('image', 'offset_x', 'offset_y', 'nbytes', 'mask')
+
+    def __init__(self, image):
+        self.image = image
+        width, height = image.get_size()
+        self.offset_x = width // 2
+        self.offset_y = height // 2
+        self.nbytes = width * height * image.get_bytesize()
+        self.mask = None
+
+    def get_mask(self):
+        if self.mask is None:
+            self.mask = pygame.mask.from_surface(self.image)
+        return self.mask
+
+    def rect_at(self, center):
+        # Equivalente a image.get_rect(center=center), sem criar o rect intermediário
+        return pygame.Rect(int(center[0]) - self.offset_x, int(center[1]) - self.offset_y,
+                           self.image.get_width(), self.image.get_height())
+
+
+class RotationFrameCache:
+    """
+    Cache de quadros de rotação compartilhado pelo processo.
+    As chaves são (classe, índice do ângulo quantizado). A imagem base de cada
+    classe é obtida uma única vez através de base_image_factory(classe).
+    Quando o total de bytes passa de max_bytes, os quadros usados há mais tempo
+    são descartados (LRU).
+    Se sheet_factory(classe, quadros por volta) for dado, na primeira falta de uma
+    classe todos os seus quadros vêm prontos dessa folha (ex: do cache em disco de
+    src/assets.py); retornar None volta a rotacionar a imagem base.
+    """
+
+    def __init__(self, base_image_factory, angle_resolution=DEFAULT_ANGLE_RESOLUTION, max_bytes=DEFAULT_MAX_BYTES,
+                 sheet_factory=None):
+        if angle_resolution <= 0:
+            raise ValueError("angle_resolution deve ser positivo")
+        self.base_image_factory = base_image_factory
+        self.sheet_factory = sheet_factory
+        self._sheets_loaded = set()
+        self.angle_resolution = angle_resolution
+        self.frames_per_turn = max(1, int(round(360 / angle_resolution)))
+        self.max_bytes = max_bytes
+        self._base_images = {}
+        self._base_masks = {}
+        self._frames = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def base_image(self, key):
+        image = self._base_images.get(key)
+        if image is None:
+            image = self.base_image_factory(key)
+            self._base_images[key] = image
+        return image
+
+    def base_mask(self, key):
+        """Máscara de colisão da imagem base (sem rotação) da classe."""
+        mask = self._base_masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.base_image(key))
+            self._base_masks[key] = mask
+        return mask
+
+    def quantize(self, angle):
+        """Converte um ângulo em graus para o índice do quadro mais próximo."""
+        return int(round((angle % 360) / (360 / self.frames_per_turn))) % self.frames_per_turn
+
+    def get(self, key, angle, stride=1):
+        """
+        Retorna o RotationFrame para a classe e ângulo dados, renderizando se necessário.
+        Com stride > 1 só um a cada 'stride' quadros é usado (passo angular mais grosso).
+        """
+        index = self.quantize(angle)
+        if stride > 1:
+            index -= index % stride
+        return self.get_frame(key, index)
+
+    def get_frame(self, key, index):
+        """Retorna o quadro pelo índice já quantizado (útil quando os índices são calculados em lote)."""
+        cache_key = (key, index)
+        frame = self._frames.get(cache_key)
+        if frame is not None:
+            self._frames.move_to_end(cache_key)
+            self.hits += 1
+            return frame
+        self.misses += 1
+        if self.sheet_factory is not None and key not in self._sheets_loaded:
+            self._load_sheet(key)
+            frame = self._frames.get(cache_key)
+            if frame is not None:
+                return frame
+        return self._render(cache_key)
+
+    def prerender(self, key):
+        """Pré-renderiza todos os quadros de rotação de uma classe."""
+        if self.sheet_factory is not None and key not in self._sheets_loaded:
+            self._load_sheet(key)
+        for index in range(self.frames_per_turn):
+            cache_key = (key, index)
+            if cache_key not in self._frames:
+                self._render(cache_key)
+
+    def clear(self):
+        self._frames.clear()
+        self._base_images.clear()
+        self._base_masks.clear()
+        self._sheets_loaded.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        return {
+            'frames': len(self._frames),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _load_sheet(self, key):
+        self._sheets_loaded.add(key)
+        images = self.sheet_factory(key, self.frames_per_turn)
+        if images is None or len(images) != self.frames_per_turn:
+            return
+        for index, image in enumerate(images):
+            if (key, index) not in self._frames:
+                self._insert((key, index), RotationFrame(image))
+
+    def _render(self, cache_key):
+        key, index = cache_key
+        angle = index * (360 / self.frames_per_turn)
+        return self._insert(cache_key, RotationFrame(pygame.transform.rotate(self.base_image(key), angle)))
+
+    def _insert(self, cache_key, frame):
+        self._frames[cache_key] = frame
+        self.total_bytes += frame.nbytes
+        # Descarta os quadros menos usados recentemente até caber no limite
+        while self.total_bytes > self.max_bytes and len(self._frames) > 1:
+            _, evicted = self._frames.popitem(last=False)
+            self.total_bytes -= evicted.nbytes
+            self.evictions += 1
+        return frame
+
+
+class MaskCache:
+    """
+    Máscaras de colisão por chave (ex: (imagem original, ângulo)), para sprites que não
+    usam RotationFrameCache. A máscara é calculada da imagem dada na primeira vez que a
+    chave aparece; acima de max_entries as menos usadas recentemente são descartadas.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_MASKS):
+        self.max_entries = max_entries
+        self._masks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, image):
+        mask = self._masks.get(key)
+        if mask is not None:
+            self._masks.move_to_end(key)
+            self.hits += 1
+            return mask
+        self.misses += 1
+        mask = pygame.mask.from_surface(image)
+        self._masks[key] = mask
+        if len(self._masks) > self.max_entries:
+            self._masks.popitem(last=False)
+        return mask
+
+    def clear(self):
+        self._masks.clear()
+
+    def stats(self):
+        return {'masks': len(self._masks), 'hits': self.hits, 'misses': self.misses}
+
@@ -0,0 +1,362 @@
+import os
+import sys
+import glob
+import json
+import time
+import random
+import hashlib
+import argparse
+import itertools
+import multiprocessing
+from contextlib import contextmanager
+import numpy as np
+from src import asteroid_manager, game_entities
+from src.headless import HeadlessSimulation, ScriptedInput, HEADLESS_ASTEROID_LIMIT
+from src.collision_handler import PRECISE_PLAYER_COLLISIONS
+from src.timestep import SIMULATION_HZ
+
+# Parâmetros que podem ser variados numa varredura, com o tipo de cada valor.
+# As escalas multiplicam os valores de ASTEROID_SIZES (velocidade e raio de colisão) de todas as classes.
+# O raio só decide as colisões da nave no modo por círculos: varrer asteroid_radius_scale usa esse modo.
+SWEEP_PARAMETERS = {
+    'asteroid_budget': int,
+    'spawn_interval': float, # asteroid_manager.ASTEROID_SPAWN_INTERVAL, em segundos
+    'asteroid_speed_scale': float,
+    'asteroid_radius_scale': float,
+    'thrust_power': float, # Player.thrust_power
+    'drag': float, # Player.drag
+    'shoot_delay': int, # Player.shoot_delay (ms): cadência de tiro do piloto aleatório
+}
+PILOTS = ('idle', 'random', 'script')
+# Colunas de cada jogo no arquivo de resultados (além dos parâmetros)
+RESULT_COLUMNS = ('key', 'pilot', 'seed', 'collision_mode', 'survival_ticks', 'game_over', 'score', 'final_asteroids',
+                  'mean_asteroids', 'peak_asteroids', 'peak_bullets', 'shots', 'ms_per_tick')
+DEFAULT_TICKS = 3600
+# Jogos acumulados antes de gravar uma parte do arquivo de resultados
+DEFAULT_FLUSH_EVERY = 256
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RandomPilot:
+    """
+    Piloto aleatório com semente própria: de vez em quando aperta ou solta cada tecla
+    de movimento e atira no máximo a cada shoot_delay milissegundos de simulação.
+    """
+
+    def __init__(self, seed, shoot_delay_ms, toggle_chance=0.05, shoot_chance=0.7):
+        self.rng = random.Random(seed)
+        self.shoot_every = max(1, round(shoot_delay_ms * SIMULATION_HZ / 1000))
+        self.toggle_chance = toggle_chance
+        self.shoot_chance = shoot_chance
+        self.shots = 0
+
+    def apply(self, tick, input_state):
+        rng = self.rng
+        for command in ('rotate_left', 'rotate_right', 'thrust_on'):
+            if rng.random() < self.toggle_chance:
+                input_state[command] = not input_state[command]
+        if tick % self.shoot_every == 0 and rng.random() < self.shoot_chance:
+            input_state['shoot_request'] = True
+            self.shots += 1
+
+
+class CountingInput:
+    """Repassa a entrada de outra fonte (roteiro ou nenhuma) contando os disparos."""
+
+    def __init__(self, source):
+        self.source = source
+        self.shots = 0
+
+    def apply(self, tick, input_state):
+        self.source.apply(tick, input_state)
+        if input_state['shoot_request']:
+            self.shots += 1
+
+
+@contextmanager
+def tuned_globals(params):
+    """Aplica os parâmetros globais (ASTEROID_SIZES, intervalo de geração) e os restaura na saída."""
+    sizes = game_entities.ASTEROID_SIZES
+    saved_sizes = {size_type: dict(properties) for size_type, properties in sizes.items()}
+    saved_interval = asteroid_manager.ASTEROID_SPAWN_INTERVAL
+    try:
+        for properties in sizes.values():
+            properties['speed_multiplier'] *= params.get('asteroid_speed_scale', 1.0)
+            properties['radius'] *= params.get('asteroid_radius_scale', 1.0)
+        if 'spawn_interval' in params:
+            asteroid_manager.ASTEROID_SPAWN_INTERVAL = params['spawn_interval']
+        yield
+    finally:
+        for size_type, properties in saved_sizes.items():
+            sizes[size_type].update(properties)
+        asteroid_manager.ASTEROID_SPAWN_INTERVAL = saved_interval
+
+
+def collision_mode(params):
+    """
+    Modo de colisão da nave no jogo: 'circle' quando o raio de colisão é um parâmetro da
+    varredura (com máscaras ele não mudaria nada), senão o padrão do jogo.
+    """
+    if 'asteroid_radius_scale' in params or not PRECISE_PLAYER_COLLISIONS:
+        return 'circle'
+    return 'mask'
+
+
+def make_job(params, seed, pilot, ticks, script=None, asteroid_field=False):
+    """Descrição de um jogo; 'key' identifica o jogo entre execuções (usado para retomar)."""
+    mode = collision_mode(params)
+    identity = json.dumps([sorted(params.items()), seed, pilot, ticks, script, asteroid_field, mode])
+    return {
+        'key': hashlib.sha1(identity.encode()).hexdigest()[:16],
+        'params': params,
+        'seed': seed,
+        'pilot': pilot,
+        'ticks': ticks,
+        'script': script,
+        'asteroid_field': asteroid_field,
+        'collision_mode': mode,
+    }
+
+
+def expand_grid(grid, seeds, pilots, ticks, script=None, asteroid_field=False):
+    """Produto cartesiano da grade de parâmetros × sementes × pilotos."""
+    names = sorted(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        for pilot in pilots:
+            for seed in seeds:
+                jobs.append(make_job(params, seed, pilot, ticks, script, asteroid_field))
+    return jobs
+
+
+def run_job(job):
+    """Executa um jogo sem janela e retorna uma linha de resultados."""
+    params = job['params']
+    with tuned_globals(params):
+        if job['pilot'] == 'random':
+            input_source = RandomPilot(job['seed'] ^ 0x5EED, params.get('shoot_delay', 250))
+        elif job['pilot'] == 'script':
+            input_source = CountingInput(ScriptedInput.from_file(job['script']))
+        else:
+            input_source = CountingInput(ScriptedInput())
+        simulation = HeadlessSimulation(seed=job['seed'], input_source=input_source,
+                                        asteroid_limit=params.get('asteroid_budget', HEADLESS_ASTEROID_LIMIT),
+                                        use_asteroid_field=job['asteroid_field'],
+                                        precise_collisions=job['collision_mode'] == 'mask')
+        player = simulation.player
+        for name in ('thrust_power', 'drag', 'shoot_delay'):
+            if name in params:
+                setattr(player, name, params[name])
+
+        asteroids_group = simulation.asteroids_group
+        bullets_group = simulation.bullets_group
+        asteroid_total = peak_asteroids = peak_bullets = 0
+        start = time.perf_counter()
+        for _ in range(job['ticks']):
+            if not simulation.step():
+                break
+            asteroid_count = len(asteroids_group)
+            asteroid_total += asteroid_count
+            if asteroid_count > peak_asteroids:
+                peak_asteroids = asteroid_count
+            if len(bullets_group) > peak_bullets:
+                peak_bullets = len(bullets_group)
+        elapsed = time.perf_counter() - start
+
+        row = {
+            'key': job['key'],
+            'pilot': job['pilot'],
+            'seed': job['seed'],
+            'collision_mode': job['collision_mode'],
+            'survival_ticks': simulation.tick,
+            'game_over': simulation.game_over,
+            'score': simulation.score,
+            'final_asteroids': len(asteroids_group),
+            'mean_asteroids': asteroid_total / simulation.tick if simulation.tick else 0.0,
+            'peak_asteroids': peak_asteroids,
+            'peak_bullets': peak_bullets,
+            'shots': input_source.shots,
+            'ms_per_tick': elapsed * 1000 / simulation.tick if simulation.tick else 0.0,
+        }
+        # Valores efetivos de todos os parâmetros, inclusive os que não foram variados
+        row['asteroid_budget'] = simulation.population.total_budget
+        row['spawn_interval'] = asteroid_manager.ASTEROID_SPAWN_INTERVAL
+        row['asteroid_speed_scale'] = params.get('asteroid_speed_scale', 1.0)
+        row['asteroid_radius_scale'] = params.get('asteroid_radius_scale', 1.0)
+        row['thrust_power'] = player.thrust_power
+        row['drag'] = player.drag
+        row['shoot_delay'] = player.shoot_delay
+    return row
+
+
+class ColumnarResults:
+    """
+    Resultados em formato colunar: um diretório de partes .npz, cada uma com um array
+    por coluna. Cada parte é gravada num arquivo temporário e renomeada, então uma
+    interrupção perde no máximo os jogos ainda não gravados.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def parts(self):
+        return sorted(glob.glob(os.path.join(self.path, 'part-*.npz')))
+
+    def completed_keys(self):
+        keys = set()
+        for part in self.parts():
+            with np.load(part) as columns:
+                keys.update(columns['key'].tolist())
+        return keys
+
+    def append(self, rows):
+        if not rows:
+            return
+        columns = {name: np.array([row[name] for row in rows]) for name in rows[0]}
+        part = os.path.join(self.path, f'part-{len(self.parts()):05d}.npz')
+        temporary = part + '.tmp'
+        with open(temporary, 'wb') as part_file:
+            np.savez(part_file, **columns)
+        os.replace(temporary, part)
+
+    def load(self):
+        """Todas as partes concatenadas: dict coluna -> array."""
+        loaded = {}
+        for part in self.parts():
+            with np.load(part) as columns:
+                for name in columns.files:
+                    loaded.setdefault(name, []).append(columns[name])
+        return {name: np.concatenate(arrays) for name, arrays in loaded.items()}
+
+
+def summarize(columns, names):
+    """Médias por combinação de parâmetros e piloto, a partir das colunas carregadas."""
+    if not columns:
+        return []
+    groups = {}
+    group_names = list(names) + ['pilot']
+    if 'collision_mode' in columns:
+        group_names.append('collision_mode')
+    for index in range(len(columns['key'])):
+        group = tuple(columns[name][index].item() for name in group_names)
+        groups.setdefault(group, []).append(index)
+    summary = []
+    for group, indices in sorted(groups.items()):
+        entry = dict(zip(group_names, group))
+        entry['games'] = len(indices)
+        for column in ('survival_ticks', 'score', 'mean_asteroids', 'ms_per_tick'):
+            entry[column] = float(np.mean(columns[column][indices]))
+        entry['game_over_rate'] = float(np.mean(columns['game_over'][indices]))
+        summary.append(entry)
+    return summary
+
+
+def _init_worker():
+    # As imagens são carregadas por caminho relativo à raiz do projeto
+    os.chdir(REPO_ROOT)
+    # Sem isto o SDL captura SIGTERM e Pool.terminate() não encerra os processos
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    # Silencia as mensagens por jogo (ex: GAME OVER) dos processos de trabalho
+    sys.stdout = open(os.devnull, 'w')
+
+
+def run_sweep(jobs, output, workers=None, flush_every=DEFAULT_FLUSH_EVERY, progress=print):
+    """
+    Executa os jogos ainda não presentes em 'output' num pool de processos.
+    Os resultados chegam conforme terminam e são gravados a cada flush_every jogos.
+    Retorna o número de jogos executados nesta chamada.
+    """
+    results = ColumnarResults(output)
+    done = results.completed_keys()
+    pending = [job for job in jobs if job['key'] not in done]
+    if done:
+        progress(f"retomando: {len(jobs) - len(pending)} de {len(jobs)} jogos já estão em {output}")
+    if not pending:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(pending) // (workers * 8))
+    buffer = []
+    finished = 0
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers, initializer=_init_worker)
+    try:
+        for row in pool.imap_unordered(run_job, pending, chunksize):
+            buffer.append(row)
+            finished += 1
+            if len(buffer) >= flush_every:
+                results.append(buffer)
+                buffer = []
+                elapsed = time.perf_counter() - start
+                progress(f"{finished}/{len(pending)} jogos ({finished / elapsed:.1f} jogos/s)")
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        # Também em caso de interrupção: o que já terminou não precisa ser refeito
+        results.append(buffer)
+        pool.join()
+    return finished
+
+
+def parse_param(text):
+    """'nome=v1,v2,...' -> (nome, [valores convertidos])."""
+    name, _, values = text.partition('=')
+    if name not in SWEEP_PARAMETERS or not values:
+        raise argparse.ArgumentTypeError(f"parâmetro inválido: {text} (válidos: {', '.join(SWEEP_PARAMETERS)})")
+    convert = SWEEP_PARAMETERS[name]
+    return name, [convert(value) for value in values.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros com jogos sem janela num pool de processos.")
+    parser.add_argument('--sweep', action='store_true', help="Aceito para compatibilidade com asteroids.py")
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help="Parâmetro e valores, ex: thrust_power=0.2,0.25,0.3 (repetível)")
+    parser.add_argument('--spec', help="Arquivo JSON com {\"grid\": {...}, \"seeds\": N, \"pilots\": [...], \"ticks\": N}")
+    parser.add_argument('--seeds', type=int, default=10, help="Sementes por combinação")
+    parser.add_argument('--pilots', default='random', help=f"Pilotos separados por vírgula ({', '.join(PILOTS)})")
+    parser.add_argument('--script', help="Roteiro JSON do piloto 'script'")
+    parser.add_argument('--ticks', type=int, default=DEFAULT_TICKS, help="Ticks máximos por jogo")
+    parser.add_argument('--asteroid-field', action='store_true', help="Usa o motor vetorizado AsteroidField")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: número de CPUs)")
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY)
+    parser.add_argument('--output', required=True, help="Diretório de resultados (colunar; retomado se já existir)")
+    args = parser.parse_args(argv)
+
+    grid = dict(args.param)
+    seeds, pilots, ticks = args.seeds, args.pilots.split(','), args.ticks
+    if args.spec:
+        with open(args.spec) as spec_file:
+            spec = json.load(spec_file)
+        grid.update({name: [SWEEP_PARAMETERS[name](value) for value in values] for name, values in spec.get('grid', {}).items()})
+        seeds = spec.get('seeds', seeds)
+        pilots = spec.get('pilots', pilots)
+        ticks = spec.get('ticks', ticks)
+    seeds = list(range(seeds)) if isinstance(seeds, int) else seeds
+    for pilot in pilots:
+        if pilot not in PILOTS:
+            parser.error(f"piloto inválido: {pilot}")
+    if 'script' in pilots and not args.script:
+        parser.error("o piloto 'script' precisa de --script")
+    script = os.path.abspath(args.script) if args.script else None
+
+    jobs = expand_grid(grid, seeds, pilots, ticks, script, args.asteroid_field)
+    print(f"{len(jobs)} jogos: {len(seeds)} sementes x {len(pilots)} pilotos x "
+          f"{len(jobs) // max(1, len(seeds) * len(pilots))} combinações")
+    start = time.perf_counter()
+    executed = run_sweep(jobs, args.output, args.workers, args.flush_every)
+    print(f"{executed} jogos executados em {time.perf_counter() - start:.1f} s")
+
+    for entry in summarize(ColumnarResults(args.output).load(), sorted(grid)):
+        print('  '.join(f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+                        for name, value in entry.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,417 @@
+import os
+import sys
+import glob
+import json
+import time
+import zlib
+import queue
+import struct
+import argparse
+import threading
+import numpy as np
+from src.game_entities import ASTEROID_SIZES
+
+# Tipos de evento. 'code' e 'value' dependem do tipo:
+# tiro: -, acerto: classe de tamanho e pontos, geração: classe de tamanho,
+# quadro: duração em ms, pausa: 1 ao pausar e 0 ao retomar, fim de jogo: pontuação final
+EVENT_SHOT = 0
+EVENT_HIT = 1
+EVENT_SPAWN = 2
+EVENT_FRAME = 3
+EVENT_PAUSE = 4
+EVENT_GAME_OVER = 5
+EVENT_NAMES = ('shot', 'hit', 'spawn', 'frame', 'pause', 'game_over')
+
+SIZE_NAMES = tuple(ASTEROID_SIZES)
+SIZE_CODES = {size_type: code for code, size_type in enumerate(SIZE_NAMES)}
+
+# Um evento no arquivo: tick, tipo, código e valor (10 bytes, sem alinhamento).
+# O jogo empacota cada evento com EVENT_STRUCT; o leitor lê os lotes com EVENT_DTYPE
+EVENT_STRUCT = struct.Struct('<IBBf')
+EVENT_DTYPE = np.dtype([('tick', '<u4'), ('type', 'u1'), ('code', 'u1'), ('value', '<f4')])
+
+TELEMETRY_MAGIC = b'ASTL'
+TELEMETRY_VERSION = 1
+# Cabeçalho de cada arquivo: magic, versão, início da sessão (time.time()), índice do arquivo
+# na sessão e tamanho dos metadados JSON que vêm em seguida
+FILE_HEADER = struct.Struct('<4sHdHI')
+# Cabeçalho de cada lote: bytes comprimidos, eventos, instante da entrega e eventos descartados até então
+BLOCK_HEADER = struct.Struct('<IIdQ')
+FILE_SUFFIX = '.tlm'
+
+# Eventos por lote entregue ao escritor
+DEFAULT_BATCH_SIZE = 4096
+# Lotes esperando o escritor; com a fila cheia o lote é descartado em vez de bloquear o quadro
+DEFAULT_MAX_PENDING_BATCHES = 64
+# Um lote é entregue mesmo incompleto depois deste tempo (segundos), para o arquivo acompanhar a sessão
+DEFAULT_FLUSH_INTERVAL = 1.0
+# Tamanho a partir do qual o escritor passa para o próximo arquivo
+DEFAULT_MAX_FILE_BYTES = 8 * 1024 * 1024
+# Nível do zlib: a compressão roda na thread do escritor, mas dividindo o GIL com o jogo
+COMPRESSION_LEVEL = 1
+
+# Histograma dos tempos de quadro usado pelo leitor: faixas de 0,1 ms até 1 s (o resto vai na última)
+FRAME_BIN_MS = 0.1
+FRAME_BINS = 10000
+
+
+class TelemetryWriter:
+    """
+    Registro de eventos da sessão (tiros, acertos por classe de tamanho, pontos, gerações,
+    tempos de quadro) que nunca bloqueia o quadro.
+    Os métodos de registro só empacotam o evento no formato do arquivo no fim do lote atual
+    (um bytearray); um lote cheio (ou mais velho que flush_interval) é entregue a uma fila
+    limitada e uma thread comprime os lotes com zlib (que libera o GIL) e os escreve em
+    arquivos que giram ao passar de max_file_bytes. Se o escritor
+    ficar para trás e a fila encher, o lote é descartado e contado (dropped), então a memória
+    usada fica limitada a (max_pending_batches + 1) * batch_size eventos.
+    O tick dos eventos é o último informado por begin_tick().
+    """
+
+    def __init__(self, directory, metadata=None, batch_size=DEFAULT_BATCH_SIZE,
+                 max_pending_batches=DEFAULT_MAX_PENDING_BATCHES, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_file_bytes=DEFAULT_MAX_FILE_BYTES, max_files=None):
+        self.directory = directory
+        self.metadata = dict(metadata or {})
+        self.metadata.setdefault('pid', os.getpid())
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files # Arquivos mantidos desta sessão (None = todos)
+        self.session_start = time.time()
+        self.prefix = os.path.join(directory, time.strftime('telemetria-%Y%m%d-%H%M%S', time.localtime(self.session_start))
+                                   + f'-{os.getpid()}')
+        self.tick = 0
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.files = []
+        self.write_seconds = 0.0 # Tempo gasto pela thread do escritor (compressão e escrita)
+
+        self._batch = bytearray()
+        self._batch_bytes = batch_size * EVENT_STRUCT.size
+        self._pack = EVENT_STRUCT.pack
+        self._batch_started = time.perf_counter()
+        self._queue = queue.Queue(maxsize=max_pending_batches)
+        self._file = None
+        self._file_bytes = 0
+        self._thread = None
+        self._closed = False
+
+    # --- Ciclo de vida ---
+
+    def start(self):
+        """Cria o diretório e inicia a thread do escritor."""
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='telemetria', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Entrega o lote atual, espera o escritor terminar e fecha o arquivo."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        self._handoff()
+        self._queue.put(None) # Sinal de fim (espera se a fila estiver cheia: aqui pode bloquear)
+        self._thread.join()
+        self._thread = None
+
+    # --- Registro (chamado pelo jogo, na thread principal) ---
+
+    def record(self, event_type, code=0, value=0.0):
+        batch = self._batch
+        batch += self._pack(self.tick, event_type, code, value)
+        if len(batch) >= self._batch_bytes:
+            self._handoff()
+
+    def begin_tick(self, tick):
+        """Informa o tick atual; entrega o lote se ele estiver esperando há mais de flush_interval."""
+        self.tick = tick
+        if self._batch and time.perf_counter() - self._batch_started >= self.flush_interval:
+            self._handoff()
+
+    def shot(self):
+        self.record(EVENT_SHOT)
+
+    def hit(self, size_type, points):
+        self.record(EVENT_HIT, SIZE_CODES.get(size_type, 255), points)
+
+    def spawn(self, size_type):
+        self.record(EVENT_SPAWN, SIZE_CODES.get(size_type, 255))
+
+    def frame(self, milliseconds):
+        self.record(EVENT_FRAME, 0, milliseconds)
+
+    def pause(self, paused):
+        self.record(EVENT_PAUSE, int(paused))
+
+    def game_over(self, score):
+        self.record(EVENT_GAME_OVER, 0, score)
+
+    def _handoff(self):
+        batch = self._batch
+        self._batch = bytearray()
+        self._batch_started = time.perf_counter()
+        if not batch:
+            return
+        count = len(batch) // EVENT_STRUCT.size
+        self.recorded += count
+        try:
+            self._queue.put_nowait((time.time(), self.dropped, count, batch))
+        except queue.Full:
+            self.dropped += count # O escritor está atrasado: descarta em vez de esperar
+
+    # --- Escritor (thread) ---
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            start = time.perf_counter()
+            self._write_batch(*item)
+            self.write_seconds += time.perf_counter() - start
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_batch(self, handed_off_at, dropped, count, batch):
+        compressed = zlib.compress(batch, COMPRESSION_LEVEL)
+        if self._file is None or self._file_bytes >= self.max_file_bytes:
+            self._rotate()
+        block = BLOCK_HEADER.pack(len(compressed), count, handed_off_at, dropped) + compressed
+        self._file.write(block)
+        self._file.flush()
+        self._file_bytes += len(block)
+        self.bytes_written += len(block)
+        self.written += count
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        index = len(self.files)
+        path = f'{self.prefix}-{index:04d}{FILE_SUFFIX}'
+        metadata = json.dumps(self.metadata).encode()
+        self._file = open(path, 'wb')
+        self._file.write(FILE_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION, self.session_start, index, len(metadata)))
+        self._file.write(metadata)
+        self._file_bytes = FILE_HEADER.size + len(metadata)
+        self.files.append(path)
+        if self.max_files is not None:
+            while len([path for path in self.files if path is not None]) > self.max_files:
+                oldest = next(position for position, path in enumerate(self.files) if path is not None)
+                os.remove(self.files[oldest])
+                self.files[oldest] = None
+
+    def stats(self):
+        return {
+            'recorded': self.recorded + len(self._batch) // EVENT_STRUCT.size,
+            'written': self.written,
+            'dropped': self.dropped,
+            'files': len([path for path in self.files if path is not None]),
+            'bytes': self.bytes_written,
+            'write_ms': round(self.write_seconds * 1000, 1),
+        }
+
+
+# --- Leitura ---
+
+def read_header(telemetry_file):
+    """Lê o cabeçalho de um arquivo aberto; retorna (início da sessão, índice do arquivo, metadados)."""
+    header = telemetry_file.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise ValueError("Arquivo de telemetria truncado")
+    magic, version, session_start, index, metadata_size = FILE_HEADER.unpack(header)
+    if magic != TELEMETRY_MAGIC:
+        raise ValueError("Não é um arquivo de telemetria")
+    if version != TELEMETRY_VERSION:
+        raise ValueError(f"Versão de telemetria não suportada: {version}")
+    return session_start, index, json.loads(telemetry_file.read(metadata_size) or b'{}')
+
+
+def iter_blocks(path):
+    """
+    Percorre os lotes de um arquivo sem carregá-lo inteiro: gera (instante, descartados até
+    então, eventos) com os eventos como array EVENT_DTYPE. Um lote final incompleto (sessão
+    interrompida no meio da escrita) é ignorado.
+    """
+    with open(path, 'rb') as telemetry_file:
+        read_header(telemetry_file)
+        while True:
+            header = telemetry_file.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            compressed_size, count, handed_off_at, dropped = BLOCK_HEADER.unpack(header)
+            compressed = telemetry_file.read(compressed_size)
+            if len(compressed) < compressed_size:
+                return
+            try:
+                raw = zlib.decompress(compressed)
+            except zlib.error:
+                return
+            yield handed_off_at, dropped, np.frombuffer(raw, dtype=EVENT_DTYPE, count=count)
+
+
+def expand_paths(paths):
+    """Arquivos .tlm a partir de arquivos e diretórios, em ordem de nome (sessão e índice)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*' + FILE_SUFFIX))))
+        else:
+            files.append(path)
+    return files
+
+
+class TelemetryStats:
+    """
+    Agregação em fluxo: cada lote é somado com operações vetorizadas (bincount) e descartado,
+    então a memória não cresce com o tamanho dos registros. Os percentis dos tempos de quadro
+    vêm de um histograma com faixas de FRAME_BIN_MS.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.sessions = {} # (início da sessão, pid) -> eventos descartados (contador acumulado da sessão)
+        self.bytes = 0
+        self.events = 0
+        self.by_type = np.zeros(len(EVENT_NAMES), dtype=np.int64)
+        self.hits_by_size = np.zeros(len(SIZE_NAMES), dtype=np.int64)
+        self.points_by_size = np.zeros(len(SIZE_NAMES), dtype=np.float64)
+        self.spawns_by_size = np.zeros(len(SIZE_NAMES), dtype=np.int64)
+        self.frame_histogram = np.zeros(FRAME_BINS, dtype=np.int64)
+        self.frame_total_ms = 0.0
+        self.frame_max_ms = 0.0
+        self.final_scores = []
+        self.max_tick = 0
+
+    def add_file(self, path):
+        with open(path, 'rb') as telemetry_file:
+            session_start, _, metadata = read_header(telemetry_file)
+        self.files += 1
+        session = (session_start, metadata.get('pid'))
+        self.bytes += os.path.getsize(path)
+        file_dropped = 0
+        for _, dropped, events in iter_blocks(path):
+            self.add_events(events)
+            file_dropped = max(file_dropped, dropped)
+        # O contador é acumulado na sessão e se repete em cada arquivo dela: vale o maior, somado por sessão em summary()
+        self.sessions[session] = max(self.sessions.get(session, 0), file_dropped)
+
+    def add_events(self, events):
+        size_count = len(SIZE_NAMES)
+        types = events['type']
+        codes = events['code']
+        values = events['value']
+        self.events += len(events)
+        self.by_type += np.bincount(types, minlength=len(EVENT_NAMES))[:len(EVENT_NAMES)]
+        if len(events):
+            self.max_tick = max(self.max_tick, int(events['tick'].max()))
+
+        hits = (types == EVENT_HIT) & (codes < size_count)
+        self.hits_by_size += np.bincount(codes[hits], minlength=size_count)
+        self.points_by_size += np.bincount(codes[hits], weights=values[hits], minlength=size_count)
+        spawns = (types == EVENT_SPAWN) & (codes < size_count)
+        self.spawns_by_size += np.bincount(codes[spawns], minlength=size_count)
+
+        frame_ms = values[types == EVENT_FRAME]
+        if len(frame_ms):
+            bins = np.minimum((frame_ms / FRAME_BIN_MS).astype(np.int64), FRAME_BINS - 1)
+            self.frame_histogram += np.bincount(bins, minlength=FRAME_BINS)
+            self.frame_total_ms += float(frame_ms.sum(dtype=np.float64))
+            self.frame_max_ms = max(self.frame_max_ms, float(frame_ms.max()))
+        self.final_scores.extend(values[types == EVENT_GAME_OVER].tolist())
+
+    def frame_percentile(self, fraction):
+        total = int(self.frame_histogram.sum())
+        if not total:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.frame_histogram), fraction * total))
+        return (index + 1) * FRAME_BIN_MS # Limite superior da faixa
+
+    def summary(self):
+        shots = int(self.by_type[EVENT_SHOT])
+        hits = int(self.by_type[EVENT_HIT])
+        frames = int(self.by_type[EVENT_FRAME])
+        scores = self.final_scores
+        return {
+            'files': self.files,
+            'sessions': len(self.sessions),
+            'bytes': self.bytes,
+            'events': self.events,
+            'dropped': sum(self.sessions.values()),
+            'by_type': {name: int(count) for name, count in zip(EVENT_NAMES, self.by_type)},
+            'shots': shots,
+            'hits': hits,
+            'hits_per_shot': round(hits / shots, 4) if shots else None,
+            'hits_by_size': dict(zip(SIZE_NAMES, self.hits_by_size.tolist())),
+            'points_by_size': dict(zip(SIZE_NAMES, self.points_by_size.tolist())),
+            'points': float(self.points_by_size.sum()),
+            'spawns_by_size': dict(zip(SIZE_NAMES, self.spawns_by_size.tolist())),
+            'games_over': len(scores),
+            'final_score_mean': round(sum(scores) / len(scores), 1) if scores else None,
+            'final_score_max': max(scores) if scores else None,
+            'max_tick': self.max_tick,
+            'frames': frames,
+            'frame_ms': {
+                'mean': round(self.frame_total_ms / frames, 3),
+                'p50': round(self.frame_percentile(0.50), 1),
+                'p95': round(self.frame_percentile(0.95), 1),
+                'p99': round(self.frame_percentile(0.99), 1),
+                'max': round(self.frame_max_ms, 3),
+            } if frames else None,
+        }
+
+
+def aggregate(paths):
+    """Agrega todos os arquivos (ou diretórios) de telemetria dados num único resumo."""
+    stats = TelemetryStats()
+    for path in expand_paths(paths):
+        stats.add_file(path)
+    return stats.summary()
+
+
+# Escritor em uso, lido por spaceship, population e collision_handler.
+# Só é registrado quando a telemetria foi pedida (ASTEROIDES_TELEMETRY ou --telemetry).
+_telemetry = None
+
+def get_telemetry():
+    return _telemetry
+
+def set_telemetry(writer):
+    global _telemetry
+    _telemetry = writer
+
+
+def telemetry_from_environment(metadata=None):
+    """Cria (sem iniciar) o escritor a partir de ASTEROIDES_TELEMETRY (diretório dos registros), se definida."""
+    directory = os.environ.get('ASTEROIDES_TELEMETRY')
+    return TelemetryWriter(directory, metadata) if directory else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resume registros de telemetria (.tlm) em fluxo.")
+    parser.add_argument('--telemetry-report', nargs='+', metavar='CAMINHO', required=True,
+                        help="Arquivos .tlm ou diretórios com eles")
+    parser.add_argument('--output', help="Grava o resumo neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = aggregate(args.telemetry_report)
+    elapsed = time.perf_counter() - start
+    summary['read_seconds'] = round(elapsed, 3)
+    summary['events_per_second'] = round(summary['events'] / elapsed) if elapsed > 0 else None
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# Frequência fixa da simulação. Velocidades e rotações das entidades são
+# expressas por tick de simulação, portanto ficam estáveis independente do FPS de desenho.
+SIMULATION_HZ = 60
+SIMULATION_DT = 1.0 / SIMULATION_HZ
+
+# Maior intervalo de tempo real aceito num único quadro (evita a "espiral da morte" após travamentos)
+MAX_FRAME_TIME = 0.25
+# Máximo de ticks de simulação executados por quadro para alcançar o tempo real
+MAX_STEPS_PER_FRAME = 5
+
+
+class FixedTimestep:
+    """
+    Acumulador de passo fixo.
+    advance(frame_time) recebe o tempo real do quadro (em segundos) e devolve
+    quantos ticks de simulação devem rodar. O tempo que sobra no acumulador vira
+    'alpha', a fração entre o último tick e o próximo, usada para interpolar o desenho.
+    Se a simulação ficar para trás além de MAX_STEPS_PER_FRAME, o excesso é descartado.
+    """
+
+    def __init__(self, hz=SIMULATION_HZ, max_frame_time=MAX_FRAME_TIME, max_steps_per_frame=MAX_STEPS_PER_FRAME):
+        self.dt = 1.0 / hz
+        self.max_frame_time = max_frame_time
+        self.max_steps_per_frame = max_steps_per_frame
+        self.accumulator = 0.0
+        self.total_steps = 0
+        self.dropped_steps = 0
+
+    def advance(self, frame_time):
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps_per_frame:
+            # Sob carga: roda o máximo permitido e descarta o restante
+            self.dropped_steps += steps - self.max_steps_per_frame
+            steps = self.max_steps_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        self.total_steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.dt)
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+def capture_positions(group):
+    """Guarda o centro de cada sprite antes de um tick, para interpolar o desenho."""
+    return {sprite: sprite.rect.center for sprite in group}
+
+
+def draw_interpolated(surface, group, previous_positions, alpha, screen_width, screen_height):
+    """
+    Desenha o grupo na posição interpolada entre o tick anterior e o atual.
+    Sprites novos ou que atravessaram a borda da tela são desenhados na posição atual.
+    Retorna os retângulos desenhados.
+    """
+    behind = 1.0 - alpha
+    blits = []
+    for sprite in group:
+        rect = sprite.rect
+        previous = previous_positions.get(sprite)
+        if previous is None or behind <= 0.0:
+            blits.append((sprite.image, rect))
+            continue
+        dx = rect.centerx - previous[0]
+        dy = rect.centery - previous[1]
+        if abs(dx) > screen_width / 2 or abs(dy) > screen_height / 2:
+            blits.append((sprite.image, rect))
+        else:
+            blits.append((sprite.image, (rect.x - dx * behind, rect.y - dy * behind)))
+    return surface.blits(blits)
@@ -0,0 +1,311 @@
+import os
+import sys
+import multiprocessing
+import numpy as np
+from src.game_entities import ASTEROID_SIZES
+from src.headless import HeadlessSimulation, HEADLESS_SCREEN_SIZE, HEADLESS_ASTEROID_LIMIT
+
+# Colunas do array de ações, na ordem dos comandos da fila de entrada.
+# Também aceito: um inteiro por mundo com um bit por comando (bit 0 = rotate_left).
+ACTION_COMMANDS = ('rotate_left', 'rotate_right', 'thrust_on', 'shoot_request')
+
+# Observação de cada mundo: as características da nave seguidas das de nearest asteroides
+# (os mais próximos primeiro; as vagas sem asteroide ficam zeradas, com present = 0).
+# Posições e deslocamentos são divididos pela largura/altura da tela e velocidades por MAX_SPEED.
+SHIP_FEATURES = ('x', 'y', 'vx', 'vy', 'angle_sin', 'angle_cos')
+ASTEROID_FEATURES = ('dx', 'dy', 'vx', 'vy', 'size', 'present')
+DEFAULT_NEAREST = 8
+# Maior velocidade de nave e asteroide em pixels por tick (Player.max_speed), usada para normalizar
+MAX_SPEED = 6.0
+
+SIZE_NAMES = tuple(ASTEROID_SIZES)
+# 'size' na observação: raio de colisão relativo ao da maior classe
+SIZE_FEATURE = np.array([ASTEROID_SIZES[size_type]['radius'] for size_type in SIZE_NAMES], dtype=np.float32)
+SIZE_FEATURE /= SIZE_FEATURE.max()
+SIZE_CODES = {size_type: code for code, size_type in enumerate(SIZE_NAMES)}
+
+# Um episódio é truncado depois deste número de ticks (5 minutos de simulação)
+DEFAULT_MAX_EPISODE_TICKS = 18000
+# Recompensa somada no tick em que a nave é atingida (além dos pontos, que vêm de ASTEROID_SIZES)
+DEFAULT_DEATH_PENALTY = 0.0
+
+
+def observation_size(nearest=DEFAULT_NEAREST):
+    return len(SHIP_FEATURES) + nearest * len(ASTEROID_FEATURES)
+
+
+def action_matrix(actions, num_envs):
+    """Converte as ações num array booleano (num_envs, 4) na ordem de ACTION_COMMANDS."""
+    actions = np.asarray(actions)
+    if actions.shape == (num_envs,):
+        return (actions.astype(np.int64)[:, None] >> np.arange(len(ACTION_COMMANDS))) & 1 == 1
+    if actions.shape == (num_envs, len(ACTION_COMMANDS)):
+        return actions.astype(bool)
+    raise ValueError(f"ações com forma {actions.shape}; esperado ({num_envs}, {len(ACTION_COMMANDS)}) ou ({num_envs},)")
+
+
+class VectorEnv:
+    """
+    N partidas sem janela (HeadlessSimulation) avançadas juntas, no estilo dos ambientes
+    vetorizados do Gym, para pilotos automáticos e agentes.
+    step(ações) aplica a cada mundo o estado das quatro teclas daquele tick, avança todos
+    um tick e retorna arrays (observações, recompensas, fins, infos). A recompensa é a
+    pontuação ganha no tick (ASTEROID_SIZES) mais death_penalty quando a nave é atingida.
+    Um mundo que termina (nave atingida ou max_episode_ticks) recomeça sozinho com a próxima
+    semente; a observação retornada já é a do novo episódio e a final fica em
+    infos['final_observation']. Nada é desenhado: as observações vêm direto do estado.
+    O mundo i do episódio e usa a semente seed + e * num_envs + i, então tudo é reproduzível.
+    """
+
+    def __init__(self, num_envs, seed=0, nearest=DEFAULT_NEAREST, max_episode_ticks=DEFAULT_MAX_EPISODE_TICKS,
+                 death_penalty=DEFAULT_DEATH_PENALTY, asteroid_limit=HEADLESS_ASTEROID_LIMIT,
+                 use_asteroid_field=False, screen_size=HEADLESS_SCREEN_SIZE, index_offset=0, seed_stride=None):
+        self.num_envs = num_envs
+        self.seed = seed
+        # Índice do primeiro mundo e mundos por episódio no conjunto todo (usados por ProcessVectorEnv)
+        self.index_offset = index_offset
+        self.seed_stride = num_envs if seed_stride is None else seed_stride
+        self.nearest = nearest
+        self.max_episode_ticks = max_episode_ticks
+        self.death_penalty = death_penalty
+        self.asteroid_limit = asteroid_limit
+        self.use_asteroid_field = use_asteroid_field
+        self.screen_size = screen_size
+        self.observation_size = observation_size(nearest)
+        self.worlds = [None] * num_envs
+        self.episodes = np.zeros(num_envs, dtype=np.int64)
+        self.total_steps = 0
+
+    # --- Ciclo de vida ---
+
+    def _new_world(self, index):
+        seed = self.seed + int(self.episodes[index]) * self.seed_stride + self.index_offset + index
+        return HeadlessSimulation(seed=seed, screen_size=self.screen_size, asteroid_limit=self.asteroid_limit,
+                                  use_asteroid_field=self.use_asteroid_field, announce=False)
+
+    def reset(self, seed=None):
+        """Recomeça todos os mundos (com seed, se dada) e retorna as observações iniciais."""
+        if seed is not None:
+            self.seed = seed
+            self.episodes[:] = 0
+        self.worlds = [self._new_world(index) for index in range(self.num_envs)]
+        return self.observe()
+
+    def close(self):
+        self.worlds = [None] * self.num_envs
+
+    # --- Passo ---
+
+    def step(self, actions):
+        actions = action_matrix(actions, self.num_envs).tolist()
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        scores = np.zeros(self.num_envs, dtype=np.int64)
+        ticks = np.zeros(self.num_envs, dtype=np.int64)
+        max_ticks = self.max_episode_ticks
+        for index, world in enumerate(self.worlds):
+            input_state = world.input_state
+            rotate_left, rotate_right, thrust_on, shoot_request = actions[index]
+            input_state['rotate_left'] = rotate_left
+            input_state['rotate_right'] = rotate_right
+            input_state['thrust_on'] = thrust_on
+            input_state['shoot_request'] = shoot_request
+            score = world.score
+            world.step()
+            rewards[index] = world.score - score
+            if world.game_over:
+                rewards[index] += self.death_penalty
+                terminated[index] = True
+            elif world.tick >= max_ticks:
+                truncated[index] = True
+            scores[index] = world.score
+            ticks[index] = world.tick
+        self.total_steps += self.num_envs
+
+        observations = self.observe()
+        dones = terminated | truncated
+        infos = {'score': scores, 'tick': ticks, 'terminated': terminated, 'truncated': truncated}
+        if dones.any():
+            infos['final_observation'] = observations.copy()
+            finished = np.flatnonzero(dones)
+            self.episodes[finished] += 1
+            for index in finished.tolist():
+                self.worlds[index] = self._new_world(index)
+            observations[finished] = self.observe(finished)
+        return observations, rewards, dones, infos
+
+    # --- Observações ---
+
+    def _asteroid_arrays(self, world):
+        """(x, y, vx, vy, código da classe) dos asteroides vivos de um mundo, como arrays."""
+        group = world.asteroids_group
+        if world.use_asteroid_field:
+            live = group.alive
+            return group.x[live], group.y[live], group.vx[live], group.vy[live], group.size[live]
+        if not group:
+            empty = np.zeros(0)
+            return empty, empty, empty, empty, np.zeros(0, dtype=np.int64)
+        values = np.array([(*asteroid.rect.center, asteroid.vx, asteroid.vy, SIZE_CODES[asteroid.size_type])
+                           for asteroid in group]).T
+        return values[0], values[1], values[2], values[3], values[4].astype(np.int64)
+
+    def observe(self, indices=None):
+        """
+        Observações (len(indices), observation_size) em float32. Os asteroides de todos os
+        mundos são reunidos em arrays (mundos, maior população) e os mais próximos da nave
+        de cada mundo são escolhidos de uma vez com argpartition, usando a distância com o
+        envelopamento horizontal da tela (os asteroides dão a volta só na horizontal).
+        """
+        indices = range(self.num_envs) if indices is None else indices
+        worlds = [self.worlds[index] for index in indices]
+        count = len(worlds)
+        width, height = self.screen_size
+        nearest = self.nearest
+        observations = np.zeros((count, self.observation_size), dtype=np.float32)
+
+        ship = np.empty((count, 5))
+        per_world = []
+        for row, world in enumerate(worlds):
+            player = world.player
+            center_x, center_y = player.rect.center
+            ship[row] = (center_x, center_y, player.vx, player.vy, player.angle)
+            per_world.append(self._asteroid_arrays(world))
+        angle = np.radians(ship[:, 4])
+        observations[:, 0] = ship[:, 0] / width
+        observations[:, 1] = ship[:, 1] / height
+        observations[:, 2] = ship[:, 2] / MAX_SPEED
+        observations[:, 3] = ship[:, 3] / MAX_SPEED
+        observations[:, 4] = np.sin(angle)
+        observations[:, 5] = np.cos(angle)
+
+        population = max((len(arrays[0]) for arrays in per_world), default=0)
+        if not population or not nearest:
+            return observations
+        # Matrizes (mundos, população) preenchidas; as vagas vazias ficam infinitamente longe
+        asteroids = np.zeros((5, count, population))
+        present = np.zeros((count, population), dtype=bool)
+        for row, arrays in enumerate(per_world):
+            size = len(arrays[0])
+            for field, values in enumerate(arrays):
+                asteroids[field, row, :size] = values
+            present[row, :size] = True
+        dx = (asteroids[0] - ship[:, 0:1] + width / 2) % width - width / 2
+        dy = asteroids[1] - ship[:, 1:2]
+        distance = np.where(present, dx * dx + dy * dy, np.inf)
+
+        slots = min(nearest, population)
+        if population > slots:
+            chosen = np.argpartition(distance, slots - 1, axis=1)[:, :slots]
+        else:
+            chosen = np.broadcast_to(np.arange(population), (count, population))
+        order = np.argsort(np.take_along_axis(distance, chosen, axis=1), axis=1)
+        chosen = np.take_along_axis(chosen, order, axis=1)
+
+        features = np.zeros((count, nearest, len(ASTEROID_FEATURES)), dtype=np.float32)
+        take = lambda values: np.take_along_axis(values, chosen, axis=1)
+        chosen_present = take(present)
+        features[:, :slots, 0] = take(dx) / width
+        features[:, :slots, 1] = take(dy) / height
+        features[:, :slots, 2] = take(asteroids[2]) / MAX_SPEED
+        features[:, :slots, 3] = take(asteroids[3]) / MAX_SPEED
+        features[:, :slots, 4] = SIZE_FEATURE[take(asteroids[4]).astype(np.int64)]
+        features[:, :slots, 5] = chosen_present
+        features[:, :slots] *= chosen_present[:, :, None] # Vagas sem asteroide ficam zeradas
+        observations[:, len(SHIP_FEATURES):] = features.reshape(count, -1)
+        return observations
+
+
+# --- Vários processos ---
+
+def _worker(connection, env_options):
+    # Mesmo ambiente dos processos da varredura (src/sweep.py): raiz do projeto e sem as mensagens por jogo
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    sys.stdout = open(os.devnull, 'w')
+    env = VectorEnv(**env_options)
+    try:
+        while True:
+            command, argument = connection.recv()
+            if command == 'step':
+                connection.send(env.step(argument))
+            elif command == 'reset':
+                connection.send(env.reset(argument))
+            else:
+                break
+    finally:
+        env.close()
+        connection.close()
+
+
+class ProcessVectorEnv:
+    """
+    A mesma interface de VectorEnv, com os mundos divididos entre 'workers' processos
+    (cada um com um VectorEnv próprio). As ações de cada passo vão a todos os processos
+    antes de esperar qualquer resposta, então os blocos de mundos avançam em paralelo.
+    O mundo i recebe a mesma semente que teria num único VectorEnv.
+    """
+
+    def __init__(self, num_envs, workers, seed=0, **options):
+        self.num_envs = num_envs
+        workers = max(1, min(workers, num_envs))
+        bounds = np.linspace(0, num_envs, workers + 1).astype(np.int64)
+        self.slices = [slice(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+        self.seed = seed
+        self.options = options
+        self.connections = []
+        self.processes = []
+        context = multiprocessing.get_context()
+        for block in self.slices:
+            parent, child = context.Pipe()
+            env_options = dict(options, num_envs=block.stop - block.start, seed=seed,
+                               index_offset=block.start, seed_stride=num_envs)
+            process = context.Process(target=_worker, args=(child, env_options), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.observation_size = observation_size(options.get('nearest', DEFAULT_NEAREST))
+        self.total_steps = 0
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        for connection in self.connections:
+            connection.send(('reset', self.seed))
+        return np.concatenate([connection.recv() for connection in self.connections])
+
+    def step(self, actions):
+        actions = action_matrix(actions, self.num_envs)
+        for connection, block in zip(self.connections, self.slices):
+            connection.send(('step', actions[block]))
+        results = [connection.recv() for connection in self.connections]
+        self.total_steps += self.num_envs
+        observations = np.concatenate([result[0] for result in results])
+        rewards = np.concatenate([result[1] for result in results])
+        dones = np.concatenate([result[2] for result in results])
+        infos = {}
+        for name in ('score', 'tick', 'terminated', 'truncated'):
+            infos[name] = np.concatenate([result[3][name] for result in results])
+        if dones.any():
+            infos['final_observation'] = np.concatenate([result[3].get('final_observation', result[0])
+                                                         for result in results])
+        return observations, rewards, dones, infos
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+        self.connections = []
+        self.processes = []
+
+
+def make_vector_env(num_envs, workers=1, **options):
+    """Um VectorEnv no próprio processo (workers=1) ou um ProcessVectorEnv com 'workers' processos."""
+    if workers > 1:
+        return ProcessVectorEnv(num_envs, workers, **options)
+    return VectorEnv(num_envs, **options)